@@ -13,6 +13,11 @@ from utils.tasks.faucet import FaucetClaim
 from functions.check_mon_balance import check_balance
 from functions.mexc_withdraw import process_mexc_withdraw
 from functions.gazzip_buy import process_gazzip_buy  # Новый импорт
+from evm.transport import provider_pool
+from evm.accounts import transaction_signer
+from utils.rate_limiter import rate_limiter
+from utils.worker_pool import worker_pool
+from utils.db_api.async_db import async_db
 
 import asyncio
 
@@ -29,6 +34,8 @@ async def start_script():
 
 async def run_mandatory_actions():
     wallets = load_wallets()
+    # Подписи сотен транзакций уходят в отдельные процессы, чтобы не блокировать event loop
+    transaction_signer.start()
     actions = MandatoryActions()
     tasks = [asyncio.create_task(actions.run(wallet)) for wallet in wallets]
     await asyncio.gather(*tasks)
@@ -47,8 +54,7 @@ async def run_faucet_claim():
 
 async def run_check_mon_balance():
     wallets = load_wallets()
-    tasks = [asyncio.create_task(check_balance(wallet)) for wallet in wallets]
-    await asyncio.gather(*tasks)
+    await check_balance(wallets)
     
 async def run_mexc_withdraw():
     settings = Settings()
@@ -62,6 +68,20 @@ async def run_mexc_withdraw():
 async def run_gazzip_buy():
     await process_gazzip_buy()
 
+async def run(coro):
+    settings = Settings()
+    rate_limiter.configure(settings.rate_limits)
+    worker_pool.configure(settings.workers)
+    async_db.configure(settings.db_writes)
+    try:
+        await coro
+    finally:
+        rate_limiter.log_stats()
+        worker_pool.log_stats()
+        transaction_signer.close()
+        await async_db.close()
+        await provider_pool.close()
+
 if __name__ == '__main__':
     create_files()
     print("""Выберите один из вариантов:
@@ -78,19 +98,19 @@ if __name__ == '__main__':
     try:
         action = int(input('> '))
         if action == 1:
-            asyncio.run(Import.wallets())
+            asyncio.run(run(Import.wallets()))
         elif action == 2:
-            asyncio.run(start_script())
+            asyncio.run(run(start_script()))
         elif action == 3:
-            asyncio.run(run_mandatory_actions())
+            asyncio.run(run(run_mandatory_actions()))
         elif action == 4:
-            asyncio.run(run_faucet_claim())
+            asyncio.run(run(run_faucet_claim()))
         elif action == 5:
-            asyncio.run(run_check_mon_balance())
+            asyncio.run(run(run_check_mon_balance()))
         elif action == 6:
-            asyncio.run(run_mexc_withdraw())
+            asyncio.run(run(run_mexc_withdraw()))
         elif action == 7:
-            asyncio.run(run_gazzip_buy())
+            asyncio.run(run(run_gazzip_buy()))
         elif action == 8:
             pass
     except KeyboardInterrupt:
@@ -0,0 +1,104 @@
+"""
+Стоимость одного кодирования calldata: прежние кодировщики против CalldataTemplate.
+
+Запуск из корня репозитория: python -m benchmarks.calldata
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+from loguru import logger
+
+import data.config as config
+
+# Модули задач при импорте открывают БД кошельков и пишут логи в files/
+config.WALLETS_DB = os.path.join(tempfile.mkdtemp(), 'wallets.db')
+logger.remove()
+
+from eth_abi import encode  # noqa: E402
+from web3 import Web3  # noqa: E402
+
+from evm.models.registry.tokens import MonadTokens  # noqa: E402
+from evm.utils.calldata import selector_of  # noqa: E402
+from utils.tasks import ambient, bean, shmonad  # noqa: E402
+
+
+NUMBER = 2000
+ADDRESS = '0x19E7E376E7C213B7E7e7e46cc70A5dD086DAff2A'
+AMOUNT = 123456789123456789
+DEADLINE = 1700000000
+PATH = [MonadTokens.USDC.address, MonadTokens.WMON.address]
+
+SWAP_ABI = [{
+    'name': 'swapExactTokensForTokens',
+    'type': 'function',
+    'inputs': [
+        {'name': 'amountIn', 'type': 'uint256'},
+        {'name': 'amountOutMin', 'type': 'uint256'},
+        {'name': 'path', 'type': 'address[]'},
+        {'name': 'to', 'type': 'address'},
+        {'name': 'deadline', 'type': 'uint256'}
+    ],
+    'outputs': [],
+    'stateMutability': 'nonpayable'
+}]
+USER_CMD_ABI = [{
+    'name': 'userCmd',
+    'type': 'function',
+    'inputs': [{'name': 'callpath', 'type': 'uint16'}, {'name': 'cmd', 'type': 'bytes'}],
+    'outputs': [],
+    'stateMutability': 'payable'
+}]
+
+
+def ambient_cmd(amount: int) -> bytes:
+    # Прежняя раскладка команды покупки WBTC hex-строкой
+    return bytes.fromhex(
+        '0' * 64 +
+        MonadTokens.WBTC.address[2:].lower().zfill(64) +
+        '8ca0'.zfill(64) +
+        '1'.zfill(64) +
+        '1'.zfill(64) +
+        hex(amount)[2:].zfill(64) +
+        '0'.zfill(64) +
+        ambient.NO_MIN_OUT +
+        '3'.zfill(64) +
+        '0'.zfill(64)
+    )
+
+
+def per_call(fn) -> float:
+    return min(timeit.repeat(fn, number=NUMBER, repeat=5)) / NUMBER * 10 ** 6
+
+
+def main():
+    w3 = Web3()
+    router = w3.eth.contract(address=Web3.to_checksum_address(ADDRESS), abi=SWAP_ABI)
+    dex = w3.eth.contract(address=Web3.to_checksum_address(ADDRESS), abi=USER_CMD_ABI)
+    swap_template = bean.swap_calldata('swapExactTokensForTokens', tuple(PATH))
+
+    rows = [
+        ('Bean swapExactTokensForTokens', [
+            ('encodeABI', lambda: router.encodeABI(
+                fn_name='swapExactTokensForTokens', args=[AMOUNT, AMOUNT // 2, PATH, ADDRESS, DEADLINE])),
+            ('template', lambda: swap_template.encode(
+                amount_in=AMOUNT, amount_out_min=AMOUNT // 2, to=ADDRESS, deadline=DEADLINE)),
+        ]),
+        ('Ambient userCmd', [
+            ('hex + encodeABI', lambda: dex.encodeABI(fn_name='userCmd', args=[1, ambient_cmd(AMOUNT)])),
+            ('template', lambda: ambient.BUY_WBTC_CALLDATA.encode(qty=AMOUNT)),
+        ]),
+        ('deposit(uint256,address)', [
+            ('eth_abi', lambda: selector_of('deposit(uint256,address)') + encode(['uint256', 'address'], [AMOUNT, ADDRESS])),
+            ('template', lambda: shmonad.STAKE_CALLDATA.encode(assets=AMOUNT, receiver=ADDRESS)),
+        ]),
+    ]
+
+    print(f'Python {sys.version.split()[0]}, лучшее из 5 по {NUMBER} вызовов')
+    for title, variants in rows:
+        print(f'{title}: ' + ', '.join(f'{name} {per_call(fn):.1f} us' for name, fn in variants))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Запросы расписания на 100 тысячах кошельков без составных индексов и с ними.
+
+Запуск из корня репозитория: python -m benchmarks.schedule_queries
+"""
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from loguru import logger
+from sqlalchemy import and_, create_engine, or_, select, text
+from sqlalchemy.orm import Session
+
+import data.config as config
+
+# Импорт schedule_api открывает БД кошельков и пишет логи в files/
+config.WALLETS_DB = os.path.join(tempfile.mkdtemp(), 'wallets.db')
+logger.remove()
+
+from utils.db_api.migrations import migrate  # noqa: E402
+from utils.db_api.models import Base, Wallet  # noqa: E402
+from utils.db_api.schedule_api import _schedule_status  # noqa: E402
+
+
+COUNT = 100_000
+REPEAT = 20
+
+
+def build(path: str, indexed: bool, now: datetime):
+    engine = create_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(engine)
+    migrate(engine)
+    rnd = random.Random(1)
+    rows = [
+        {
+            'private_key': str(i), 'address': str(i), 'proxy': '', 'name': str(i), 'number_of_swaps': 1,
+            'initial_completed': rnd.random() < 0.7,
+            'next_initial_action_time': now + timedelta(seconds=rnd.randint(3600, 86400))
+            if rnd.random() < 0.999 else now - timedelta(seconds=5),
+            'next_activity_action_time': now + timedelta(seconds=rnd.randint(60, 86400)),
+        }
+        for i in range(COUNT)
+    ]
+    with engine.begin() as connection:
+        if not indexed:
+            connection.execute(text('DROP INDEX ix_wallets_initial_due'))
+            connection.execute(text('DROP INDEX ix_wallets_activity_due'))
+        connection.execute(Wallet.__table__.insert(), rows)
+        connection.execute(text('ANALYZE'))
+    return engine
+
+
+def best(fn) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    now = datetime.now()
+    directory = tempfile.mkdtemp()
+    column = Wallet.next_activity_action_time
+    queries = {
+        'next due, ORDER BY LIMIT 1': lambda session: session.execute(
+            select(column).where(Wallet.initial_completed.is_(True)).order_by(column).limit(1)
+        ).scalar(),
+        'expired ids (update_expired)': lambda session: session.execute(
+            select(Wallet.id).where(and_(
+                Wallet.initial_completed.is_(False),
+                or_(Wallet.next_initial_action_time <= now, Wallet.next_initial_action_time.is_(None))
+            ))
+        ).all(),
+        'schedule status': lambda session: _schedule_status(session, False, now),
+    }
+
+    print(f'{COUNT} кошельков, 70% после начальной фазы, лучшее из {REPEAT}')
+    for indexed in (False, True):
+        engine = build(os.path.join(directory, f'wallets_{indexed}.db'), indexed, now)
+        with Session(engine) as session:
+            timings = ', '.join(f'{name} {best(lambda: query(session)):.2f} ms' for name, query in queries.items())
+        print(f"{'с индексами' if indexed else 'без индексов'}: {timings}")
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Сравнение TokenAmount с прежней реализацией (Wei и Ether считаются в конструкторе).
+
+Запуск из корня репозитория: python -m benchmarks.token_amount
+"""
+import random
+import timeit
+import tracemalloc
+from decimal import Decimal
+from typing import Union
+
+from evm.models.token import TokenAmount
+
+
+COUNT = 100_000
+REPEAT = 5
+THRESHOLD = 0.5
+
+
+class LegacyTokenAmount:
+    def __init__(self, amount: Union[int, float, str, Decimal], decimals: int = 18, wei: bool = False) -> None:
+        if wei:
+            self.Wei: int = int(amount)
+            self.Ether: Decimal = Decimal(str(amount)) / 10 ** decimals
+        else:
+            self.Wei: int = int(Decimal(str(amount)) * 10 ** decimals)
+            self.Ether: Decimal = Decimal(str(amount))
+
+        self.decimals = decimals
+
+    def __str__(self):
+        return f'{self.Ether}'
+
+
+def best(fn) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT)) * 1000
+
+
+def held_memory(fn) -> float:
+    tracemalloc.start()
+    result = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size / 2 ** 20
+
+
+def main():
+    random.seed(0)
+    balances = [random.randrange(10 ** 18) for _ in range(COUNT)]
+    legacy = [LegacyTokenAmount(wei, wei=True) for wei in balances]
+    amounts = TokenAmount.from_wei_many(balances)
+
+    rows = [
+        ('construction from wei', [
+            ('old', lambda: [LegacyTokenAmount(wei, wei=True) for wei in balances]),
+            ('new', lambda: [TokenAmount.from_wei(wei) for wei in balances]),
+            ('from_wei_many', lambda: TokenAmount.from_wei_many(balances)),
+        ]),
+        ('threshold comparison', [
+            ('float(a.Ether) < x', lambda: [float(amount.Ether) < THRESHOLD for amount in legacy]),
+            ('a < x', lambda: [amount < THRESHOLD for amount in amounts]),
+        ]),
+        ('construction + str', [
+            ('old', lambda: [str(LegacyTokenAmount(wei, wei=True)) for wei in balances]),
+            ('new', lambda: [str(amount) for amount in TokenAmount.from_wei_many(balances)]),
+        ]),
+    ]
+
+    print(f'{COUNT} случайных балансов, 18 decimals, лучшее из {REPEAT}')
+    for title, variants in rows:
+        print(f'{title}: ' + ', '.join(f'{name} {best(fn):.0f} ms' for name, fn in variants))
+
+    print(
+        f'memory held: old {held_memory(lambda: [LegacyTokenAmount(wei, wei=True) for wei in balances]):.1f} MB, '
+        f'new {held_memory(lambda: TokenAmount.from_wei_many(balances)):.1f} MB'
+    )
+
+
+if __name__ == '__main__':
+    main()
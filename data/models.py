@@ -46,4 +46,17 @@ class Settings(Singleton, AutoRepr):
         self.mod_amount_for_stake: FromTo = FromTo(
             from_=json_data['mod_amount_for_stake']['from'], to_=json_data['mod_amount_for_stake']['to']
         )
-        
\ No newline at end of file
+
+        # approve на максимальную сумму один раз вместо amount * 10 перед свапами
+        self.max_approval: bool = json_data.get('max_approval', False)
+
+        # Лимиты запросов: rate - запросов в секунду, in_flight - одновременных запросов.
+        # Здесь и ниже отсутствующие в старых settings.json ключи берутся из значений по умолчанию в configure
+        self.rate_limits: dict = json_data.get('rate_limits', {})
+
+        # Параллельные действия кошельков: всего, на один прокси и на один RPC-эндпоинт
+        self.workers: dict = json_data.get('workers', {})
+
+        # Запись состояния кошельков в БД: раз в flush_interval секунд или при flush_size изменённых кошельков;
+        # строка, которую не удалось записать max_attempts раз, отбрасывается
+        self.db_writes: dict = json_data.get('db_writes', {})
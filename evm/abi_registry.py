@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from eth_abi import decode
+from web3 import AsyncWeb3, Web3
+from web3._utils.abi import get_abi_output_types
+from web3.contract import Contract
+from web3.contract.contract import ContractFunction
+
+
+ABI_DIR = Path(__file__).parent / 'abis'
+ERC20_ABI = 'erc20.json'
+
+
+class AbiRegistry:
+    """
+    Общий для процесса реестр ABI.
+
+    Каждый файл из evm/abis читается и разбирается один раз. Контракты создаются на офлайн Web3
+    без провайдера и кешируются по (файл, адрес): они годятся для кодирования calldata в любом
+    клиенте, а вызовы на чтение выполняются через call_function с web3 конкретного клиента.
+    """
+
+    def __init__(self, abi_dir: Path = ABI_DIR):
+        self.abi_dir = abi_dir
+        self._web3 = Web3()
+        self._abis: Dict[str, List[dict]] = {}
+        self._contracts: Dict[Tuple[str, Optional[str]], Contract] = {}
+
+    def get_abi(self, abi_filename: str) -> List[dict]:
+        abi = self._abis.get(abi_filename)
+        if abi is None:
+            path = self.abi_dir / abi_filename
+            try:
+                with path.open('r', encoding='utf-8') as file:
+                    abi = json.load(file)
+            except FileNotFoundError:
+                raise FileNotFoundError(f'ABI файл не найден: {path}')
+            except json.JSONDecodeError:
+                raise ValueError(f'Ошибка парсинга ABI файла: {path}')
+
+            for item in abi:
+                if item.get('inputs') is None:
+                    item['inputs'] = []
+            self._abis[abi_filename] = abi
+        return abi
+
+    def get_contract(self, abi_filename: str, address: Optional[str] = None) -> Contract:
+        if address is not None:
+            address = Web3.to_checksum_address(address)
+
+        key = (abi_filename, address)
+        contract = self._contracts.get(key)
+        if contract is None:
+            abi = self.get_abi(abi_filename)
+            if address is None:
+                contract = self._web3.eth.contract(abi=abi)
+            else:
+                contract = self._web3.eth.contract(address=address, abi=abi)
+            self._contracts[key] = contract
+        return contract
+
+    def encode(self, abi_filename: str, fn_name: str, args: Optional[list] = None, address: Optional[str] = None) -> str:
+        return self.get_contract(abi_filename, address).encodeABI(fn_name=fn_name, args=args)
+
+
+async def call_function(web3: AsyncWeb3, function: ContractFunction, block_identifier: Any = 'latest') -> Any:
+    """Выполняет view-функцию офлайн-контракта через eth_call переданного web3 и декодирует результат."""
+    result = await web3.eth.call(
+        {'to': function.address, 'data': function._encode_transaction_data()},
+        block_identifier
+    )
+    values = decode(get_abi_output_types(function.abi), bytes(result))
+    return values[0] if len(values) == 1 else list(values)
+
+
+abi_registry = AbiRegistry()
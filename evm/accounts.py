@@ -0,0 +1,61 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional
+
+from eth_account import Account
+from eth_account.datastructures import SignedTransaction
+from eth_account.signers.local import LocalAccount
+from loguru import logger
+
+
+@lru_cache(maxsize=4096)
+def get_account(private_key: str) -> LocalAccount:
+    """Возвращает LocalAccount для ключа; вывод адреса из ключа выполняется один раз на ключ."""
+    return Account.from_key(private_key)
+
+
+def sign_transaction(tx: dict, private_key: str) -> SignedTransaction:
+    # Функция верхнего уровня, чтобы её можно было выполнять в дочернем процессе
+    return get_account(private_key).sign_transaction(tx)
+
+
+class TransactionSigner:
+    """
+    Подпись транзакций.
+
+    По умолчанию подписывает в текущем потоке. Для массовых операций можно вызвать start(), тогда
+    подпись уходит в пул процессов и не блокирует event loop.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def start(self, max_workers: Optional[int] = None) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=max_workers or min(4, os.cpu_count() or 1))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def sign(self, tx: dict, private_key: str) -> SignedTransaction:
+        if self._executor is None:
+            return sign_transaction(tx, private_key)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, sign_transaction, tx, private_key)
+        except BrokenProcessPool as e:
+            logger.warning(f'Пул процессов для подписи недоступен ({e}), подписываем в основном потоке')
+            self._executor = None
+            return sign_transaction(tx, private_key)
+
+
+transaction_signer = TransactionSigner()
@@ -1,11 +1,25 @@
 import asyncio
-from web3 import AsyncWeb3, AsyncHTTPProvider
-from eth_account import Account
+from hexbytes import HexBytes
 from .networks import Network
+from .transport import BatchNotSupported, normalize_proxy, provider_pool
+from .endpoints import send_pin_key
+from .accounts import get_account, transaction_signer
+from .abi_registry import ERC20_ABI, abi_registry, call_function
+from .nonce_manager import is_already_known, is_nonce_error, nonce_manager
+from .head_cache import BlockHead, head_cache
+from .gas_model import gas_model
+from .receipt_tracker import TxReceipt, get_receipt_tracker
+from typing import Dict, Iterable, Optional, Set
+from web3.contract.contract import ContractFunction
 from fake_useragent import UserAgent
-from evm.models.token import TokenAmount
+from evm.models.token import Token, TokenAmount
+from .utils.balances import fetch_balances
 from loguru import logger
 
+
+user_agent = UserAgent()
+
+
 class EVMClient:
     def __init__(self, private_key: str, network: Network, proxy: str = None):
         self.private_key = private_key
@@ -15,28 +29,25 @@ class EVMClient:
             'accept': '*/*',
             'accept-language': 'en-US,en;q=0.9',
             'content-type': 'application/json',
-            'user-agent': UserAgent().chrome
+            'user-agent': user_agent.chrome
         }
         
-        if proxy:
-            if 'http' not in proxy:
-                proxy = f'http://{proxy}'
-            self.proxy = proxy
-        else:
-            self.proxy = None
+        self.proxy = normalize_proxy(proxy)
             
-        provider = AsyncHTTPProvider(
-            endpoint_uri=network.rpc_url,
-            request_kwargs={
-                'proxy': self.proxy,
-                'headers': self.headers
-            }
+        self.web3 = provider_pool.get_web3(
+            network=network,
+            proxy=self.proxy,
+            headers=self.headers
         )
-        
-        self.web3 = AsyncWeb3(provider)
-        self.account = Account.from_key(private_key)
+        self.account = get_account(private_key)
         self.chain_id = network.chain_id
 
+        # Отправленные и ещё не подтверждённые транзакции: пока они есть, газ оценивается по блоку pending,
+        # чтобы свап, собранный сразу за неподтверждённым approve, видел его allowance
+        self.unconfirmed: Set[str] = set()
+        # Списания allowance, которые попадут в журнал после подтверждения свапа (settle_allowances)
+        self.allowance_debits: list = []
+
     async def get_nonce(self):
         try:
             nonce = await self.web3.eth.get_transaction_count(
@@ -66,25 +77,25 @@ class EVMClient:
         gas: int = None
     ):
         try:
-            await asyncio.sleep(1)
-            
             tx_params = {
                 'from': self.account.address,
                 'to': to,
                 'value': value,
                 'data': data,
-                'nonce': await self.get_nonce(),
                 'chainId': self.chain_id,
                 'type': '0x2'
             }
 
-            estimated_gas = await self.web3.eth.estimate_gas(tx_params)
-            
-            latest_block = await self.web3.eth.get_block('latest')
-            base_fee = latest_block['baseFeePerGas']
+            if not gas:
+                # Для уже встречавшихся форм транзакций газ берётся из истории receipt'ов без eth_estimateGas
+                gas = gas_model.suggest(tx_params)
 
-            max_priority_fee = await self.web3.eth.max_priority_fee
+            try:
+                estimated_gas, base_fee, max_priority_fee = await self._fetch_tx_fields_batched(tx_params, gas)
+            except BatchNotSupported:
+                estimated_gas, base_fee, max_priority_fee = await self._fetch_tx_fields(tx_params, gas)
 
+            # nonce выделяется в send_transaction: собранная, но не отправленная транзакция не оставляет дыру
             tx = {
                 **tx_params,
                 'gas': estimated_gas,  
@@ -95,14 +106,130 @@ class EVMClient:
             return tx
             
         except Exception as e:
-            print(f"Ошибка при построении транзакции: {e}")
+            logger.error(f"Ошибка при построении транзакции: {e}")
             raise
 
+    async def allocate_nonce(self) -> int:
+        return await nonce_manager.allocate(self.chain_id, self.account.address, self.get_nonce)
+
+    async def get_head(self) -> BlockHead:
+        return await head_cache.get(self.web3, self.network)
+
+    async def _fetch_tx_fields(self, tx_params: dict, gas: int = None) -> tuple[int, int, int]:
+        estimated_gas = gas or await self.web3.eth.estimate_gas(tx_params, self._estimate_block())
+
+        head = await self.get_head()
+
+        return estimated_gas, head.base_fee, head.max_priority_fee
+
+    async def _fetch_tx_fields_batched(self, tx_params: dict, gas: int = None) -> tuple[int, int, int]:
+        """
+        Получает газ одним JSON-RPC batch запросом, параллельно с головой сети из head_cache. Если nonce
+        адреса ещё не известен локально, в тот же batch добавляется pending nonce для NonceManager, и
+        send_transaction выделяет nonce без RPC. Явный gas не запрашивается. Голова берётся через
+        head_cache.get, поэтому сборщики одного блока делят один запрос заголовка.
+        """
+        provider = self.web3.provider
+        if not hasattr(provider, 'make_batch_request'):
+            raise BatchNotSupported(getattr(provider, 'endpoint_uri', None))
+
+        nonce_synced = nonce_manager.is_synced(self.chain_id, self.account.address)
+
+        calls = {}
+        if not gas:
+            params = [self._to_rpc_tx(tx_params)]
+            if self.unconfirmed:
+                params.append(self._estimate_block())
+            calls['gas'] = ('eth_estimateGas', params)
+        if not nonce_synced:
+            calls['nonce'] = ('eth_getTransactionCount', [self.account.address, 'pending'])
+
+        async def batch() -> dict:
+            if not calls:
+                return {}
+            return dict(zip(calls, await provider.make_batch_request(list(calls.values()))))
+
+        responses, head = await asyncio.gather(batch(), self.get_head())
+
+        if 'nonce' in responses and 'error' not in responses['nonce']:
+            nonce_manager.seed(self.chain_id, self.account.address, int(responses['nonce']['result'], 16))
+
+        if gas:
+            estimated_gas = gas
+        elif 'error' in responses['gas']:
+            raise ValueError(responses['gas']['error'])
+        else:
+            estimated_gas = int(responses['gas']['result'], 16)
+
+        return estimated_gas, head.base_fee, head.max_priority_fee
+
+    def _estimate_block(self) -> Optional[str]:
+        return 'pending' if self.unconfirmed else None
+
+    @staticmethod
+    def _to_rpc_tx(tx_params: dict) -> dict:
+        rpc_tx = {
+            'from': tx_params['from'],
+            'value': hex(tx_params.get('value') or 0),
+            'data': HexBytes(tx_params.get('data') or b'').hex()
+        }
+        if tx_params.get('to'):
+            rpc_tx['to'] = tx_params['to']
+        return rpc_tx
+
     async def send_transaction(self, tx: dict) -> str:
-        signed_tx = self.web3.eth.account.sign_transaction(tx, private_key=self.private_key)
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        
+        # Все отправки одного адреса идут на один эндпоинт, чтобы nonce не расходились между узлами
+        pin_token = send_pin_key.set(self.account.address)
+        try:
+            if tx.get('nonce') is None:
+                tx = {**tx, 'nonce': await self.allocate_nonce()}
+            signed_tx = await transaction_signer.sign(tx, self.private_key)
+            try:
+                tx_hash = await self._send_signed(signed_tx)
+            except Exception as e:
+                if not is_nonce_error(e):
+                    raise
+
+                if await self._is_known(signed_tx.hash):
+                    tx_hash = HexBytes(signed_tx.hash)
+                else:
+                    logger.warning(f"{self.account.address}: nonce {tx.get('nonce')} отклонён узлом ({e}), синхронизируем")
+                    nonce_manager.resync(self.chain_id, self.account.address)
+                    tx = {**tx, 'nonce': await self.allocate_nonce()}
+                    signed_tx = await transaction_signer.sign(tx, self.private_key)
+                    tx_hash = await self._send_signed(signed_tx)
+        except BaseException:
+            # Выделенный nonce не ушёл в сеть (ошибка или отмена): без пересинхронизации следующая транзакция оставит дыру
+            nonce_manager.resync(self.chain_id, self.account.address)
+            raise
+        finally:
+            send_pin_key.reset(pin_token)
+
+        gas_model.track(tx_hash.hex(), tx)
+        self.unconfirmed.add(tx_hash.hex())
         return tx_hash.hex()
+
+    async def _send_signed(self, signed_tx) -> HexBytes:
+        try:
+            return await self.web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        except Exception as e:
+            if not is_already_known(e):
+                raise
+            logger.info(f"{self.account.address}: транзакция {signed_tx.hash.hex()} уже у узла, повторно не отправляем")
+            return HexBytes(signed_tx.hash)
+
+    async def _is_known(self, tx_hash: HexBytes) -> bool:
+        try:
+            return await self.web3.eth.get_transaction(tx_hash) is not None
+        except Exception:
+            return False
+
+    async def wait_for_receipt(self, tx_hash: str, timeout: float = None) -> Optional[TxReceipt]:
+        receipt = await get_receipt_tracker(self.network).wait(self.web3, tx_hash, timeout)
+        gas_model.observe(tx_hash, receipt)
+        if receipt is not None:
+            self.unconfirmed.discard(tx_hash)
+        return receipt
     
     
     async def get_native_balance(self) -> TokenAmount:
@@ -114,33 +241,18 @@ class EVMClient:
             logger.error(f"Ошибка при получении баланса: {e}")
             return None
     
+    async def call(self, function: ContractFunction, block_identifier='latest'):
+        """Вызов view-функции контракта из реестра ABI через RPC этого клиента."""
+        return await call_function(self.web3, function, block_identifier)
+
     async def get_balance(self, token_address: str, decimals: int = None) -> TokenAmount:
         try:
-            token_address = self.web3.to_checksum_address(token_address)
-            
-            erc20_abi = [
-                {
-                    "constant": True,
-                    "inputs": [{"name": "_owner", "type": "address"}],
-                    "name": "balanceOf",
-                    "outputs": [{"name": "balance", "type": "uint256"}],
-                    "type": "function",
-                },
-                {
-                    "constant": True,
-                    "inputs": [],
-                    "name": "decimals",
-                    "outputs": [{"name": "", "type": "uint8"}],
-                    "type": "function",
-                }
-            ]
+            token_contract = abi_registry.get_contract(ERC20_ABI, token_address)
             
-            token_contract = self.web3.eth.contract(address=token_address, abi=erc20_abi)
-            
-            balance = await token_contract.functions.balanceOf(self.account.address).call()
+            balance = await self.call(token_contract.functions.balanceOf(self.account.address))
             
             if decimals is None:
-                decimals = await token_contract.functions.decimals().call()
+                decimals = await self.call(token_contract.functions.decimals())
             
             return TokenAmount(amount=balance, decimals=decimals, wei=True)
         
@@ -148,4 +260,19 @@ class EVMClient:
             logger.error(f"Ошибка при получении баланса токена: {e}")
             return None
 
-    
+    async def get_balances(self, tokens: Iterable[Token], address: str = None) -> Optional[Dict[Token, TokenAmount]]:
+        """
+        Получает баланс нативной монеты и ERC-20 токенов за один запрос.
+
+        Для токенов, баланс которых получить не удалось, в словаре будет None.
+        """
+        tokens = list(tokens)
+        address = address or self.account.address
+
+        try:
+            raw_balances = await fetch_balances(self.web3, self.network, [(address, token) for token in tokens])
+        except Exception as e:
+            logger.error(f"Ошибка при получении балансов: {e}")
+            return None
+
+        return dict(zip(tokens, TokenAmount.from_wei_many(raw_balances, [token.decimals for token in tokens])))
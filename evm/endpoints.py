@@ -0,0 +1,110 @@
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence
+
+from .networks import Network
+
+
+# Ключ, к которому привязываются отправки транзакций (адрес отправителя), выставляется EVMClient.
+send_pin_key: ContextVar[Optional[str]] = ContextVar('send_pin_key', default=None)
+
+
+class Endpoint:
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: Optional[float] = None
+        self.errors = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.supports_batch = True
+
+    @property
+    def ejected(self) -> bool:
+        return self.ejected_until > time.monotonic()
+
+    def score(self, default_latency: float) -> float:
+        latency = self.latency if self.latency is not None else default_latency
+        return latency * (1 + self.errors)
+
+    def __repr__(self):
+        return f'Endpoint({self.url}, latency={self.latency}, errors={self.errors})'
+
+
+class EndpointPool:
+    """
+    Набор RPC-эндпоинтов одной сети со скользящей оценкой здоровья.
+
+    Оценка = EWMA задержки * (1 + подряд идущие ошибки). После eject_after ошибок подряд
+    эндпоинт исключается на eject_time секунд (с удвоением при повторных исключениях). Когда
+    срок истекает, он снова получает запросы как пробный: первая же ошибка исключает его опять,
+    успешный ответ возвращает в строй.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        alpha: float = 0.2,
+        eject_after: int = 3,
+        eject_time: float = 30,
+        default_latency: float = 0.5,
+        max_pins: int = 10000
+    ):
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.alpha = alpha
+        self.eject_after = eject_after
+        self.eject_time = eject_time
+        self.default_latency = default_latency
+        self.max_pins = max_pins
+        self._pins: 'OrderedDict[str, Endpoint]' = OrderedDict()
+
+    def ranked(self) -> List[Endpoint]:
+        healthy = [endpoint for endpoint in self.endpoints if not endpoint.ejected]
+        if not healthy:
+            return sorted(self.endpoints, key=lambda endpoint: endpoint.ejected_until)
+        return sorted(healthy, key=lambda endpoint: endpoint.score(self.default_latency))
+
+    def pinned(self, key: Optional[str]) -> Endpoint:
+        """Возвращает эндпоинт, закреплённый за ключом; закрепление меняется, только если он исключён."""
+        if key is None:
+            return self.ranked()[0]
+
+        key = key.lower()
+        endpoint = self._pins.get(key)
+        if endpoint is None or endpoint.ejected:
+            endpoint = self.ranked()[0]
+            self._pins[key] = endpoint
+            while len(self._pins) > self.max_pins:
+                self._pins.popitem(last=False)
+        else:
+            self._pins.move_to_end(key)
+
+        return endpoint
+
+    def hedge_delay(self, endpoint: Endpoint) -> float:
+        latency = endpoint.latency if endpoint.latency is not None else self.default_latency
+        return min(max(latency * 3, 0.2), 2.0)
+
+    def record_success(self, endpoint: Endpoint, latency: float) -> None:
+        if endpoint.latency is None:
+            endpoint.latency = latency
+        else:
+            endpoint.latency = self.alpha * latency + (1 - self.alpha) * endpoint.latency
+        endpoint.errors = 0
+        endpoint.ejections = 0
+        endpoint.ejected_until = 0.0
+
+    def record_failure(self, endpoint: Endpoint) -> None:
+        endpoint.errors += 1
+        if endpoint.errors >= self.eject_after:
+            endpoint.ejected_until = time.monotonic() + self.eject_time * 2 ** min(endpoint.ejections, 5)
+            endpoint.ejections += 1
+
+
+_pools: Dict[int, EndpointPool] = {}
+
+
+def get_endpoint_pool(network: Network) -> EndpointPool:
+    if network.chain_id not in _pools:
+        _pools[network.chain_id] = EndpointPool(network.rpc_urls)
+    return _pools[network.chain_id]
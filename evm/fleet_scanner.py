@@ -0,0 +1,63 @@
+import asyncio
+import itertools
+from typing import Dict, List, Optional, Sequence
+
+from loguru import logger
+
+from .models.token import Token, TokenAmount
+from .networks import Network
+from .transport import normalize_proxy, provider_pool
+from .utils.balances import fetch_balances
+
+
+class FleetScanner:
+    """
+    Снимок балансов для большого числа адресов в одной сети.
+
+    Пары (адрес, токен) режутся на чанки по chunk_size вызовов, каждый чанк — один Multicall
+    (getEthBalance / balanceOf). Одновременно выполняется не больше max_connections чанков,
+    чанки распределяются по proxies по кругу.
+    """
+
+    def __init__(
+        self,
+        network: Network,
+        proxies: Sequence[Optional[str]] = (),
+        chunk_size: int = 300,
+        max_connections: int = 4
+    ):
+        self.network = network
+        self.proxies = [normalize_proxy(proxy) for proxy in proxies if proxy] or [None]
+        self.chunk_size = chunk_size
+        self.max_connections = max_connections
+
+    async def scan(
+        self,
+        addresses: Sequence[str],
+        tokens: Sequence[Token]
+    ) -> Dict[str, Dict[Token, Optional[TokenAmount]]]:
+        pairs = [(address, token) for address in addresses for token in tokens]
+        chunks = [pairs[i:i + self.chunk_size] for i in range(0, len(pairs), self.chunk_size)]
+
+        semaphore = asyncio.Semaphore(self.max_connections)
+        proxies = itertools.cycle(self.proxies)
+
+        async def scan_chunk(chunk, proxy) -> List[Optional[int]]:
+            async with semaphore:
+                web3 = provider_pool.get_web3(network=self.network, proxy=proxy)
+                try:
+                    return await fetch_balances(web3, self.network, chunk)
+                except Exception as e:
+                    logger.error(f"{self.network.name}: не удалось получить балансы для {len(chunk)} пар: {e}")
+                    return [None] * len(chunk)
+
+        results = await asyncio.gather(*[scan_chunk(chunk, next(proxies)) for chunk in chunks])
+
+        table: Dict[str, Dict[Token, Optional[TokenAmount]]] = {address: {} for address in addresses}
+        amounts = TokenAmount.from_wei_many(
+            itertools.chain.from_iterable(results), [token.decimals for _, token in pairs]
+        )
+        for (address, token), amount in zip(pairs, amounts):
+            table[address][token] = amount
+
+        return table
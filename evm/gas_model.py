@@ -0,0 +1,117 @@
+import math
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from eth_abi import decode
+from hexbytes import HexBytes
+from loguru import logger
+
+from .receipt_tracker import TxReceipt
+from .utils.calldata import selector_of
+
+
+GasKey = Tuple[int, str, bytes, int, bool, tuple]
+
+
+def _v2_path(types: List[str], index: int) -> Callable[[bytes], tuple]:
+    def path(args: bytes) -> tuple:
+        return tuple(address.lower() for address in decode(types, args)[index])
+    return path
+
+
+def _ambient_swap(args: bytes) -> tuple:
+    # userCmd(1, cmd): слова cmd - base, quote, poolIdx, isBuy, ...
+    _, cmd = decode(['uint16', 'bytes'], args)
+    return '0x' + cmd[12:32].hex(), '0x' + cmd[44:64].hex(), int.from_bytes(cmd[96:128], 'big')
+
+
+# Селектор -> извлечение пути токенов из аргументов calldata
+PATH_DECODERS: Dict[bytes, Callable[[bytes], tuple]] = {
+    selector_of('swapExactETHForTokens(uint256,address[],address,uint256)'):
+        _v2_path(['uint256', 'address[]', 'address', 'uint256'], 1),
+    selector_of('swapExactTokensForETH(uint256,uint256,address[],address,uint256)'):
+        _v2_path(['uint256', 'uint256', 'address[]', 'address', 'uint256'], 2),
+    selector_of('swapExactTokensForTokens(uint256,uint256,address[],address,uint256)'):
+        _v2_path(['uint256', 'uint256', 'address[]', 'address', 'uint256'], 2),
+    selector_of('userCmd(uint16,bytes)'): _ambient_swap,
+}
+
+
+def gas_key(tx: dict) -> Optional[GasKey]:
+    """
+    Форма транзакции: (сеть, получатель, селектор, длина calldata, есть ли value, путь токенов).
+
+    Для известных раскладок (свапы UniswapV2-роутера, userCmd Ambient) путь берётся из calldata,
+    и у BEAN->WMON и USDC->WMON разная история. Для остальных форму отличает длина calldata:
+    она разделяет пути разной длины и команды Universal Router, но не зависит от сумм и дедлайна.
+    """
+    if not tx.get('to'):
+        return None
+    data = HexBytes(tx.get('data') or b'')
+    selector = bytes(data[:4])
+
+    path = ()
+    decoder = PATH_DECODERS.get(selector)
+    if decoder is not None:
+        try:
+            path = decoder(bytes(data[4:]))
+        except Exception:
+            path = ()
+
+    return (int(tx.get('chainId') or 0), str(tx['to']).lower(), selector, len(data), bool(tx.get('value')), path)
+
+
+class GasModel:
+    """
+    Лимит газа по истории gasUsed для повторяющихся транзакций.
+
+    Для каждой формы хранятся последние gasUsed из receipt'ов. Когда их набирается min_samples,
+    build_transaction берёт percentile с запасом margin вместо eth_estimateGas. Для новых форм
+    и после отката транзакции с этой формой снова используется оценка узла.
+    """
+
+    def __init__(self, min_samples: int = 3, window: int = 50, percentile: float = 0.9, margin: float = 1.2):
+        self.min_samples = min_samples
+        self.window = window
+        self.percentile = percentile
+        self.margin = margin
+
+        self._samples: Dict[GasKey, Deque[int]] = {}
+        self._sent: Dict[str, GasKey] = {}
+
+    def suggest(self, tx: dict) -> Optional[int]:
+        key = gas_key(tx)
+        samples = self._samples.get(key) if key else None
+        if not samples or len(samples) < self.min_samples:
+            return None
+
+        ordered = sorted(samples)
+        value = ordered[max(0, math.ceil(self.percentile * len(ordered)) - 1)]
+        return int(value * self.margin)
+
+    def track(self, tx_hash: str, tx: dict) -> None:
+        key = gas_key(tx)
+        if key is None:
+            return
+        if len(self._sent) > 10000:
+            self._sent.clear()
+        self._sent[tx_hash.lower()] = key
+
+    def observe(self, tx_hash: str, receipt: Optional[TxReceipt]) -> None:
+        key = self._sent.pop(tx_hash.lower(), None)
+        if key is None or receipt is None:
+            return
+
+        if not receipt.success:
+            # Откат мог быть из-за нехватки газа: до новых данных эта форма снова оценивается узлом
+            if self._samples.pop(key, None):
+                logger.debug(f'Транзакция {tx_hash} откатилась, история газа для {key[1]}:{key[2].hex()} сброшена')
+            return
+
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(receipt.gas_used)
+
+
+gas_model = GasModel()
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from web3 import AsyncWeb3
+
+from .networks import Network
+from .transport import BatchNotSupported
+
+
+@dataclass
+class BlockHead:
+    number: int
+    timestamp: int
+    base_fee: int
+    max_priority_fee: int
+    fetched_at: float
+
+
+class HeadCache:
+    """
+    Кеш последнего блока (номер, timestamp, base fee) и priority fee для каждой сети.
+
+    Запись считается свежей в течение network.block_time. Параллельные обновления одной сети
+    схлопываются в один запрос: остальные корутины ждут его результат.
+    """
+
+    def __init__(self):
+        self._heads: Dict[int, BlockHead] = {}
+        self._inflight: Dict[int, asyncio.Future] = {}
+
+    def peek(self, network: Network) -> Optional[BlockHead]:
+        head = self._heads.get(network.chain_id)
+        if head and time.monotonic() - head.fetched_at < network.block_time:
+            return head
+        return None
+
+    def update(self, network: Network, block: dict, max_priority_fee: int) -> BlockHead:
+        head = BlockHead(
+            number=self._to_int(block['number']),
+            timestamp=self._to_int(block['timestamp']),
+            base_fee=self._to_int(block['baseFeePerGas']),
+            max_priority_fee=max_priority_fee,
+            fetched_at=time.monotonic()
+        )
+        current = self._heads.get(network.chain_id)
+        if current is None or head.number >= current.number:
+            self._heads[network.chain_id] = head
+        return head
+
+    async def get(self, web3: AsyncWeb3, network: Network) -> BlockHead:
+        head = self.peek(network)
+        if head:
+            return head
+
+        key = network.chain_id
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(web3, network))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    async def _refresh(self, web3: AsyncWeb3, network: Network) -> BlockHead:
+        provider = web3.provider
+        if hasattr(provider, 'make_batch_request'):
+            try:
+                block_resp, priority_fee_resp = await provider.make_batch_request([
+                    ('eth_getBlockByNumber', ['latest', False]),
+                    ('eth_maxPriorityFeePerGas', []),
+                ])
+                if 'error' not in block_resp and block_resp.get('result') and 'error' not in priority_fee_resp:
+                    return self.update(network, block_resp['result'], int(priority_fee_resp['result'], 16))
+            except BatchNotSupported:
+                pass
+
+        block = await web3.eth.get_block('latest')
+        max_priority_fee = await web3.eth.max_priority_fee
+        return self.update(network, block, max_priority_fee)
+
+    @staticmethod
+    def _to_int(value) -> int:
+        return int(value, 16) if isinstance(value, str) else int(value)
+
+
+head_cache = HeadCache()
@@ -1,46 +1,58 @@
-import json
-from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from eth_utils import function_abi_to_4byte_selector
 from web3 import Web3
 from web3.contract import Contract
 
+from ..abi_registry import abi_registry
+
 
 class Protocol:
     def __init__(
         self,
         address: str,
         name: str,
-        abi_filename: str
+        abi_filename: str,
+        selectors: Optional[Dict[str, str]] = None,
+        swap_methods: Iterable[str] = ()
     ):
         self.address = Web3.to_checksum_address(address)
         self.name = name
         self.abi_filename = abi_filename
-        self._abi = None
-        self._contract: Optional[Contract] = None
-        
-        
+        # Селекторы методов, которых нет в ABI (или когда ABI нет вовсе): {'0x3593564c': 'execute'}
+        self.selectors = selectors or {}
+        self.swap_methods = frozenset(swap_methods)
+
+
     @property
     def abi(self):
-        if self._abi is None:
-            path = Path("evm/abis") / self.abi_filename
+        return abi_registry.get_abi(self.abi_filename)
+
+
+    @property
+    def methods(self) -> Dict[bytes, str]:
+        """Селектор -> имя метода по ABI и заданным вручную селекторам."""
+        methods = {}
+        if self.abi_filename:
             try:
-                with path.open("r", encoding="utf-8") as file:
-                    self._abi = json.load(file)
-                    
-                for item in self._abi:
-                    if item.get("inputs") is None:
-                        item["inputs"] = []
+                abi = self.abi
             except FileNotFoundError:
-                raise FileNotFoundError(f"ABI файл не найден: {path}")
-            except json.JSONDecodeError:
-                raise ValueError(f"Ошибка парсинга ABI файла: {path}")
-        return self._abi
-
-
-    def get_contract(self, web3) -> Contract:
-        if self._contract is None:
-            self._contract = web3.eth.contract(
-                address=self.address,
-                abi=self.abi
-            )
-        return self._contract
\ No newline at end of file
+                abi = []
+            for item in abi:
+                if item.get('type') == 'function':
+                    methods[function_abi_to_4byte_selector(item)] = item['name']
+
+        for selector, method in self.selectors.items():
+            methods[bytes.fromhex(selector[2:] if selector.startswith('0x') else selector)] = method
+        return methods
+
+
+    def get_contract(self) -> Contract:
+        """Офлайн-контракт из реестра ABI: для calldata и для client.call."""
+        return abi_registry.get_contract(self.abi_filename, self.address)
+
+
+class ProtocolMethod(NamedTuple):
+    protocol: Protocol
+    name: str
+    is_swap: bool
@@ -0,0 +1,82 @@
+from typing import Dict, Generic, List, Optional, Tuple, TypeVar, Union
+
+from ..protocol import Protocol, ProtocolMethod
+
+
+T = TypeVar('T')
+
+
+class Registry(Generic[T]):
+    """
+    Базовый класс реестров токенов и протоколов.
+
+    Индекс по адресу строится при объявлении подкласса: все публичные атрибуты типа item_type
+    попадают в _by_address, поэтому get_by_address - это один поиск в словаре.
+    """
+
+    item_type: type = object
+    unknown_message: str = 'Неизвестный адрес'
+
+    _items: List[T] = []
+    _by_address: Dict[str, T] = {}
+
+    def __init_subclass__(cls, item_type: type = None, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if item_type is not None:
+            cls.item_type = item_type
+        if cls.item_type is object:
+            return
+
+        cls._items = [
+            value for name, value in vars(cls).items()
+            if not name.startswith('_') and isinstance(value, cls.item_type)
+        ]
+        cls._by_address = {item.address.lower(): item for item in cls._items}
+
+    @classmethod
+    def all(cls) -> List[T]:
+        return list(cls._items)
+
+    @classmethod
+    def get_by_address(cls, address: str) -> T:
+        address = address.lower()
+        if address not in cls._by_address:
+            raise ValueError(f"{cls.unknown_message} {address}")
+
+        return cls._by_address[address]
+
+
+class ProtocolRegistry(Registry[Protocol]):
+    """
+    Реестр протоколов с индексом (адрес, селектор) -> ProtocolMethod.
+
+    Позволяет определить метод и признак свапа по сырому input транзакции без имён методов из эксплорера.
+    """
+
+    item_type = Protocol
+    unknown_message = "Неизвестный протокол с адресом"
+
+    _by_selector: Dict[Tuple[str, bytes], ProtocolMethod] = {}
+    _by_name: Dict[Tuple[str, str], ProtocolMethod] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._by_selector = {}
+        cls._by_name = {}
+        for protocol in cls._items:
+            address = protocol.address.lower()
+            for selector, name in protocol.methods.items():
+                method = ProtocolMethod(protocol=protocol, name=name, is_swap=name in protocol.swap_methods)
+                cls._by_selector[(address, selector)] = method
+                cls._by_name.setdefault((address, name), method)
+
+    @classmethod
+    def get_method(cls, to: str, selector: Union[str, bytes]) -> Optional[ProtocolMethod]:
+        """Метод по адресу контракта и селектору (bytes, '0x12345678' или весь input транзакции)."""
+        if isinstance(selector, str):
+            selector = bytes.fromhex(selector[2:10] if selector.startswith('0x') else selector[:8])
+        return cls._by_selector.get((to.lower(), bytes(selector[:4])))
+
+    @classmethod
+    def get_method_by_name(cls, to: str, name: str) -> Optional[ProtocolMethod]:
+        return cls._by_name.get((to.lower(), name))
@@ -1,20 +1,46 @@
-import json
-from pathlib import Path
-from typing import Optional, Union
+import itertools
+from functools import lru_cache, total_ordering
+from typing import Iterable, List, Optional, Union
 from web3 import Web3
 from decimal import Decimal
+from fractions import Fraction
 from web3.contract import Contract
 
+from ..abi_registry import ERC20_ABI, abi_registry
+
+@lru_cache(maxsize=1024)
+def _scaled(value: Union[int, float, Decimal], decimals: int) -> Union[int, Decimal]:
+    # Пороги из настроек сравниваются постоянно, поэтому перевод числа в wei кешируется
+    if isinstance(value, float):
+        value = Decimal(str(value))
+    value = value * 10 ** decimals
+    # Целое число wei сравнивается с int заметно быстрее, чем с Decimal
+    return int(value) if value == int(value) else value
+
+
+@total_ordering
 class TokenAmount:
+    """
+    Сумма токена, хранимая в целых wei.
+
+    Ether вычисляется при первом обращении. Арифметика и сравнения выполняются над wei без float:
+    TokenAmount складывается и сравнивается с TokenAmount тех же decimals, а с числами (int, float,
+    Decimal) сравнивается как с суммой в ether.
+    """
+
+    __slots__ = ('Wei', 'decimals', '_ether')
+
     def __init__(self, amount: Union[int, float, str, Decimal], decimals: int = 18, wei: bool = False) -> None:
+        self.decimals = decimals
         if wei:
             self.Wei: int = int(amount)
-            self.Ether: Decimal = Decimal(str(amount)) / 10 ** decimals
+            self._ether: Optional[Decimal] = None
+        elif isinstance(amount, int):
+            self.Wei = amount * 10 ** decimals
+            self._ether = Decimal(amount)
         else:
-            self.Wei: int = int(Decimal(str(amount)) * 10 ** decimals)
-            self.Ether: Decimal = Decimal(str(amount))
-
-        self.decimals = decimals
+            self._ether = Decimal(str(amount))
+            self.Wei = int(self._ether * 10 ** decimals)
 
 
     @classmethod
@@ -27,10 +53,113 @@ class TokenAmount:
         return cls(amount=ether_amount, decimals=decimals, wei=False)
 
 
+    @classmethod
+    def from_wei_many(
+        cls,
+        wei_amounts: Iterable[Optional[int]],
+        decimals: Union[int, Iterable[int]] = 18
+    ) -> List[Optional['TokenAmount']]:
+        """Массовая обёртка сырых балансов; None остаётся None. decimals - одно значение или по одному на сумму."""
+        decimals = itertools.repeat(decimals) if isinstance(decimals, int) else decimals
+        return [
+            cls._raw(int(wei_amount), token_decimals) if wei_amount is not None else None
+            for wei_amount, token_decimals in zip(wei_amounts, decimals)
+        ]
+
+
+    @classmethod
+    def _raw(cls, wei_amount: int, decimals: int) -> 'TokenAmount':
+        # Конструктор без разбора аргументов для массовых операций и арифметики
+        amount = cls.__new__(cls)
+        amount.Wei = wei_amount
+        amount.decimals = decimals
+        amount._ether = None
+        return amount
+
+
+    @property
+    def Ether(self) -> Decimal:
+        if self._ether is None:
+            self._ether = Decimal(self.Wei) / 10 ** self.decimals
+        return self._ether
+
+
+    def _compare(self, other) -> Optional[int]:
+        """-1, 0 или 1; сравнение точное: суммы приводятся к общему масштабу, а не к float."""
+        if isinstance(other, TokenAmount):
+            left, right = self.Wei * 10 ** other.decimals, other.Wei * 10 ** self.decimals
+        elif isinstance(other, (int, float, Decimal)) and not isinstance(other, bool):
+            left, right = self.Wei, _scaled(other, self.decimals)
+        else:
+            return None
+        return (left > right) - (left < right)
+
+
+    def _same_decimals(self, other: 'TokenAmount') -> int:
+        if other.decimals != self.decimals:
+            raise ValueError(f'Суммы с разными decimals: {self.decimals} и {other.decimals}')
+        return other.Wei
+
+
+    def __eq__(self, other) -> bool:
+        result = self._compare(other)
+        return NotImplemented if result is None else result == 0
+
+
+    def __lt__(self, other) -> bool:
+        result = self._compare(other)
+        return NotImplemented if result is None else result < 0
+
+
+    def __hash__(self) -> int:
+        # Точное рациональное значение: хеш совпадает у равных TokenAmount, int и Decimal.
+        # float сравнивается по десятичной записи (0.1 == TokenAmount(0.1)), а его хеш - по двоичному
+        # значению, поэтому float и TokenAmount нельзя смешивать как ключи словаря или множества.
+        return hash(Fraction(self.Wei, 10 ** self.decimals))
+
+
+    def __add__(self, other) -> 'TokenAmount':
+        if not isinstance(other, TokenAmount):
+            if other == 0:
+                return self
+            return NotImplemented
+        return TokenAmount._raw(self.Wei + self._same_decimals(other), self.decimals)
+
+    __radd__ = __add__
+
+
+    def __sub__(self, other) -> 'TokenAmount':
+        if not isinstance(other, TokenAmount):
+            return NotImplemented
+        return TokenAmount._raw(self.Wei - self._same_decimals(other), self.decimals)
+
+
+    def __mul__(self, factor: Union[int, float, Decimal]) -> 'TokenAmount':
+        if isinstance(factor, int):
+            return TokenAmount._raw(self.Wei * factor, self.decimals)
+        if isinstance(factor, (float, Decimal)):
+            return TokenAmount._raw(int(self.Wei * Fraction(str(factor))), self.decimals)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+
+    def __truediv__(self, divisor: Union[int, float, Decimal]) -> 'TokenAmount':
+        if isinstance(divisor, int):
+            return TokenAmount._raw(self.Wei // divisor, self.decimals)
+        if isinstance(divisor, (float, Decimal)):
+            return TokenAmount._raw(int(self.Wei / Fraction(str(divisor))), self.decimals)
+        return NotImplemented
+
+
     def __str__(self):
         return f'{self.Ether}'
 
 
+    def __repr__(self):
+        return f'TokenAmount({self.Ether}, decimals={self.decimals})'
+
+
 class Token:
     def __init__(
         self,
@@ -47,26 +176,13 @@ class Token:
         self.decimals = decimals
         self.is_native = is_native
         self.abi_filename = abi_filename
-        self._abi = None
-        self._contract: Optional[Contract] = None
 
 
     @property
     def abi(self):
-        if self._abi is None and self.abi_filename:
-            path = Path("evm/abis") / self.abi_filename
-            try:
-                with path.open("r", encoding="utf-8") as file:
-                    self._abi = json.load(file)
-                for item in self._abi:
-                    if item.get("inputs") is None:
-                        item["inputs"] = []
-                        
-            except FileNotFoundError:
-                raise FileNotFoundError(f"ABI файл не найден: {path}")
-            except json.JSONDecodeError:
-                raise ValueError(f"Ошибка парсинга ABI файла: {path}")
-        return self._abi
+        if self.is_native:
+            return None
+        return abi_registry.get_abi(self.abi_filename or ERC20_ABI)
 
 
     @property
@@ -82,11 +198,7 @@ class Token:
         return wei_amount / self.multiplier
 
 
-    def get_contract(self, web3) -> Optional[Contract]:
-        if not self.is_native and self._contract is None and self.abi:
-            self._contract = web3.eth.contract(
-                address=self.address,
-                abi=self.abi
-            )
-        return self._contract
-    
\ No newline at end of file
+    def get_contract(self) -> Optional[Contract]:
+        if self.is_native:
+            return None
+        return abi_registry.get_contract(self.abi_filename or ERC20_ABI, self.address)
@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+from eth_abi import decode, encode
+from web3 import AsyncWeb3
+
+
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+
+AGGREGATE3_SELECTOR = bytes.fromhex('82ad56cb')
+GET_ETH_BALANCE_SELECTOR = bytes.fromhex('4d2301cc')
+BALANCE_OF_SELECTOR = bytes.fromhex('70a08231')
+
+
+@dataclass
+class Call:
+    target: str
+    data: bytes
+    allow_failure: bool = True
+
+
+def address_word(address: str) -> bytes:
+    return bytes.fromhex(address[2:].rjust(64, '0'))
+
+
+def balance_of_call(token_address: str, owner: str) -> Call:
+    return Call(target=token_address, data=BALANCE_OF_SELECTOR + address_word(owner))
+
+
+def eth_balance_call(multicall_address: str, owner: str) -> Call:
+    return Call(target=multicall_address, data=GET_ETH_BALANCE_SELECTOR + address_word(owner))
+
+
+def encode_aggregate3(calls: Sequence[Call]) -> bytes:
+    return AGGREGATE3_SELECTOR + encode(
+        ['(address,bool,bytes)[]'],
+        [[(call.target, call.allow_failure, call.data) for call in calls]]
+    )
+
+
+def decode_aggregate3(data: bytes) -> List[Tuple[bool, bytes]]:
+    return list(decode(['(bool,bytes)[]'], bytes(data))[0])
+
+
+def decode_uint(data: bytes) -> int:
+    return int.from_bytes(data[:32], 'big')
+
+
+async def aggregate3(
+    web3: AsyncWeb3,
+    multicall_address: str,
+    calls: Sequence[Call],
+    block_identifier: str | int = 'latest'
+) -> List[Tuple[bool, bytes]]:
+    """Выполняет все calls одним eth_call к Multicall3 и возвращает [(success, returnData), ...]."""
+    if not calls:
+        return []
+
+    result = await web3.eth.call(
+        {'to': multicall_address, 'data': encode_aggregate3(calls)},
+        block_identifier
+    )
+    return decode_aggregate3(result)
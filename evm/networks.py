@@ -1,23 +1,44 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .multicall import MULTICALL3_ADDRESS
 
 @dataclass
 class Network:
     name: str
     rpc_url: str
     chain_id: int
+    block_time: float = 1.0
+    multicall_address: Optional[str] = None
+    fallback_rpc_urls: List[str] = field(default_factory=list)
+
+    @property
+    def rpc_urls(self) -> List[str]:
+        return [self.rpc_url, *self.fallback_rpc_urls]
 
 class Networks:
     ARBITRUM = Network(
         name='Arbitrum',
         rpc_url='https://endpoints.omniatech.io/v1/arbitrum/one/public',
-        chain_id=42161
+        chain_id=42161,
+        block_time=0.25,
+        multicall_address=MULTICALL3_ADDRESS,
+        fallback_rpc_urls=[
+            'https://arb1.arbitrum.io/rpc',
+            'https://arbitrum-one-rpc.publicnode.com',
+        ]
     )
     
     MONAD = Network(
         name='Monad Testnet',
         rpc_url='https://testnet-rpc.monad.xyz',
-        chain_id=10143
+        chain_id=10143,
+        block_time=0.5,
+        multicall_address=MULTICALL3_ADDRESS,
+        fallback_rpc_urls=[
+            'https://monad-testnet.drpc.org',
+            'https://rpc.ankr.com/monad_testnet',
+        ]
     )
     
     @classmethod
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+
+NONCE_ERRORS = (
+    'nonce too low',
+    'nonce too high',
+    'invalid nonce',
+    # nonce занят другой транзакцией в мемпуле; если это наша же транзакция, отправка уже состоялась
+    'replacement transaction underpriced',
+)
+
+# Ровно эта транзакция уже есть у узла: повторная отправка не нужна
+ALREADY_KNOWN_ERRORS = (
+    'already known',
+    'known transaction',
+    'already imported',
+)
+
+
+def is_nonce_error(error: Exception) -> bool:
+    text = str(error).lower()
+    return any(marker in text for marker in NONCE_ERRORS)
+
+
+def is_already_known(error: Exception) -> bool:
+    text = str(error).lower()
+    return any(marker in text for marker in ALREADY_KNOWN_ERRORS)
+
+
+class _NonceState:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.next_nonce: Optional[int] = None
+
+
+class NonceManager:
+    """
+    Локальный аллокатор nonce для пары (chain_id, address).
+
+    Nonce запрашивается у узла один раз, дальше параллельные сборщики транзакций получают
+    последовательные значения без RPC. После ошибки nonce состояние сбрасывается, и следующий
+    вызов снова синхронизируется с узлом.
+    """
+
+    def __init__(self):
+        self._states: Dict[Tuple[int, str], _NonceState] = {}
+
+    def _state(self, chain_id: int, address: str) -> _NonceState:
+        key = (chain_id, address.lower())
+        if key not in self._states:
+            self._states[key] = _NonceState()
+        return self._states[key]
+
+    def is_synced(self, chain_id: int, address: str) -> bool:
+        return self._state(chain_id, address).next_nonce is not None
+
+    async def allocate(self, chain_id: int, address: str, fetch: Callable[[], Awaitable[int]]) -> int:
+        state = self._state(chain_id, address)
+        async with state.lock:
+            if state.next_nonce is None:
+                state.next_nonce = await fetch()
+            nonce = state.next_nonce
+            state.next_nonce += 1
+            return nonce
+
+    def seed(self, chain_id: int, address: str, pending_nonce: int) -> None:
+        state = self._state(chain_id, address)
+        if state.next_nonce is None:
+            state.next_nonce = pending_nonce
+
+    def resync(self, chain_id: int, address: str) -> None:
+        self._state(chain_id, address).next_nonce = None
+
+
+nonce_manager = NonceManager()
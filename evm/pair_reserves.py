@@ -0,0 +1,151 @@
+import asyncio
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from eth_abi import decode
+from loguru import logger
+from web3 import AsyncWeb3, Web3
+
+from .head_cache import head_cache
+from .multicall import Call, address_word, aggregate3
+from .networks import Network
+from .utils.calldata import selector_of
+
+
+FACTORY_SELECTOR = selector_of('factory()')
+GET_PAIR_SELECTOR = selector_of('getPair(address,address)')
+GET_RESERVES_SELECTOR = selector_of('getReserves()')
+
+ZERO_ADDRESS = '0x' + '0' * 40
+
+PairKey = Tuple[str, str]
+
+
+def get_amount_out(amount_in: int, reserve_in: int, reserve_out: int, fee_numerator: int = 997) -> int:
+    """Формула UniswapV2Library.getAmountOut: комиссия берётся с входа, (1000 - fee_numerator) / 1000."""
+    if amount_in <= 0:
+        raise ValueError('amount_in должен быть больше нуля')
+    if reserve_in <= 0 or reserve_out <= 0:
+        raise ValueError('У пары нет ликвидности')
+    amount_in_with_fee = amount_in * fee_numerator
+    return amount_in_with_fee * reserve_out // (reserve_in * 1000 + amount_in_with_fee)
+
+
+def get_amounts_out(
+    amount_in: int,
+    path: Sequence[str],
+    reserves: Dict[PairKey, Tuple[int, int]],
+    fee_numerator: int = 997
+) -> List[int]:
+    """Локальный аналог router.getAmountsOut по резервам пар; reserves хранятся в порядке (token0, token1)."""
+    amounts = [amount_in]
+    for token_in, token_out in zip(path, path[1:]):
+        key = pair_key(token_in, token_out)
+        reserve0, reserve1 = reserves[key]
+        reserve_in, reserve_out = (reserve0, reserve1) if key[0] == token_in.lower() else (reserve1, reserve0)
+        amounts.append(get_amount_out(amounts[-1], reserve_in, reserve_out, fee_numerator))
+    return amounts
+
+
+def pair_key(token_a: str, token_b: str) -> PairKey:
+    # Пара UniswapV2 упорядочивает токены по адресу: token0 < token1
+    token_a, token_b = token_a.lower(), token_b.lower()
+    return (token_a, token_b) if token_a < token_b else (token_b, token_a)
+
+
+class PairReserves:
+    """
+    Резервы пар UniswapV2-форка, общие для всех кошельков процесса.
+
+    Адрес фабрики и пар узнаётся один раз. Резервы всех пар, которые уже запрашивались, читаются
+    одним вызовом Multicall3 на блок, поэтому котировки всего флота стоят несколько чтений на блок
+    вместо getAmountsOut на каждый свап.
+    """
+
+    def __init__(self, network: Network, router_address: str, fee_numerator: int = 997):
+        self.network = network
+        self.router_address = Web3.to_checksum_address(router_address)
+        self.fee_numerator = fee_numerator
+
+        self._factory: Optional[str] = None
+        self._pairs: Dict[PairKey, Optional[str]] = {}
+        self._reserves: Dict[PairKey, Tuple[int, int]] = {}
+        self._reserves_block: int = -1
+        self._inflight: Dict[object, asyncio.Future] = {}
+
+    async def get_amounts_out(self, web3: AsyncWeb3, path: Sequence[str], amount_in: int) -> Optional[List[int]]:
+        """Возвращает None, если для какого-то шага пути у фабрики нет пары."""
+        keys = [pair_key(token_in, token_out) for token_in, token_out in zip(path, path[1:])]
+
+        unknown = [key for key in keys if key not in self._pairs]
+        if unknown:
+            await self._once(('pairs', tuple(unknown)), lambda: self._load_pairs(web3, unknown))
+        if any(self._pairs.get(key) is None for key in keys):
+            return None
+
+        head = await head_cache.get(web3, self.network)
+        if self._reserves_block < head.number or any(key not in self._reserves for key in keys):
+            await self._once(('reserves', head.number), lambda: self._load_reserves(web3, head.number))
+            if any(key not in self._reserves for key in keys):
+                # Пара добавилась, пока уже шло чтение резервов этого блока
+                await self._load_reserves(web3, head.number)
+
+        return get_amounts_out(amount_in, path, self._reserves, self.fee_numerator)
+
+    async def get_amount_out(self, web3: AsyncWeb3, path: Sequence[str], amount_in: int) -> Optional[int]:
+        amounts = await self.get_amounts_out(web3, path, amount_in)
+        return amounts[-1] if amounts else None
+
+    async def _once(self, key, factory) -> None:
+        # Одинаковые параллельные загрузки схлопываются в одну, как в HeadCache
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        await asyncio.shield(task)
+
+    async def _load_pairs(self, web3: AsyncWeb3, keys: List[PairKey]) -> None:
+        keys = [key for key in keys if key not in self._pairs]
+        if not keys:
+            return
+
+        if self._factory is None:
+            result = await web3.eth.call({'to': self.router_address, 'data': FACTORY_SELECTOR})
+            self._factory = Web3.to_checksum_address(decode(['address'], bytes(result))[0])
+
+        calls = [
+            Call(target=self._factory, data=GET_PAIR_SELECTOR + address_word(key[0]) + address_word(key[1]))
+            for key in keys
+        ]
+        for key, (success, data) in zip(keys, await self._call(web3, calls, 'latest')):
+            if not success:
+                raise ValueError(f'Не удалось получить пару {key} у фабрики {self._factory}')
+            pair = decode(['address'], bytes(data))[0]
+            self._pairs[key] = None if pair == ZERO_ADDRESS else Web3.to_checksum_address(pair)
+            if self._pairs[key] is None:
+                logger.debug(f'У фабрики {self._factory} нет пары {key[0]}/{key[1]}')
+
+    async def _load_reserves(self, web3: AsyncWeb3, block_number: int) -> None:
+        pairs = {key: pair for key, pair in self._pairs.items() if pair is not None}
+        if self._reserves_block >= block_number and all(key in self._reserves for key in pairs):
+            return
+
+        calls = [Call(target=pair, data=GET_RESERVES_SELECTOR) for pair in pairs.values()]
+        reserves = {}
+        for key, (success, data) in zip(pairs, await self._call(web3, calls, block_number)):
+            if not success:
+                raise ValueError(f'Не удалось прочитать резервы пары {pairs[key]}')
+            reserve0, reserve1, _ = decode(['uint112', 'uint112', 'uint32'], bytes(data))
+            reserves[key] = (reserve0, reserve1)
+
+        self._reserves = reserves
+        self._reserves_block = block_number
+
+    async def _call(self, web3: AsyncWeb3, calls: List[Call], block_identifier) -> List[Tuple[bool, bytes]]:
+        if self.network.multicall_address:
+            return await aggregate3(web3, self.network.multicall_address, calls, block_identifier)
+
+        results = await asyncio.gather(*[
+            web3.eth.call({'to': call.target, 'data': call.data}, block_identifier) for call in calls
+        ], return_exceptions=True)
+        return [(not isinstance(result, Exception), b'' if isinstance(result, Exception) else bytes(result)) for result in results]
@@ -0,0 +1,204 @@
+import asyncio
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from eth_abi import decode
+from loguru import logger
+from web3 import AsyncWeb3, Web3
+
+from .head_cache import head_cache
+from .multicall import Call, aggregate3
+from .networks import Network
+from .pair_reserves import PairReserves
+from .utils.calldata import CalldataTemplate, Slot
+
+
+Path = Tuple[str, ...]
+
+
+@dataclass
+class Quote:
+    amount_in: int
+    amount_out: int
+    block_number: int
+
+
+class QuoteService:
+    """
+    Котировки getAmountsOut UniswapV2-роутера с кешем по (путь, корзина amountIn, блок).
+
+    amountIn округляется вверх до края геометрической корзины (шаг bucket_step), и котируется
+    именно край: из-за проскальзывания пула выход на единицу для большей суммы не больше, чем
+    для меньшей, поэтому пересчёт на фактическую сумму даёт заниженную, то есть безопасную оценку.
+    Все котировки, запрошенные в одном блоке, собираются в один вызов Multicall3. Результат
+    считается пригодным max_age_blocks блоков; это и есть граница устаревания для min_amount_out.
+    Котировку ждут не дольше timeout секунд.
+
+    Если use_reserves включён, get_amount_out сначала считает выход локально по резервам пар
+    текущего блока (PairReserves), а к роутеру обращается, только когда пары нет или чтение не удалось.
+    """
+
+    def __init__(
+        self,
+        network: Network,
+        router_address: str,
+        bucket_step: float = 0.01,
+        max_age_blocks: int = 2,
+        max_entries: int = 10000,
+        use_reserves: bool = True,
+        timeout: float = 30
+    ):
+        self.network = network
+        self.router_address = Web3.to_checksum_address(router_address)
+        self.bucket_step = bucket_step
+        self.max_age_blocks = max_age_blocks
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.reserves = PairReserves(network, router_address) if use_reserves else None
+
+        self._log_step = math.log1p(bucket_step)
+        self._templates: Dict[Path, CalldataTemplate] = {}
+        self._cache: Dict[Tuple[Path, int], Quote] = {}
+        self._pending: Dict[Tuple[Path, int], asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def bucket_edge(self, amount_in: int) -> int:
+        if amount_in <= 1:
+            return 1
+        return math.ceil((1 + self.bucket_step) ** math.ceil(math.log(amount_in) / self._log_step))
+
+    async def get_amount_out(
+        self,
+        web3: AsyncWeb3,
+        path: Sequence[str],
+        amount_in: int,
+        max_age_blocks: Optional[int] = None
+    ) -> int:
+        if self.reserves is not None:
+            try:
+                amount_out = await self.reserves.get_amount_out(web3, path, amount_in)
+                if amount_out is not None:
+                    return amount_out
+            except Exception as e:
+                logger.warning(f'Не удалось посчитать котировку по резервам, запрашиваем роутер: {e}')
+
+        quote = await self.quote(web3, path, amount_in, max_age_blocks)
+        return quote.amount_out * amount_in // quote.amount_in
+
+    async def min_amount_out(
+        self,
+        web3: AsyncWeb3,
+        path: Sequence[str],
+        amount_in: int,
+        slippage: float,
+        max_age_blocks: Optional[int] = None
+    ) -> int:
+        """Минимальный выход для свапа по котировке не старше max_age_blocks блоков от текущей головы."""
+        expected_out = await self.get_amount_out(web3, path, amount_in, max_age_blocks)
+        return int(expected_out * (1 - slippage))
+
+    async def quote(
+        self,
+        web3: AsyncWeb3,
+        path: Sequence[str],
+        amount_in: int,
+        max_age_blocks: Optional[int] = None
+    ) -> Quote:
+        if max_age_blocks is None:
+            max_age_blocks = self.max_age_blocks
+        path = tuple(Web3.to_checksum_address(address) for address in path)
+        key = (path, self.bucket_edge(amount_in))
+
+        head = await head_cache.get(web3, self.network)
+        cached = self._cache.get(key)
+        if cached and head.number - cached.block_number <= max_age_blocks:
+            return cached
+
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush(web3))
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            raise TimeoutError(f'Котировка для пути {path} не получена за {self.timeout} с')
+
+    async def _flush(self, web3: AsyncWeb3) -> None:
+        # Котировки, запрошенные во время вызова, уходят следующим вызовом этой же задачи
+        while self._pending:
+            # Даём остальным корутинам этого шага цикла добавить свои котировки в тот же вызов
+            await asyncio.sleep(0)
+            pending, self._pending = self._pending, {}
+            keys = list(pending)
+
+            try:
+                block_number = (await head_cache.get(web3, self.network)).number
+                amounts_out = await self._fetch(web3, keys, block_number)
+            except Exception as e:
+                for future in pending.values():
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            if len(self._cache) + len(keys) > self.max_entries:
+                self._cache.clear()
+
+            for key, amount_out in zip(keys, amounts_out):
+                future = pending[key]
+                if amount_out is None:
+                    if not future.done():
+                        future.set_exception(ValueError(f'getAmountsOut не вернул котировку для пути {key[0]}'))
+                    continue
+
+                quote = Quote(amount_in=key[1], amount_out=amount_out, block_number=block_number)
+                self._cache[key] = quote
+                if not future.done():
+                    future.set_result(quote)
+
+    async def _fetch(self, web3: AsyncWeb3, keys: List[Tuple[Path, int]], block_number: int) -> List[Optional[int]]:
+        calls = [
+            Call(target=self.router_address, data=self._template(path).encode(amount_in=amount_in))
+            for path, amount_in in keys
+        ]
+
+        if self.network.multicall_address:
+            try:
+                results = await aggregate3(web3, self.network.multicall_address, calls, block_number)
+                return [self._decode(data) if success else None for success, data in results]
+            except Exception as e:
+                logger.warning(f'Multicall недоступен в сети {self.network.name}, котируем по одной: {e}')
+
+        results = await asyncio.gather(*[
+            web3.eth.call({'to': call.target, 'data': call.data}, block_number) for call in calls
+        ], return_exceptions=True)
+        return [None if isinstance(result, Exception) else self._decode(result) for result in results]
+
+    def _template(self, path: Path) -> CalldataTemplate:
+        if path not in self._templates:
+            self._templates[path] = CalldataTemplate.from_abi(
+                'getAmountsOut(uint256,address[])', [Slot('amount_in'), list(path)]
+            )
+        return self._templates[path]
+
+    @staticmethod
+    def _decode(data: bytes) -> Optional[int]:
+        try:
+            return decode(['uint256[]'], bytes(data))[0][-1]
+        except Exception:
+            return None
+
+
+_services: Dict[Tuple[int, str], QuoteService] = {}
+
+
+def get_quote_service(network: Network, router_address: str) -> QuoteService:
+    key = (network.chain_id, router_address.lower())
+    if key not in _services:
+        _services[key] = QuoteService(network, router_address)
+    return _services[key]
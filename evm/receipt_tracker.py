@@ -0,0 +1,149 @@
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from loguru import logger
+from web3 import AsyncWeb3
+from web3.exceptions import TransactionNotFound
+
+from .networks import Network
+from .transport import BatchNotSupported
+
+
+TX_HASH_RE = re.compile(r'^0x[0-9a-fA-F]{64}$')
+
+
+def is_tx_hash(value) -> bool:
+    return isinstance(value, str) and bool(TX_HASH_RE.match(value))
+
+
+@dataclass
+class TxReceipt:
+    tx_hash: str
+    status: int
+    gas_used: int
+    block_number: int
+
+    @property
+    def success(self) -> bool:
+        return self.status == 1
+
+
+@dataclass
+class _Pending:
+    future: asyncio.Future
+    web3: AsyncWeb3
+    deadline: float
+
+
+class ReceiptTracker:
+    """
+    Ожидание receipt'ов для многих транзакций одной сети.
+
+    Все отслеживаемые хеши опрашиваются одним циклом: eth_getTransactionReceipt уходит batch
+    запросами, интервал опроса начинается с времени блока и растёт, пока ничего не подтверждается.
+    Каждому хешу соответствует future, который получает TxReceipt или None по таймауту.
+    """
+
+    def __init__(self, network: Network, max_interval: float = 5.0, timeout: float = 180, batch_size: int = 100):
+        self.network = network
+        self.min_interval = network.block_time
+        self.max_interval = max_interval
+        self.timeout = timeout
+        self.batch_size = batch_size
+
+        self._pending: Dict[str, _Pending] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def track(self, web3: AsyncWeb3, tx_hash: str, timeout: float = None) -> asyncio.Future:
+        tx_hash = tx_hash.lower()
+        if tx_hash not in self._pending:
+            self._pending[tx_hash] = _Pending(
+                future=asyncio.get_running_loop().create_future(),
+                web3=web3,
+                deadline=time.monotonic() + (timeout or self.timeout)
+            )
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll_loop())
+
+        return self._pending[tx_hash].future
+
+    async def wait(self, web3: AsyncWeb3, tx_hash: str, timeout: float = None) -> Optional[TxReceipt]:
+        return await asyncio.shield(self.track(web3, tx_hash, timeout))
+
+    async def _poll_loop(self) -> None:
+        interval = self.min_interval
+        while self._pending:
+            await asyncio.sleep(interval)
+
+            groups: Dict[int, List[str]] = {}
+            for tx_hash, pending in self._pending.items():
+                groups.setdefault(id(pending.web3), []).append(tx_hash)
+
+            resolved = 0
+            for hashes in groups.values():
+                web3 = self._pending[hashes[0]].web3
+                for i in range(0, len(hashes), self.batch_size):
+                    try:
+                        resolved += await self._poll(web3, hashes[i:i + self.batch_size])
+                    except Exception as e:
+                        logger.warning(f"{self.network.name}: ошибка при опросе receipt'ов: {e}")
+
+            now = time.monotonic()
+            for tx_hash, pending in list(self._pending.items()):
+                if pending.deadline <= now:
+                    del self._pending[tx_hash]
+                    if not pending.future.done():
+                        pending.future.set_result(None)
+
+            interval = self.min_interval if resolved else min(interval * 1.5, self.max_interval)
+
+    async def _poll(self, web3: AsyncWeb3, hashes: List[str]) -> int:
+        provider = web3.provider
+        try:
+            if not hasattr(provider, 'make_batch_request'):
+                raise BatchNotSupported(getattr(provider, 'endpoint_uri', None))
+            responses = await provider.make_batch_request(
+                [('eth_getTransactionReceipt', [tx_hash]) for tx_hash in hashes]
+            )
+            receipts = [response.get('result') if 'error' not in response else None for response in responses]
+        except BatchNotSupported:
+            receipts = []
+            for tx_hash in hashes:
+                try:
+                    receipts.append(await web3.eth.get_transaction_receipt(tx_hash))
+                except TransactionNotFound:
+                    receipts.append(None)
+
+        resolved = 0
+        for tx_hash, receipt in zip(hashes, receipts):
+            if not receipt:
+                continue
+
+            pending = self._pending.pop(tx_hash, None)
+            if pending and not pending.future.done():
+                pending.future.set_result(TxReceipt(
+                    tx_hash=tx_hash,
+                    status=self._to_int(receipt['status']),
+                    gas_used=self._to_int(receipt['gasUsed']),
+                    block_number=self._to_int(receipt['blockNumber'])
+                ))
+                resolved += 1
+
+        return resolved
+
+    @staticmethod
+    def _to_int(value) -> int:
+        return int(value, 16) if isinstance(value, str) else int(value)
+
+
+_trackers: Dict[int, ReceiptTracker] = {}
+
+
+def get_receipt_tracker(network: Network) -> ReceiptTracker:
+    if network.chain_id not in _trackers:
+        _trackers[network.chain_id] = ReceiptTracker(network)
+    return _trackers[network.chain_id]
@@ -0,0 +1,304 @@
+import asyncio
+import itertools
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from aiohttp import ClientError, ClientResponseError, ClientSession, ClientTimeout, TCPConnector
+from web3 import AsyncHTTPProvider, AsyncWeb3
+from web3.types import RPCEndpoint, RPCResponse
+from loguru import logger
+
+from .endpoints import Endpoint, EndpointPool, get_endpoint_pool, send_pin_key
+from .networks import Network
+from utils.rate_limiter import rate_limiter
+
+
+def normalize_proxy(proxy: Optional[str]) -> Optional[str]:
+    if not proxy:
+        return None
+    if 'http' not in proxy:
+        proxy = f'http://{proxy}'
+    return proxy
+
+
+class BatchNotSupported(Exception):
+    """RPC-эндпоинт не принимает JSON-RPC batch запросы."""
+
+
+RATE_LIMIT_CODES = (429, -32005, -32029)
+RATE_LIMIT_MARKERS = ('rate limit', 'too many requests', 'limit exceeded', 'exceeded', 'throttl')
+
+
+def is_rate_limited(error: dict) -> bool:
+    message = str(error.get('message', '')).lower()
+    return error.get('code') in RATE_LIMIT_CODES or any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+def is_batch_unsupported(error: dict) -> bool:
+    """Ответ на batch, означающий, что эндпоинт batch не принимает вообще (а не временную ошибку)."""
+    message = str(error.get('message', '')).lower()
+    return not is_rate_limited(error) and (error.get('code') == -32600 or 'batch' in message)
+
+
+# Методы только на чтение: их можно повторять на другом эндпоинте и дублировать (hedging).
+READ_METHODS = {
+    'eth_blockNumber',
+    'eth_call',
+    'eth_chainId',
+    'eth_estimateGas',
+    'eth_feeHistory',
+    'eth_gasPrice',
+    'eth_getBalance',
+    'eth_getBlockByNumber',
+    'eth_getCode',
+    'eth_getTransactionReceipt',
+    'eth_maxPriorityFeePerGas',
+}
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider, который отправляет запросы через общую keep-alive сессию пула,
+    а не через кеш сессий web3 (он различает сессии только по endpoint_uri и игнорирует прокси).
+
+    Каждый запрос уходит на самый здоровый эндпоинт сети. Чтения при ошибке повторяются на
+    следующем, а медленные чтения дублируются на второй эндпоинт (hedging). Отправка транзакций
+    и pending nonce одного адреса всегда идут на один и тот же эндпоинт.
+    """
+
+    def __init__(
+        self,
+        pool: 'ProviderPool',
+        endpoints: EndpointPool,
+        request_kwargs: Dict[str, Any],
+        hedge: bool = True
+    ):
+        super().__init__(endpoint_uri=endpoints.endpoints[0].url, request_kwargs=request_kwargs)
+        self.pool = pool
+        self.endpoints = endpoints
+        self.hedge = hedge
+        self.last_used = time.monotonic()
+        self._batch_ids = itertools.count()
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        self.last_used = time.monotonic()
+        request_data = self.encode_rpc_request(method, params)
+
+        if method == 'eth_sendRawTransaction':
+            endpoint = self.endpoints.pinned(send_pin_key.get())
+            raw_response = await self._post(endpoint, request_data)
+        elif method == 'eth_getTransactionCount':
+            endpoint = self.endpoints.pinned(params[0])
+            raw_response = await self._post(endpoint, request_data)
+        else:
+            raw_response = await self._read(request_data, hedge=method in READ_METHODS)
+
+        return self.decode_rpc_response(raw_response)
+
+    async def make_batch_request(self, calls: Sequence[Tuple[str, List[Any]]]) -> List[RPCResponse]:
+        """
+        Отправляет несколько вызовов одним JSON-RPC batch запросом.
+
+        Возвращает сырые ответы ({'result': ...} или {'error': ...}) в порядке calls.
+        Если эндпоинт не поддерживает batch, поднимает BatchNotSupported и больше batch туда не шлёт.
+        """
+        self.last_used = time.monotonic()
+        ids = [next(self._batch_ids) for _ in calls]
+        request_data = json.dumps([
+            {'jsonrpc': '2.0', 'method': method, 'params': params, 'id': request_id}
+            for request_id, (method, params) in zip(ids, calls)
+        ]).encode()
+
+        nonce_owner = next((params[0] for method, params in calls if method == 'eth_getTransactionCount'), None)
+        if nonce_owner is not None:
+            endpoint = self.endpoints.pinned(nonce_owner)
+            if not endpoint.supports_batch:
+                raise BatchNotSupported(endpoint.url)
+            candidates = [endpoint]
+        else:
+            candidates = [endpoint for endpoint in self.endpoints.ranked() if endpoint.supports_batch]
+            if not candidates:
+                raise BatchNotSupported(self.endpoint_uri)
+
+        endpoint = candidates[0]
+        try:
+            if nonce_owner is None and all(method in READ_METHODS for method, _ in calls):
+                raw_response = await self._read(request_data, hedge=True, candidates=candidates)
+            else:
+                raw_response = await self._post(endpoint, request_data)
+        except ClientResponseError as e:
+            if 400 <= e.status < 500 and e.status != 429:
+                endpoint.supports_batch = False
+                raise BatchNotSupported(endpoint.url) from e
+            raise
+        except (ClientError, asyncio.TimeoutError) as e:
+            # Эндпоинты с batch недоступны, но остальные могут ответить на одиночные запросы
+            if any(not other.supports_batch for other in self.endpoints.ranked()):
+                raise BatchNotSupported(endpoint.url) from e
+            raise
+
+        responses = json.loads(raw_response)
+        if not isinstance(responses, list):
+            error = responses.get('error') if isinstance(responses, dict) else None
+            if not isinstance(error, dict):
+                error = {'message': str(responses)}
+
+            if is_rate_limited(error):
+                # Публичные RPC отвечают так на batch при превышении лимита: batch остаётся включён
+                self.endpoints.record_failure(endpoint)
+                raise ValueError(error)
+            if is_batch_unsupported(error):
+                endpoint.supports_batch = False
+            # Прочие ошибки: этот запрос выполняется одиночными вызовами, batch не отключается
+            raise BatchNotSupported(endpoint.url)
+
+        by_id = {item.get('id'): item for item in responses}
+        missing = {'error': {'code': -32603, 'message': 'missing response in batch'}}
+        return [by_id.get(request_id, missing) for request_id in ids]
+
+    async def _post(self, endpoint: Endpoint, request_data: bytes) -> bytes:
+        session = await self.pool.get_session()
+        request_kwargs = self.get_request_kwargs()
+        async with rate_limiter.limit(endpoint.url, proxy=request_kwargs.get('proxy')):
+            started = time.monotonic()
+            try:
+                async with session.post(endpoint.url, data=request_data, **request_kwargs) as response:
+                    response.raise_for_status()
+                    raw_response = await response.read()
+            except ClientResponseError as e:
+                if e.status >= 500 or e.status == 429:
+                    self.endpoints.record_failure(endpoint)
+                raise
+            except (ClientError, asyncio.TimeoutError):
+                self.endpoints.record_failure(endpoint)
+                raise
+
+            self.endpoints.record_success(endpoint, time.monotonic() - started)
+        return raw_response
+
+    async def _read(self, request_data: bytes, hedge: bool, candidates: List[Endpoint] = None) -> bytes:
+        candidates = candidates or self.endpoints.ranked()
+        if hedge and self.hedge and len(candidates) > 1:
+            return await self._hedged_read(request_data, candidates[0], candidates[1])
+
+        last_error = None
+        for endpoint in candidates:
+            try:
+                return await self._post(endpoint, request_data)
+            except (ClientError, asyncio.TimeoutError) as e:
+                last_error = e
+        raise last_error
+
+    async def _hedged_read(self, request_data: bytes, primary: Endpoint, secondary: Endpoint) -> bytes:
+        first = asyncio.ensure_future(self._post(primary, request_data))
+        done, _ = await asyncio.wait({first}, timeout=self.endpoints.hedge_delay(primary))
+        if first in done and first.exception() is None:
+            return first.result()
+
+        tasks = {first, asyncio.ensure_future(self._post(secondary, request_data))}
+        last_error = None
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+class ProviderPool:
+    """
+    Процессный пул RPC-подключений.
+
+    На каждую пару (сеть, proxy) выдаётся один и тот же AsyncWeb3, а все они ходят через
+    одну aiohttp-сессию с общим ограничением на число сокетов. Соединения, которые долго не
+    использовались, закрываются коннектором по keepalive_timeout, а сами записи пула
+    вычищаются по idle_timeout.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_connections_per_host: int = 0,
+        keepalive_timeout: float = 30,
+        idle_timeout: float = 300,
+        max_entries: int = 5000,
+        request_timeout: float = 30
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.idle_timeout = idle_timeout
+        self.max_entries = max_entries
+        self.request_timeout = request_timeout
+
+        self._entries: 'OrderedDict[Tuple[str, Optional[str]], AsyncWeb3]' = OrderedDict()
+        self._session: Optional[ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get_session(self) -> ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = ClientSession(
+                connector=TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections_per_host,
+                    keepalive_timeout=self.keepalive_timeout
+                ),
+                timeout=ClientTimeout(total=self.request_timeout)
+            )
+            self._session_loop = loop
+        return self._session
+
+    def get_web3(self, network: Network, proxy: Optional[str] = None, headers: Optional[dict] = None) -> AsyncWeb3:
+        key = (tuple(network.rpc_urls), proxy)
+        self._evict_idle()
+
+        web3 = self._entries.get(key)
+        if web3 is None:
+            request_kwargs = {'proxy': proxy}
+            if headers:
+                request_kwargs['headers'] = headers
+
+            provider = PooledHTTPProvider(
+                pool=self,
+                endpoints=get_endpoint_pool(network),
+                request_kwargs=request_kwargs
+            )
+            web3 = AsyncWeb3(provider)
+            self._entries[key] = web3
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+            web3.provider.last_used = time.monotonic()
+
+        return web3
+
+    def _evict_idle(self) -> None:
+        deadline = time.monotonic() - self.idle_timeout
+        while self._entries:
+            key, web3 = next(iter(self._entries.items()))
+            if web3.provider.last_used > deadline:
+                break
+            del self._entries[key]
+
+    async def close(self) -> None:
+        self._entries.clear()
+        if self._session is not None and not self._session.closed:
+            try:
+                await self._session.close()
+            except Exception as e:
+                logger.error(f"Ошибка при закрытии RPC-сессии: {e}")
+        self._session = None
+        self._session_loop = None
+
+
+provider_pool = ProviderPool()
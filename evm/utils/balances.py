@@ -0,0 +1,72 @@
+from typing import List, Optional, Sequence, Tuple
+
+from loguru import logger
+from web3 import AsyncWeb3
+
+from ..models.token import Token
+from ..multicall import aggregate3, balance_of_call, decode_uint, eth_balance_call
+from ..networks import Network
+from ..transport import BatchNotSupported
+
+
+async def fetch_balances(
+    web3: AsyncWeb3,
+    network: Network,
+    pairs: Sequence[Tuple[str, Token]]
+) -> List[Optional[int]]:
+    """
+    Возвращает балансы в wei для пар (адрес, токен) в том же порядке.
+
+    Сначала одним eth_call через Multicall3 сети, затем одним JSON-RPC batch запросом,
+    и только если эндпоинт не принимает batch — по одному запросу на пару.
+    Если баланс получить не удалось, на его месте будет None.
+    """
+    if network.multicall_address:
+        try:
+            return await _fetch_multicall(web3, network.multicall_address, pairs)
+        except Exception as e:
+            logger.warning(f"Multicall недоступен в сети {network.name}, запрашиваем балансы batch-запросом: {e}")
+
+    return await _fetch_batched(web3, pairs)
+
+
+async def _fetch_multicall(web3: AsyncWeb3, multicall_address: str, pairs: Sequence[Tuple[str, Token]]) -> List[Optional[int]]:
+    calls = [
+        eth_balance_call(multicall_address, address) if token.is_native else balance_of_call(token.address, address)
+        for address, token in pairs
+    ]
+    results = await aggregate3(web3, multicall_address, calls)
+    return [decode_uint(data) if success and len(data) >= 32 else None for success, data in results]
+
+
+async def _fetch_batched(web3: AsyncWeb3, pairs: Sequence[Tuple[str, Token]]) -> List[Optional[int]]:
+    provider = web3.provider
+    calls = [
+        ('eth_getBalance', [address, 'latest']) if token.is_native else
+        ('eth_call', [{'to': token.address, 'data': '0x' + balance_of_call(token.address, address).data.hex()}, 'latest'])
+        for address, token in pairs
+    ]
+
+    try:
+        if not hasattr(provider, 'make_batch_request'):
+            raise BatchNotSupported(getattr(provider, 'endpoint_uri', None))
+        responses = await provider.make_batch_request(calls)
+    except BatchNotSupported:
+        return [await _fetch_single(web3, address, token) for address, token in pairs]
+
+    return [
+        int(response['result'], 16) if 'error' not in response and response.get('result') not in (None, '0x') else None
+        for response in responses
+    ]
+
+
+async def _fetch_single(web3: AsyncWeb3, address: str, token: Token) -> Optional[int]:
+    try:
+        if token.is_native:
+            return await web3.eth.get_balance(address)
+
+        call = balance_of_call(token.address, address)
+        return decode_uint(await web3.eth.call({'to': call.target, 'data': call.data}))
+    except Exception as e:
+        logger.error(f"Ошибка при получении баланса {token.symbol} для {address}: {e}")
+        return None
@@ -0,0 +1,110 @@
+from typing import Dict, List, Sequence, Union
+
+from eth_abi import encode
+from eth_utils import keccak
+
+
+Word = Union[int, str, bytes, 'Slot']
+
+
+class Slot:
+    """Изменяемое слово шаблона, заполняется по имени при каждом encode."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f'Slot({self.name})'
+
+
+def to_word(value: Union[int, str, bytes]) -> bytes:
+    """int -> uint256, адрес '0x...' -> выровненный вправо адрес, 64 hex-символа и bytes -> как есть."""
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return value.to_bytes(32, 'big')
+    if isinstance(value, str):
+        value = value[2:] if value.startswith('0x') else value
+        if len(value) == 64:
+            return bytes.fromhex(value)
+        return bytes.fromhex(value).rjust(32, b'\x00')
+    if len(value) > 32:
+        raise ValueError(f'Слово длиннее 32 байт: {value.hex()}')
+    return bytes(value).rjust(32, b'\x00')
+
+
+def selector_of(signature: str) -> bytes:
+    return keccak(text=signature)[:4]
+
+
+class CalldataTemplate:
+    """
+    Заранее собранная calldata: селектор и все постоянные слова кодируются один раз, при encode
+    копируется готовый bytearray и переписываются только слова слотов.
+
+    Шаблон задаётся либо списком слов (для нестандартных раскладок вроде Universal Router),
+    либо сигнатурой функции и аргументами через from_abi.
+    """
+
+    def __init__(self, selector: Union[str, bytes], words: Sequence[Word], suffix: bytes = b''):
+        if isinstance(selector, str):
+            selector = bytes.fromhex(selector[2:] if selector.startswith('0x') else selector)
+
+        self._template = bytearray(selector)
+        self._slots: Dict[str, List[int]] = {}
+        for word in words:
+            if isinstance(word, Slot):
+                self._slots.setdefault(word.name, []).append(len(self._template))
+                word = 0
+            self._template += to_word(word)
+        self._template += suffix
+
+    @classmethod
+    def from_abi(cls, signature: str, args: Sequence) -> 'CalldataTemplate':
+        """
+        Компилирует шаблон через eth_abi: слоты подменяются уникальными метками, а затем
+        находятся в закодированных данных. Слот может стоять на месте uint/int/address/bytes32,
+        в том числе внутри массива; аргумент типа bytes можно передать списком слов. Кортежи не поддерживаются.
+        """
+        types = signature[signature.index('(') + 1:-1].split(',') if not signature.endswith('()') else []
+        markers: Dict[bytes, str] = {}
+
+        def substitute(abi_type: str, value):
+            if isinstance(value, Slot):
+                index = len(markers) + 1
+                if abi_type.startswith('address'):
+                    marker_value = '0x' + f'ca11da7a{index:08x}'.rjust(40, 'f')
+                else:
+                    marker_value = (0xca11da7a << 192) + index
+                markers[to_word(marker_value)] = value.name
+                return marker_value
+            if abi_type == 'bytes' and isinstance(value, (list, tuple)):
+                return b''.join(to_word(substitute('uint256', word)) for word in value)
+            if isinstance(value, (list, tuple)):
+                return [substitute(abi_type[:abi_type.rindex('[')], item) for item in value]
+            return value
+
+        encoded = encode(types, [substitute(abi_type, arg) for abi_type, arg in zip(types, args)])
+
+        template = cls(selector_of(signature), [])
+        template._template += encoded
+        for marker, name in markers.items():
+            offsets = [4 + i for i in range(0, len(encoded), 32) if encoded[i:i + 32] == marker]
+            if not offsets:
+                raise ValueError(f'Слот {name} не найден в закодированных данных {signature}')
+            template._slots.setdefault(name, []).extend(offsets)
+            for offset in offsets:
+                template._template[offset:offset + 32] = bytes(32)
+        return template
+
+    @property
+    def slots(self) -> List[str]:
+        return list(self._slots)
+
+    def encode(self, **values) -> bytes:
+        data = self._template[:]
+        for name, offsets in self._slots.items():
+            word = to_word(values[name])
+            for offset in offsets:
+                data[offset:offset + 32] = word
+        return bytes(data)
@@ -1,8 +1,7 @@
-import json
-from pathlib import Path
 from typing import Optional
 from web3 import Web3
-from web3.contract import Contract
+
+from ..abi_registry import ERC20_ABI, abi_registry
 
 class Token:
     def __init__(
@@ -20,26 +19,13 @@ class Token:
         self.decimals = decimals
         self.is_native = is_native
         self.abi_filename = abi_filename
-        self._abi = None
-        self._contract: Optional[Contract] = None
 
 
     @property
     def abi(self):
-        if self._abi is None and self.abi_filename:
-            path = Path("evm/abis") / self.abi_filename
-            try:
-                with path.open("r", encoding="utf-8") as file:
-                    self._abi = json.load(file)
-                    
-                for item in self._abi:
-                    if item.get("inputs") is None:
-                        item["inputs"] = []
-            except FileNotFoundError:
-                raise FileNotFoundError(f"ABI файл не найден: {path}")
-            except json.JSONDecodeError:
-                raise ValueError(f"Ошибка парсинга ABI файла: {path}")
-        return self._abi
+        if self.is_native:
+            return None
+        return abi_registry.get_abi(self.abi_filename or ERC20_ABI)
 
 
     @property
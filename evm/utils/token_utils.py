@@ -1,5 +1,11 @@
-from typing import Optional
+from typing import NamedTuple, Optional, Tuple
+from ..abi_registry import ERC20_ABI, abi_registry
 from ..client import EVMClient
+from data.models import Settings
+from utils.db_api.allowance_api import forget_allowance, get_allowance, save_allowance
+
+
+MAX_UINT256 = 2 ** 256 - 1
 
 
 async def get_token_balance(
@@ -8,69 +14,88 @@ async def get_token_balance(
     wallet_address: Optional[str] = None
 ) -> int:
     wallet_address = wallet_address or client.account.address
-    token_address = client.web3.to_checksum_address(token_address)
-
-    contract = client.web3.eth.contract(
-        address=token_address,
-        abi=[{
-            "constant": True,
-            "inputs": [{"name": "_owner", "type": "address"}],
-            "name": "balanceOf",
-            "outputs": [{"name": "balance", "type": "uint256"}],
-            "type": "function"
-        }]
-    )
-    return await contract.functions.balanceOf(wallet_address).call()
+    contract = abi_registry.get_contract(ERC20_ABI, token_address)
+    return await client.call(contract.functions.balanceOf(wallet_address))
+
+
+class AllowanceDebit(NamedTuple):
+    key: Tuple[int, str, str, str]
+    amount_wei: int
+    # Разрешение до свапа, прочитанное on-chain или выданное approve; None - остаток берётся из журнала
+    allowance: Optional[int] = None
+    verified: bool = False
 
 
 async def approve_token_if_needed(
     client: EVMClient,
     token_address: str,
     spender: str,
-    amount_wei: int
+    amount_wei: int,
+    max_approval: Optional[bool] = None
 ) -> Optional[str]:
-    erc20_abi = [
-        {
-            "constant": True,
-            "inputs": [
-                {"name": "_owner", "type": "address"},
-                {"name": "_spender", "type": "address"}
-            ],
-            "name": "allowance",
-            "outputs": [{"name": "remaining", "type": "uint256"}],
-            "type": "function"
-        },
-        {
-            "constant": False,
-            "inputs": [
-                {"name": "_spender", "type": "address"},
-                {"name": "_value", "type": "uint256"}
-            ],
-            "name": "approve",
-            "outputs": [{"name": "success", "type": "bool"}],
-            "type": "function"
-        }
-    ]
-
-    token_contract = client.web3.eth.contract(
-        address=token_address,
-        abi=erc20_abi
-    )
-    
-    allowance = await token_contract.functions.allowance(
-        client.account.address,
-        spender
-    ).call()
-
-    if allowance < amount_wei:
-        approve_amount = amount_wei * 10
-        tx = await client.build_transaction(
-            to=token_address,
-            data=token_contract.encodeABI(
-                fn_name="approve",
-                args=[spender, approve_amount]
-            )
+    """
+    Проверяет allowance по локальному журналу и делает approve только при нехватке.
+
+    Журнал в БД хранит остаток разрешения; on-chain allowance читается, только когда остатка
+    по журналу может не хватить. Списание amount_wei не пишется сразу, а откладывается в
+    client.allowance_debits и применяется settle_allowances после подтверждения свапа.
+    Receipt approve не ожидается: свап с следующим nonce отправляется сразу за ним.
+    """
+    owner = client.account.address
+    key = (client.chain_id, token_address, owner, spender)
+    # Свапы этого действия, ещё не подтверждённые, уже расходуют остаток
+    reserved = sum(debit.amount_wei for debit in client.allowance_debits if debit.key == key)
+
+    ledger = await get_allowance(*key)
+    if ledger is not None and int(ledger.amount) - reserved >= amount_wei:
+        client.allowance_debits.append(AllowanceDebit(key, amount_wei))
+        return None
+
+    token_contract = abi_registry.get_contract(ERC20_ABI, token_address)
+    allowance = await client.call(token_contract.functions.allowance(owner, spender))
+
+    if allowance - reserved >= amount_wei:
+        client.allowance_debits.append(AllowanceDebit(key, amount_wei, allowance - reserved, verified=True))
+        return None
+
+    if max_approval is None:
+        max_approval = Settings().max_approval
+    approve_amount = MAX_UINT256 if max_approval else amount_wei * 10
+
+    tx = await client.build_transaction(
+        to=token_contract.address,
+        data=token_contract.encodeABI(
+            fn_name="approve",
+            args=[spender, approve_amount]
         )
-        return await client.send_transaction(tx)
+    )
+    tx_hash = await client.send_transaction(tx)
+
+    # approve заменяет разрешение целиком, поэтому прошлые списания этого ключа к нему не относятся
+    client.allowance_debits[:] = [debit for debit in client.allowance_debits if debit.key != key]
+    client.allowance_debits.append(AllowanceDebit(key, amount_wei, approve_amount, verified=True))
+    return tx_hash
+
 
-    return None
+async def settle_allowances(client: EVMClient, success: bool, block_number: Optional[int] = None) -> None:
+    """
+    Переносит отложенные списания в журнал: после успешного свапа остаток уменьшается,
+    после отката, ошибки или неподтверждённой транзакции запись забывается и при следующем
+    свапе allowance читается on-chain.
+    """
+    debits, client.allowance_debits = client.allowance_debits, []
+    for debit in debits:
+        if not success:
+            await forget_allowance(*debit.key)
+            continue
+
+        if debit.allowance is None:
+            ledger = await get_allowance(*debit.key)
+            if ledger is not None:
+                await save_allowance(*debit.key, amount=int(ledger.amount) - debit.amount_wei)
+        else:
+            await save_allowance(
+                *debit.key,
+                amount=debit.allowance - debit.amount_wei,
+                verified_block=block_number if debit.verified else None
+            )
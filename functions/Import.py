@@ -1,14 +1,12 @@
 import csv
-import random
 
 from loguru import logger
 
-from evm import EVMClient, Networks
+from evm.accounts import get_account
 
 from data import config
 from data.models import WalletCSV, Settings
-from utils.db_api.wallet_api import get_wallet, db
-from utils.db_api.models import Wallet
+from utils.db_api.async_db import async_db
 
 
 
@@ -35,34 +33,13 @@ class Import:
         settings = Settings()
         wallets = Import.get_wallets_from_csv(csv_path=config.IMPORT_FILE)
 
-        imported = []
-        edited = []
         total = len(wallets)
 
-        for wallet in wallets:
-            wallet_instance = get_wallet(private_key=wallet.private_key)
-            if wallet_instance and (
-                    wallet_instance.proxy != wallet.proxy or
-                    wallet_instance.name != wallet.name
-            ):
-                wallet_instance.proxy = wallet.proxy
-                wallet_instance.name = wallet.name
-                db.commit()
-                edited.append(wallet_instance)
-
-            if not wallet_instance:
-                client = EVMClient(private_key=wallet.private_key, network=Networks.MONAD)
-                wallet_instance = Wallet(
-                    private_key=wallet.private_key,
-                    address=client.account.address,
-                    proxy=wallet.proxy,
-                    name=wallet.name,
-                    number_of_swaps=random.randint(
-                        settings.number_of_swaps.from_, settings.number_of_swaps.to_),
-                )
-                
-                db.insert(wallet_instance)
-                imported.append(wallet_instance)
+        imported, edited = await async_db.import_wallets(
+            wallets,
+            number_of_swaps=(settings.number_of_swaps.from_, settings.number_of_swaps.to_),
+            address_of=lambda private_key: get_account(private_key).address
+        )
 
         logger.success(f'Done! imported wallets: {len(imported)}/{total}; '
                        f'edited wallets: {len(edited)}/{total}; total: {total}')
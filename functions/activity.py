@@ -5,12 +5,15 @@ from datetime import datetime, timedelta
 from loguru import logger
 
 from evm import EVMClient, Networks
+from evm.endpoints import get_endpoint_pool
 
 
 from data.models import Settings
-from utils.db_api.wallet_api import db
-from utils.db_api.models import Wallet
+from utils.db_api.async_db import async_db
+from utils.db_api.schedule_api import schedule_status
 from utils.tasks.controller import Controller
+from utils.worker_pool import worker_pool
+from utils.scheduler import activity_queue
 from functions.select_random_action import select_random_action
 from utils.update_expired import update_expired
 
@@ -19,60 +22,76 @@ async def activity():
     settings = Settings()
     delay = 10
 
-    update_expired(initial=False)
+    await update_expired(initial=False)
+    for wallet_id, next_time in await async_db.get_scheduled(initial=False):
+        activity_queue.push(wallet_id, next_time)
     await asyncio.sleep(5)
 
     while True:
-        try:
-            now = datetime.now()
+        wallet_ids = await activity_queue.wait_due()
+        logger.debug(f'activity: запущено {len(wallet_ids)}, расписание: {activity_queue.status()}, пул: {worker_pool.stats()}')
+        for wallet_id in wallet_ids:
+            try:
+                wallet = await async_db.get_wallet(wallet_id)
+                if not wallet:
+                    continue
+
+                worker_pool.submit(
+                    wallet.id,
+                    lambda wallet_id=wallet.id: activity_action(wallet_id=wallet_id, settings=settings, delay=delay),
+                    proxy=wallet.proxy,
+                    # Отправки кошелька идут на закреплённый за его адресом эндпоинт
+                    endpoint=get_endpoint_pool(Networks.MONAD).pinned(wallet.address).url,
+                    due=wallet.next_activity_action_time
+                )
 
-            wallet: Wallet = db.one(
-                Wallet, Wallet.initial_completed.is_(True) & (Wallet.next_activity_action_time <= now)
-            )
+            except Exception as e:
+                # Кошелёк уже снят с очереди: без возврата в неё его действия прекратятся
+                logger.exception(f'activity: не удалось запустить действие кошелька {wallet_id}: {e}')
+                activity_queue.push(wallet_id, datetime.now() + timedelta(seconds=delay))
 
-            if not wallet:
-                await asyncio.sleep(delay)
-                continue
 
-            client = EVMClient(private_key=wallet.private_key, network=Networks.MONAD, proxy=wallet.proxy)
-            controller = Controller(client=client)
+async def activity_action(wallet_id: int, settings: Settings, delay: int):
+    try:
+        wallet = await async_db.get_wallet(wallet_id)
+        if not wallet or not wallet.initial_completed:
+            return
 
-            now = datetime.now()
-            action = await select_random_action(controller=controller, wallet=wallet, initial=False)
+        client = EVMClient(private_key=wallet.private_key, network=Networks.MONAD, proxy=wallet.proxy)
+        controller = Controller(client=client)
 
-            if not action:
-                logger.warning(f'{wallet.address} | select_random_action | can not choose the action')
-                continue
+        now = datetime.now()
+        action = await select_random_action(controller=controller, wallet=wallet, initial=False)
 
-            if action == 'Insufficient balance':
-                logger.error(f'{wallet.address}: Insufficient balance')
-                continue
+        if not action:
+            logger.warning(f'{wallet.address} | select_random_action | can not choose the action')
+            activity_queue.push(wallet.id, datetime.now() + timedelta(seconds=delay))
+            return
 
-            status = await action()
-            if 'Failed' not in status:
-                now = datetime.now()
-                wallet.next_activity_action_time = now + timedelta(
-                    seconds=random.randint(settings.activity_actions_delay.from_, settings.activity_actions_delay.to_)
-                )
+        if action == 'Insufficient balance':
+            logger.error(f'{wallet.address}: Insufficient balance')
+            activity_queue.push(wallet.id, datetime.now() + timedelta(seconds=delay))
+            return
 
-                db.commit()
-
-                logger.success(f'{wallet.address}: {status}')
-
-                next_action_time = min((wallet.next_activity_action_time for wallet in db.all(
-                    Wallet, Wallet.initial_completed.is_(True)
-                )))
-                logger.info(f'The next closest activity action will be performed at {next_action_time}')
+        status = await controller.confirm(await action())
+        if 'Failed' not in status:
+            now = datetime.now()
+            next_time = now + timedelta(
+                seconds=random.randint(settings.activity_actions_delay.from_, settings.activity_actions_delay.to_)
+            )
 
-                await asyncio.sleep(delay)
+            await async_db.set_next_action_time(wallet.id, initial=False, next_time=next_time)
+            activity_queue.push(wallet.id, next_time)
 
-            else:
-                wallet.next_activity_action_time = now + timedelta(seconds=random.randint(10 * 60, 20 * 60))
-                db.commit()
-                logger.error(f'{wallet.address}: {status}')
+            logger.success(f'{wallet.address}: {status}')
+            logger.info(f'The next closest activity action will be performed at {(await schedule_status(initial=False)).next_due}')
 
-        except BaseException as e:
-            logger.exception(f'Something went wrong: {e}')
+        else:
+            next_time = now + timedelta(seconds=random.randint(10 * 60, 20 * 60))
+            await async_db.set_next_action_time(wallet.id, initial=False, next_time=next_time)
+            activity_queue.push(wallet.id, next_time)
+            logger.error(f'{wallet.address}: {status}')
 
-        finally:
-            await asyncio.sleep(delay)
+    except Exception as e:
+        logger.exception(f'Something went wrong: {e}')
+        activity_queue.push(wallet_id, datetime.now() + timedelta(seconds=delay))
@@ -1,28 +1,36 @@
-import asyncio
-import random
 from loguru import logger
 
-from evm import EVMClient, Networks
+from evm import Networks
+from evm.accounts import get_account
+from evm.fleet_scanner import FleetScanner
+from evm.models.registry.tokens import MonadTokens
 
 
-async def check_balance(wallet):
-    try:
-        delay = random.uniform(0.5, 1.5)
-        await asyncio.sleep(delay)
-        
-        client = EVMClient(
-            private_key=wallet['private_key'],
-            network=Networks.MONAD,
-            proxy=wallet.get('proxy')
-        )
-        
-        mon_balance = await client.get_native_balance()
-        
-        if mon_balance:
-            logger.info(f"Кошелёк {wallet['name']}: Баланс MON: {mon_balance.Ether:.6f}")
+async def check_balance(wallets: list[dict]):
+    named_addresses = []
+    for wallet in wallets:
+        try:
+            named_addresses.append((wallet['name'], get_account(wallet['private_key']).address))
+        except Exception as e:
+            logger.error(f"Кошелёк {wallet['name']}: Ошибка при проверке баланса: {str(e)}")
+
+    scanner = FleetScanner(
+        network=Networks.MONAD,
+        proxies=[wallet.get('proxy') for wallet in wallets]
+    )
+    balances = await scanner.scan(
+        addresses=[address for _, address in named_addresses],
+        tokens=[MonadTokens.MON]
+    )
+
+    total = 0
+    for name, address in named_addresses:
+        mon_balance = balances[address][MonadTokens.MON]
+
+        if mon_balance is not None:
+            total += mon_balance.Ether
+            logger.info(f"Кошелёк {name}: Баланс MON: {mon_balance.Ether:.6f}")
         else:
-            logger.error(f"Кошелёк {wallet['name']}: Не удалось получить баланс MON")
-            
-    except Exception as e:
-        logger.error(f"Кошелёк {wallet['name']}: Ошибка при проверке баланса: {str(e)}")
-        
\ No newline at end of file
+            logger.error(f"Кошелёк {name}: Не удалось получить баланс MON")
+
+    logger.info(f"Всего кошельков: {len(named_addresses)}; суммарный баланс MON: {total:.6f}")
@@ -34,7 +34,15 @@ def create_files():
         'initial_actions_delay': {'from': 1800, 'to': 10800},
         'activity_actions_delay': {'from': 18000, 'to': 36000},
         'mod_amount_for_swap': {'from': 0.01, 'to': 0.03},
-        'mod_amount_for_stake': {'from': 0.01, 'to': 0.02}
+        'mod_amount_for_stake': {'from': 0.01, 'to': 0.02},
+        'max_approval': False,
+        'rate_limits': {
+            'rpc': {'rate': 20, 'in_flight': 16},
+            'api': {'rate': 5, 'in_flight': 4},
+            'proxy': {'rate': 10, 'in_flight': 8}
+        },
+        'workers': {'max_workers': 20, 'per_proxy': 2, 'per_endpoint': 16},
+        'db_writes': {'flush_interval': 1.0, 'flush_size': 200, 'max_attempts': 3}
     }
     write_json(path=config.SETTINGS_FILE, obj=update_dict(modifiable=current_settings, template=settings), indent=2)
 
@@ -1,34 +1,49 @@
 import asyncio
 import random
 from loguru import logger
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from evm import EVMClient, Networks
-from evm.models.token import TokenAmount
+from evm.accounts import get_account
+from evm.fleet_scanner import FleetScanner
+from evm.models.token import Token, TokenAmount
 from functions.wallets_loader import load_wallets
 from utils.tasks.gazzip import GazZip 
 
-async def check_wallet_balance(wallet: Dict[str, Any]) -> Dict[str, Any]:
-    try:
-        client = EVMClient(
-            private_key=wallet['private_key'],
-            network=Networks.ARBITRUM,
-            proxy=wallet.get('proxy')
-        )
-        
-        eth_balance = await client.get_native_balance()
-        
-        wallet_info = wallet.copy()
-        wallet_info['balance'] = eth_balance
-        wallet_info['client'] = client 
-        
-        return wallet_info
-    
-    except Exception as e:
-        logger.error(f"Ошибка при проверке баланса кошелька {wallet.get('name', 'Неизвестный')}: {str(e)}")
+ETH = Token(
+    address="0x0000000000000000000000000000000000000000",
+    name="Ether",
+    symbol="ETH",
+    decimals=18,
+    is_native=True
+)
+
+
+async def check_wallet_balances(wallets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    wallet_results = []
+    for wallet in wallets:
         wallet_info = wallet.copy()
-        wallet_info['balance'] = TokenAmount.from_ether(0)
-        return wallet_info
+        try:
+            wallet_info['address'] = wallet.get('address') or get_account(wallet['private_key']).address
+        except Exception as e:
+            logger.error(f"Ошибка при проверке баланса кошелька {wallet.get('name', 'Неизвестный')}: {str(e)}")
+            wallet_info['address'] = None
+        wallet_results.append(wallet_info)
+
+    scanner = FleetScanner(
+        network=Networks.ARBITRUM,
+        proxies=[wallet.get('proxy') for wallet in wallets]
+    )
+    balances = await scanner.scan(
+        addresses=[wallet_info['address'] for wallet_info in wallet_results if wallet_info['address']],
+        tokens=[ETH]
+    )
+
+    for wallet_info in wallet_results:
+        balance = balances.get(wallet_info['address'], {}).get(ETH)
+        wallet_info['balance'] = balance or TokenAmount.from_ether(0)
+
+    return wallet_results
 
 async def process_gazzip_buy():
     all_wallets = load_wallets()
@@ -39,8 +54,7 @@ async def process_gazzip_buy():
     
     logger.info(f"Проверка балансов {len(all_wallets)} кошельков в сети Arbitrum...")
     
-    wallet_tasks = [check_wallet_balance(wallet) for wallet in all_wallets]
-    wallet_results = await asyncio.gather(*wallet_tasks)
+    wallet_results = await check_wallet_balances(all_wallets)
     
     min_usd_amount = 2.0
     
@@ -61,15 +75,14 @@ async def process_gazzip_buy():
     
     eligible_wallets = []
     for wallet_info in wallet_results:
-        balance_eth = float(wallet_info['balance'].Ether) if wallet_info['balance'] else 0
-        balance_usd = balance_eth * eth_price
+        balance = wallet_info['balance']
         
-        if balance_eth >= min_eth_amount:
+        if balance and balance >= min_eth_amount:
             eligible_wallets.append({
                 'name': wallet_info['name'],
                 'address': wallet_info.get('address', ''),
-                'balance_eth': balance_eth,
-                'balance_usd': balance_usd,
+                'balance_eth': balance.Ether,
+                'balance_usd': float(balance.Ether) * eth_price,
                 'client': wallet_info.get('client')
             })
     
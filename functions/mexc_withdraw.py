@@ -4,6 +4,7 @@ from typing import List, Tuple
 from loguru import logger
 
 from data.models import Settings
+from evm.accounts import get_account
 from functions.wallets_loader import load_wallets
 from utils.mexc_helper import MexcAssistant, WithdrawError, NetworkError
 
@@ -34,13 +35,8 @@ async def run_mexc_withdraw(wallet_names: List[str], amount_range: Tuple[float,
         wallet_address = wallet.get('address', '')
         
         if not wallet_address and 'private_key' in wallet:
-            from evm import EVMClient, Networks
             try:
-                client = EVMClient(
-                    private_key=wallet['private_key'],
-                    network=Networks.ARBITRUM
-                )
-                wallet['address'] = client.account.address
+                wallet['address'] = get_account(wallet['private_key']).address
             except Exception as e:
                 logger.error(f"Не удалось получить адрес для кошелька {wallet_name}: {e}")
                 wallets_without_address.append(wallet_name)
@@ -66,13 +62,8 @@ async def run_mexc_withdraw(wallet_names: List[str], amount_range: Tuple[float,
             wallet_address = wallet.get('address', '')
             
             if not wallet_address and 'private_key' in wallet:
-                from evm import EVMClient, Networks
                 try:
-                    client = EVMClient(
-                        private_key=wallet['private_key'],
-                        network=Networks.ARBITRUM
-                    )
-                    wallet_address = client.account.address
+                    wallet_address = get_account(wallet['private_key']).address
                 except Exception as e:
                     logger.error(f"Не удалось получить адрес для кошелька {wallet_name}: {e}")
                     continue
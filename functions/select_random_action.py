@@ -17,9 +17,20 @@ async def select_random_action(controller: Controller, wallet: Wallet, initial:
 
     swaps = 0
 
-    eth_balance = await controller.client.get_native_balance()
+    balances = await controller.client.get_balances([
+        MonadTokens.MON,
+        MonadTokens.WBTC,
+        MonadTokens.BEAN,
+        MonadTokens.JAI,
+        MonadTokens.USDC,
+    ])
 
-    if float(eth_balance.Ether) < settings.minimal_balance:
+    if not balances or balances[MonadTokens.MON] is None:
+        return None
+
+    eth_balance = balances[MonadTokens.MON]
+
+    if eth_balance < settings.minimal_balance:
         return 'Insufficient balance'
 
     if initial:
@@ -35,15 +46,15 @@ async def select_random_action(controller: Controller, wallet: Wallet, initial:
         if swaps >= wallet.number_of_swaps:
             return 'Processed'
 
-    sufficient_balance = float(eth_balance.Ether) > settings.minimal_balance + settings.mod_amount_for_swap.to_
+    sufficient_balance = eth_balance > settings.minimal_balance + settings.mod_amount_for_swap.to_
 
-    wbtc_balance = await controller.client.get_balance(MonadTokens.WBTC.address, MonadTokens.WBTC.decimals) 
-    bean_balance = await controller.client.get_balance(MonadTokens.BEAN.address, MonadTokens.BEAN.decimals)
-    jai_balance = await controller.client.get_balance(MonadTokens.JAI.address, MonadTokens.JAI.decimals)
-    usdc_balance = await controller.client.get_balance(MonadTokens.USDC.address, MonadTokens.USDC.decimals)
+    wbtc_balance = balances[MonadTokens.WBTC]
+    bean_balance = balances[MonadTokens.BEAN]
+    jai_balance = balances[MonadTokens.JAI]
+    usdc_balance = balances[MonadTokens.USDC]
 
     if swaps < wallet.number_of_swaps:
-        if usdc_balance.Wei:
+        if usdc_balance and usdc_balance.Wei:
             possible_actions += [
                 controller.bean.swap_usdc_to_mon,
                 controller.bean.swap_usdc_to_bean,
@@ -57,7 +68,7 @@ async def select_random_action(controller: Controller, wallet: Wallet, initial:
                 1,
             ]
 
-        if jai_balance.Wei:
+        if jai_balance and jai_balance.Wei:
             possible_actions += [
                 controller.bean.swap_jai_to_mon,
                 controller.bean.swap_jai_to_usdc,
@@ -69,7 +80,7 @@ async def select_random_action(controller: Controller, wallet: Wallet, initial:
                 1,
             ]
 
-        if bean_balance.Wei:
+        if bean_balance and bean_balance.Wei:
             possible_actions += [
                 controller.bean.swap_bean_to_jai,
                 controller.bean.swap_bean_to_mon,
@@ -79,7 +90,7 @@ async def select_random_action(controller: Controller, wallet: Wallet, initial:
                 1,
             ]
 
-        if wbtc_balance.Wei:
+        if wbtc_balance and wbtc_balance.Wei:
             possible_actions += [
                 controller.ambient.swap_wbtc_to_mon
             ]
@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+from loguru import logger
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data.config as config  # noqa: E402
+
+# Модули задач при импорте открывают БД кошельков и пишут логи в files/: тестам нужны свои
+config.WALLETS_DB = os.path.join(tempfile.mkdtemp(), 'wallets.db')
+logger.remove()
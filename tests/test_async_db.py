@@ -0,0 +1,80 @@
+import asyncio
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from utils.db_api.async_db import AsyncDB
+from utils.db_api.models import Base, Wallet
+
+
+NEXT_TIME = datetime(2030, 1, 1)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'wallets.db')}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(Wallet.__table__.insert(), [
+            {'id': i, 'private_key': f'key{i}', 'address': f'address{i}', 'proxy': '', 'name': f'{i}', 'number_of_swaps': 0}
+            for i in range(1, 4)
+        ])
+    return engine
+
+
+def next_times(engine) -> dict:
+    with engine.connect() as connection:
+        return dict(connection.execute(select(Wallet.id, Wallet.next_initial_action_time)).all())
+
+
+def test_flush_batches_wallet_updates(engine):
+    async def main():
+        async_db = AsyncDB(engine, {'flush_size': 100})
+        await async_db.set_next_action_time(1, True, NEXT_TIME)
+        await async_db.set_next_action_time(1, True, NEXT_TIME + timedelta(hours=1))
+        await async_db.set_next_action_time(2, True, NEXT_TIME)
+        await async_db.flush()
+        await async_db.close()
+        return async_db
+
+    async_db = asyncio.run(main())
+    assert next_times(engine) == {1: NEXT_TIME + timedelta(hours=1), 2: NEXT_TIME, 3: None}
+    assert (async_db.flushes, async_db.flushed_rows, async_db.dropped) == (1, 2, 0)
+
+
+def test_failing_row_does_not_block_flush(engine):
+    async def main():
+        async_db = AsyncDB(engine, {'flush_size': 100, 'max_attempts': 2})
+        await async_db.set_next_action_time(1, True, NEXT_TIME)
+        await async_db.update_wallet(2, name=None)
+        await async_db.set_next_action_time(3, True, NEXT_TIME)
+
+        await async_db.flush()
+        first = next_times(engine), dict(async_db._pending)
+
+        await async_db.flush()
+        second = next_times(engine), dict(async_db._pending)
+        await async_db.close()
+        return async_db, first, second
+
+    async_db, first, second = asyncio.run(main())
+    assert first == ({1: NEXT_TIME, 2: None, 3: NEXT_TIME}, {2: {'name': None}})
+    assert second == ({1: NEXT_TIME, 2: None, 3: NEXT_TIME}, {})
+    assert (async_db.flushed_rows, async_db.dropped) == (2, 1)
+
+
+def test_failed_row_keeps_newer_values(engine):
+    async def main():
+        async_db = AsyncDB(engine, {'flush_size': 100})
+        await async_db.update_wallet(2, name=None)
+        await async_db.flush()
+        await async_db.update_wallet(2, name='fixed')
+        await async_db.flush()
+        await async_db.close()
+
+    asyncio.run(main())
+    with engine.connect() as connection:
+        assert connection.execute(select(Wallet.name).where(Wallet.id == 2)).scalar() == 'fixed'
@@ -0,0 +1,154 @@
+import pytest
+from eth_abi import encode
+
+from evm.models.registry.tokens import MonadTokens
+from evm.utils.calldata import CalldataTemplate, Slot, selector_of, to_word
+from utils.tasks import ambient, bean, curvance, multpli, shmonad, uniswap
+
+
+ADDRESS = '0x19E7E376E7C213B7E7e7e46cc70A5dD086DAff2A'
+AMOUNTS = [0, 1, 10 ** 18, 123456789123456789, 2 ** 256 - 1]
+
+
+def abi_calldata(signature: str, types: list, args: list) -> bytes:
+    return selector_of(signature) + encode(types, args)
+
+
+def word(value) -> str:
+    return hex(value)[2:].zfill(64) if isinstance(value, int) else value.lower().replace('0x', '').zfill(64)
+
+
+@pytest.mark.parametrize('amount', AMOUNTS)
+def test_shmonad(amount):
+    assert shmonad.STAKE_CALLDATA.encode(assets=amount, receiver=ADDRESS) == abi_calldata(
+        'deposit(uint256,address)', ['uint256', 'address'], [amount, ADDRESS]
+    )
+    assert shmonad.UNSTAKE_CALLDATA.encode(shares=amount, owner=ADDRESS) == abi_calldata(
+        'redeem(uint256,address,address)', ['uint256', 'address', 'address'], [amount, ADDRESS, ADDRESS]
+    )
+
+
+@pytest.mark.parametrize('amount', AMOUNTS)
+def test_multpli(amount):
+    assert multpli.STAKE_CALLDATA.encode(amount=amount) == abi_calldata(
+        'deposit(address,uint256)', ['address', 'uint256'], ['0x924F1Bf31b19a7f9695F3FC6c69C2BA668Ea4a0a', amount]
+    )
+
+
+@pytest.mark.parametrize('fn_name', list(bean.SWAP_SIGNATURES))
+@pytest.mark.parametrize('path', [
+    (MonadTokens.WMON.address, MonadTokens.BEAN.address),
+    (MonadTokens.USDC.address, MonadTokens.WMON.address, MonadTokens.JAI.address),
+])
+@pytest.mark.parametrize('amount', AMOUNTS)
+def test_bean_swaps(fn_name, path, amount):
+    signature = bean.SWAP_SIGNATURES[fn_name]
+    types = signature[signature.index('(') + 1:-1].split(',')
+    args = [amount // 3, list(path), ADDRESS, 1700000000]
+    values = {'amount_out_min': amount // 3, 'to': ADDRESS, 'deadline': 1700000000}
+    if fn_name != 'swapExactETHForTokens':
+        args.insert(0, amount)
+        values['amount_in'] = amount
+
+    assert bean.swap_calldata(fn_name, path).encode(**values) == abi_calldata(signature, types, args)
+
+
+@pytest.mark.parametrize('template, token, is_buy, min_out, reserve_flags', [
+    (ambient.BUY_WBTC_CALLDATA, MonadTokens.WBTC.address, 1, ambient.NO_MIN_OUT, '3'),
+    (ambient.SELL_WBTC_CALLDATA, MonadTokens.WBTC.address, 0, '10001', '0020c9a34d999e88'),
+    (ambient.BUY_USDC_CALLDATA, MonadTokens.USDC.address, 1, ambient.NO_MIN_OUT, 'c644'),
+    (ambient.SELL_USDC_CALLDATA, MonadTokens.USDC.address, 0, '10001', '00230f19f1dbdcd3'),
+])
+@pytest.mark.parametrize('amount', AMOUNTS)
+def test_ambient(template, token, is_buy, min_out, reserve_flags, amount):
+    # Прежняя раскладка команды: hex-строка, закодированная через userCmd(uint16,bytes)
+    cmd = (
+        '0' * 64 +
+        token[2:].lower().zfill(64) +
+        '8ca0'.zfill(64) +
+        str(is_buy).zfill(64) +
+        str(is_buy).zfill(64) +
+        hex(amount)[2:].zfill(64) +
+        '0'.zfill(64) +
+        min_out.zfill(64) +
+        reserve_flags.zfill(64) +
+        '0'.zfill(64)
+    )
+    assert template.encode(qty=amount) == abi_calldata(
+        'userCmd(uint16,bytes)', ['uint16', 'bytes'], [1, bytes.fromhex(cmd)]
+    )
+
+
+@pytest.mark.parametrize('amount', AMOUNTS)
+def test_uniswap_mon_to_usdt(amount):
+    deadline = 1700000000
+    words = [
+        word(0x60), word(0xa0), word(deadline), word(2),
+        '0b08000000000000000000000000000000000000000000000000000000000000',
+        word(2), word(0x40), word(0xa0), word(0x40), word(2), word(amount), word(0x100),
+        word(ADDRESS), word(amount), word(2), word(0xa0), word(0), word(2),
+        word(MonadTokens.WMON.address), word(MonadTokens.USDT.address), word(0x40), word(ADDRESS),
+    ]
+    expected = bytes.fromhex('3593564c' + ''.join(words) + '0c')
+    assert uniswap.MON_TO_USDT_CALLDATA.encode(amount_in=amount, deadline=deadline, recipient=ADDRESS) == expected
+
+
+@pytest.mark.parametrize('amount', AMOUNTS)
+def test_uniswap_usdt_to_mon(amount):
+    deadline = 1700000000
+    min_amount_out = amount // 2
+    words = [
+        word(0x60), word(0xa0), word(deadline), word(2),
+        '080c000000000000000000000000000000000000000000000000000000000000',
+        word(2), word(0x40), word(0x160), word(0x100), word(2), word(amount), word(0),
+        word(0xa0), word(1), word(2), word(MonadTokens.USDT.address), word(MonadTokens.WMON.address),
+        word(0x40), word(ADDRESS), word(min_amount_out),
+    ]
+    expected = bytes.fromhex('3593564c' + ''.join(words) + '0c')
+    assert uniswap.USDT_TO_MON_CALLDATA.encode(
+        amount_in=amount, deadline=deadline, recipient=ADDRESS, min_amount_out=min_amount_out
+    ) == expected
+
+
+def test_curvance_claim():
+    expected = (
+        '0x7214c206'
+        f'{ADDRESS.lower()[2:].zfill(64)}'
+        '0000000000000000000000000000000000000000000000000000000000000060'
+        '0000000000000000000000000000000000000000000000000000000000000160'
+        '0000000000000000000000000000000000000000000000000000000000000007'
+        '0000000000000000000000005d876d73f4441d5f2438b1a3e2a51771b337f27a'
+        '0000000000000000000000006bb379a2056d1304e73012b99338f8f581ee2e18'
+        '0000000000000000000000000e1c9362cdea1d556e5ff89140107126baaf6b09'
+        '0000000000000000000000005b54153100e40000f6821a7ea8101dc8f5186c2d'
+        '0000000000000000000000007fdf92a43c54171f9c278c67088ca43f2079d09b'
+        '000000000000000000000000dfcf14d3e2a6eb731e27a810cb1400eea42a7fdc'
+        '000000000000000000000000b5481b57ff4e23ea7d2fda70f3137b16d0d99118'
+        '0000000000000000000000000000000000000000000000000000000000000007'
+        '00000000000000000000000000000000000000000000000000000002540be400'
+        '00000000000000000000000000000000000000000000000000000000004c4b40'
+        '00000000000000000000000000000000000000000000003635c9adc5dea00000'
+        '0000000000000000000000000000000000000000000000000de0b6b3a7640000'
+        '00000000000000000000000000000000000000000000003635c9adc5dea00000'
+        '00000000000000000000000000000000000000000000003635c9adc5dea00000'
+        '0000000000000000000000000000000000000000000000008ac7230489e80000'
+    )
+    assert curvance.CLAIM_CALLDATA.encode(account=ADDRESS) == bytes.fromhex(expected[2:])
+
+
+@pytest.mark.parametrize('amount', AMOUNTS)
+def test_from_abi_slots_inside_arrays_and_repeated(amount):
+    template = CalldataTemplate.from_abi(
+        'f(uint256[],address,uint256)', [[Slot('a'), 5, Slot('a')], Slot('to'), Slot('a')]
+    )
+    assert template.slots == ['a', 'to']
+    assert template.encode(a=amount, to=ADDRESS) == abi_calldata(
+        'f(uint256[],address,uint256)', ['uint256[]', 'address', 'uint256'], [[amount, 5, amount], ADDRESS, amount]
+    )
+
+
+def test_to_word():
+    assert to_word(True) == (1).to_bytes(32, 'big')
+    assert to_word(ADDRESS) == bytes.fromhex(ADDRESS[2:]).rjust(32, b'\x00')
+    with pytest.raises(ValueError):
+        to_word(bytes(33))
@@ -0,0 +1,82 @@
+import pytest
+
+from evm.pair_reserves import get_amount_out, get_amounts_out, pair_key
+
+
+E18 = 10 ** 18
+TOKEN_A = '0x' + 'aa' * 20
+TOKEN_B = '0x' + 'BB' * 20
+TOKEN_C = '0x' + '0c' * 20
+
+
+# Котировки UniswapV2Pair.spec.ts (v2-core): amount_in, reserve_in, reserve_out в целых токенах
+@pytest.mark.parametrize('amount_in, reserve_in, reserve_out, amount_out', [
+    (1, 5, 10, 1662497915624478906),
+    (1, 10, 5, 453305446940074565),
+    (2, 5, 10, 2851015155847869602),
+    (2, 10, 5, 831248957812239453),
+    (1, 10, 10, 906610893880149131),
+    (1, 100, 100, 987158034397061298),
+    (1, 1000, 1000, 996006981039903216),
+])
+def test_get_amount_out_matches_uniswap_v2(amount_in, reserve_in, reserve_out, amount_out):
+    assert get_amount_out(amount_in * E18, reserve_in * E18, reserve_out * E18) == amount_out
+
+
+def test_get_amount_out_router_quote():
+    # UniswapV2Router02.spec.ts: getAmountOut(2, 100, 100) == 1
+    assert get_amount_out(2, 100, 100) == 1
+
+
+def test_get_amount_out_fee():
+    # При огромных резервах выход стремится к amount_in * fee_numerator / 1000
+    reserve = 10 ** 60
+    assert get_amount_out(1000 * E18, reserve, reserve) == 997 * E18 - 1
+    assert get_amount_out(1000 * E18, reserve, reserve, fee_numerator=1000) == 1000 * E18 - 1
+    assert get_amount_out(1000 * E18, reserve, reserve, fee_numerator=990) == 990 * E18 - 1
+
+
+@pytest.mark.parametrize('reserve_in, reserve_out', [(0, 10 ** 18), (10 ** 18, 0), (0, 0)])
+def test_get_amount_out_without_liquidity(reserve_in, reserve_out):
+    with pytest.raises(ValueError):
+        get_amount_out(10 ** 18, reserve_in, reserve_out)
+
+
+@pytest.mark.parametrize('amount_in', [0, -1])
+def test_get_amount_out_requires_positive_input(amount_in):
+    with pytest.raises(ValueError):
+        get_amount_out(amount_in, 10 ** 18, 10 ** 18)
+
+
+def test_pair_key_orders_tokens():
+    assert pair_key(TOKEN_B, TOKEN_A) == pair_key(TOKEN_A, TOKEN_B) == (TOKEN_A, TOKEN_B.lower())
+
+
+def test_get_amounts_out_single_hop_both_directions():
+    reserves = {pair_key(TOKEN_A, TOKEN_B): (5 * E18, 10 * E18)}
+    assert get_amounts_out(E18, [TOKEN_A, TOKEN_B], reserves) == [E18, 1662497915624478906]
+    assert get_amounts_out(E18, [TOKEN_B, TOKEN_A], reserves) == [E18, 453305446940074565]
+
+
+def test_get_amounts_out_multi_hop():
+    reserves = {
+        pair_key(TOKEN_A, TOKEN_B): (5 * E18, 10 * E18),
+        pair_key(TOKEN_B, TOKEN_C): (7 * E18, 3 * E18),
+    }
+    amounts = get_amounts_out(E18, [TOKEN_A, TOKEN_B, TOKEN_C], reserves)
+
+    # token0 второй пары - TOKEN_C, поэтому для шага B -> C резервы берутся в обратном порядке
+    assert pair_key(TOKEN_B, TOKEN_C)[0] == TOKEN_C
+    middle = get_amount_out(E18, 5 * E18, 10 * E18)
+    assert amounts == [E18, middle, get_amount_out(middle, 3 * E18, 7 * E18)]
+
+
+def test_get_amounts_out_router_quote():
+    # UniswapV2Router02.spec.ts: getAmountsOut(2, [token0, token1]) при резервах 10000/10000 == [2, 1]
+    reserves = {pair_key(TOKEN_A, TOKEN_B): (10000, 10000)}
+    assert get_amounts_out(2, [TOKEN_A, TOKEN_B], reserves) == [2, 1]
+
+
+def test_get_amounts_out_missing_pair():
+    with pytest.raises(KeyError):
+        get_amounts_out(E18, [TOKEN_A, TOKEN_C], {pair_key(TOKEN_A, TOKEN_B): (E18, E18)})
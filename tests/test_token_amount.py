@@ -0,0 +1,102 @@
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from evm.models.token import TokenAmount, _scaled
+
+
+def test_construction():
+    assert TokenAmount(1).Wei == 10 ** 18
+    assert TokenAmount('0.1').Wei == 10 ** 17
+    assert TokenAmount(0.1, decimals=6).Wei == 100000
+    assert TokenAmount.from_wei(1500, decimals=3).Ether == Decimal('1.5')
+    assert TokenAmount.from_ether(Decimal('2.5'), decimals=2).Wei == 250
+
+
+def test_zero_is_truthy():
+    # Нулевой баланс - прочитанное значение, а не отсутствие ответа
+    assert TokenAmount(0)
+
+
+@pytest.mark.parametrize('other', [1, 1.0, Decimal('1'), TokenAmount(1, decimals=6)])
+def test_equality_with_numbers(other):
+    assert TokenAmount(1) == other
+    assert other == TokenAmount(1)
+
+
+def test_equal_amounts_hash_equal():
+    amount = TokenAmount(1, decimals=18)
+    assert hash(amount) == hash(TokenAmount(1, decimals=6)) == hash(1) == hash(Decimal(1)) == hash(Fraction(1))
+    assert hash(TokenAmount('0.5')) == hash(Fraction(1, 2)) == hash(Decimal('0.5'))
+    assert len({TokenAmount(1), TokenAmount(1, decimals=6), TokenAmount('1.000')}) == 1
+
+
+def test_hash_exact_beyond_decimal_precision():
+    # 40 значащих цифр: Decimal по умолчанию округлил бы обе суммы до одного значения
+    big = TokenAmount.from_wei(10 ** 40 + 1)
+    assert big != TokenAmount.from_wei(10 ** 40)
+    assert hash(big) == hash(Fraction(10 ** 40 + 1, 10 ** 18))
+    assert len({big, TokenAmount.from_wei(10 ** 40)}) == 2
+
+
+def test_cross_decimal_comparison():
+    usdc = TokenAmount('1.5', decimals=6)
+    assert usdc == TokenAmount('1.5', decimals=18)
+    assert usdc < TokenAmount.from_wei(15 * 10 ** 17 + 1, decimals=18)
+    assert usdc > TokenAmount.from_wei(15 * 10 ** 17 - 1, decimals=18)
+    assert sorted([TokenAmount(2, decimals=6), TokenAmount(1), TokenAmount('1.5', decimals=8)]) == [1, 1.5, 2]
+
+
+def test_threshold_comparison_is_exact():
+    # float(0.1 ether) + 1 wei больше 0.1, хотя как float они неразличимы
+    amount = TokenAmount.from_wei(10 ** 17 + 1)
+    assert amount > 0.1
+    assert amount > Decimal('0.1')
+    assert not amount <= 0.1
+    assert TokenAmount.from_wei(10 ** 17) >= 0.1
+
+
+def test_unsupported_comparison():
+    with pytest.raises(TypeError):
+        TokenAmount(1) < '1'
+    assert TokenAmount(1) != '1'
+    assert TokenAmount(1) != True  # noqa: E712
+
+
+def test_arithmetic():
+    assert TokenAmount(1) + TokenAmount('0.5') == 1.5
+    assert sum([TokenAmount(1), TokenAmount(2)]) == 3
+    assert TokenAmount(1) - TokenAmount(2) == -1
+    assert (TokenAmount(1) * 0.1).Wei == 10 ** 17
+    assert (3 * TokenAmount(1, decimals=6)).Wei == 3 * 10 ** 6
+    assert (TokenAmount(1) / 3).Wei == 10 ** 18 // 3
+    with pytest.raises(ValueError):
+        TokenAmount(1) + TokenAmount(1, decimals=6)
+
+
+def test_from_wei_many():
+    amounts = TokenAmount.from_wei_many([10 ** 18, None, '5', 0])
+    assert amounts[1] is None
+    assert [amount.Wei for amount in amounts if amount is not None] == [10 ** 18, 5, 0]
+    assert all(amount.decimals == 18 for amount in amounts if amount is not None)
+    assert amounts[0].Ether == 1
+
+
+def test_from_wei_many_per_amount_decimals():
+    amounts = TokenAmount.from_wei_many([10 ** 6, 10 ** 18], decimals=[6, 18])
+    assert [amount.decimals for amount in amounts] == [6, 18]
+    assert amounts[0] == amounts[1] == 1
+
+
+def test_scaled_is_cached():
+    _scaled.cache_clear()
+    assert _scaled(0.1, 18) == 10 ** 17
+    assert isinstance(_scaled(0.1, 18), int)
+    assert _scaled.cache_info().hits == 1
+    assert _scaled(Decimal('0.1'), 6) == 100000
+    assert _scaled.cache_info().misses == 2
+
+    # Порог дробнее одного wei остаётся Decimal
+    assert _scaled(Decimal('0.5'), 0) == Decimal('0.5')
+    assert TokenAmount.from_wei(1, decimals=0) > Decimal('0.5')
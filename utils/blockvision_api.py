@@ -1,6 +1,8 @@
 from fake_useragent import UserAgent
 from curl_cffi.requests import AsyncSession
 
+from utils.rate_limiter import rate_limiter
+
 
 class BlockvisionAPI:
     def __init__(self, key: str):
@@ -30,11 +32,12 @@ class BlockvisionAPI:
             params['cursor'] = cursor
             
         async with AsyncSession(verify=False) as session:
-            response = await session.get(
-                url=f"{self.url}/account/transactions",
-                params=params,
-                headers=self.headers
-            )
+            async with rate_limiter.limit(self.url, kind='api'):
+                response = await session.get(
+                    url=f"{self.url}/account/transactions",
+                    params=params,
+                    headers=self.headers
+                )
             data = response.json()
             
             if data.get('code') != 0:
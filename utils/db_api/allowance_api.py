@@ -0,0 +1,26 @@
+from utils.db_api.async_db import AllowanceKey, async_db
+from utils.db_api.models import Allowance
+
+
+def allowance_key(chain_id: int, token: str, owner: str, spender: str) -> AllowanceKey:
+    return chain_id, token.lower(), owner.lower(), spender.lower()
+
+
+async def get_allowance(chain_id: int, token: str, owner: str, spender: str) -> Allowance | None:
+    return await async_db.get_allowance(allowance_key(chain_id, token, owner, spender))
+
+
+async def save_allowance(
+    chain_id: int,
+    token: str,
+    owner: str,
+    spender: str,
+    amount: int,
+    verified_block: int | None = None
+) -> None:
+    """Изменение попадает в буфер записи AsyncDB и сохраняется вместе с состоянием расписания."""
+    await async_db.save_allowance(allowance_key(chain_id, token, owner, spender), amount, verified_block)
+
+
+async def forget_allowance(chain_id: int, token: str, owner: str, spender: str) -> None:
+    await async_db.forget_allowance(allowance_key(chain_id, token, owner, spender))
@@ -0,0 +1,380 @@
+import asyncio
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from loguru import logger
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from utils.db_api.models import Allowance, Wallet
+from utils.db_api.wallet_api import db
+
+
+T = TypeVar('T')
+
+IMPORT_CHUNK_SIZE = 500
+
+# (chain_id, token, owner, spender), адреса в нижнем регистре
+AllowanceKey = Tuple[int, str, str, str]
+
+
+class AsyncDB:
+    """
+    Репозиторий кошельков для корутин.
+
+    Все запросы выполняются в одном выделенном потоке со своей сессией, поэтому ожидание SQLite
+    не блокирует event loop, а сессия никогда не используется из двух потоков. Методы возвращают
+    отсоединённые от сессии объекты Wallet: их можно читать, а изменения сохраняются только через
+    методы репозитория.
+
+    Изменения состояния расписания (время следующего действия, флаги) не пишутся сразу, а копятся
+    в буфере: несколько изменений одного кошелька сливаются в одно, и буфер сбрасывается одной
+    транзакцией раз в flush_interval секунд или при накоплении flush_size изменённых строк. Так же
+    буферизуется журнал allowance. Чтения накладывают ещё не записанные значения на прочитанную
+    строку. close() сбрасывает буфер.
+
+    Если транзакция сброса падает, строки записываются по одной: ошибочная строка не мешает
+    остальным, возвращается в буфер и отбрасывается после max_attempts неудачных попыток.
+    """
+
+    DEFAULT_WRITES = {
+        'flush_interval': 1.0,
+        'flush_size': 200,
+        'max_attempts': 3,
+    }
+
+    def __init__(self, engine: Engine, writes: Optional[dict] = None):
+        self.engine = engine
+        self.writes = dict(self.DEFAULT_WRITES)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+        self._pending: Dict[int, dict] = {}
+        # None - запись allowance удалена
+        self._pending_allowances: Dict[AllowanceKey, Optional[dict]] = {}
+        # Число неудачных попыток записи строки: ('wallet', id) или ('allowance', ключ)
+        self._attempts: Dict[tuple, int] = {}
+        self._flusher: Optional[asyncio.Task] = None
+
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.buffered = 0
+        self.dropped = 0
+        if writes:
+            self.configure(writes)
+
+    def configure(self, writes: dict) -> None:
+        self.writes.update(writes)
+
+    async def run(self, fn: Callable[[Session], T], *args) -> T:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db')
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._call, fn, args)
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+
+        try:
+            await self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.submit(self._close_session)
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+        if self.flushes:
+            logger.info(
+                f'БД: изменений {self.buffered}, записано строк {self.flushed_rows} '
+                f'за {self.flushes} транзакций, отброшено {self.dropped}'
+            )
+
+    async def flush(self) -> None:
+        """Записывает накопленные изменения одной транзакцией, при ошибке - по одной строке."""
+        if not self._pending and not self._pending_allowances:
+            return
+
+        pending, self._pending = self._pending, {}
+        allowances, self._pending_allowances = self._pending_allowances, {}
+        try:
+            # Задача попадает в поток БД до первого переключения, поэтому чтения после flush видят эти изменения
+            failed_wallets, failed_allowances = await self.run(_flush_updates, pending, allowances)
+        except BaseException:
+            self._requeue(pending, allowances)
+            raise
+
+        for wallet_id in pending.keys() - failed_wallets.keys():
+            self._attempts.pop(('wallet', wallet_id), None)
+        for key in allowances.keys() - failed_allowances.keys():
+            self._attempts.pop(('allowance', key), None)
+
+        retry_wallets = {
+            wallet_id: pending[wallet_id] for wallet_id, error in failed_wallets.items()
+            if self._retry(('wallet', wallet_id), pending[wallet_id], error)
+        }
+        retry_allowances = {
+            key: allowances[key] for key, error in failed_allowances.items()
+            if self._retry(('allowance', key), allowances[key], error)
+        }
+        self._requeue(retry_wallets, retry_allowances)
+
+        self.flushes += 1
+        self.flushed_rows += len(pending) + len(allowances) - len(failed_wallets) - len(failed_allowances)
+
+    async def get_wallet(self, wallet_id: int) -> Optional[Wallet]:
+        wallet = await self.run(_get_wallet, wallet_id)
+        if wallet is not None:
+            for key, value in self._pending.get(wallet_id, {}).items():
+                setattr(wallet, key, value)
+        return wallet
+
+    async def get_scheduled(self, initial: bool) -> List[Tuple[int, datetime]]:
+        """(id, время следующего действия) всех кошельков фазы, у которых время назначено."""
+        await self.flush()
+        return await self.run(_get_scheduled, initial)
+
+    async def set_next_action_time(self, wallet_id: int, initial: bool, next_time: datetime) -> None:
+        column = 'next_initial_action_time' if initial else 'next_activity_action_time'
+        await self.update_wallet(wallet_id, **{column: next_time})
+
+    async def complete_initial(self, wallet_id: int, next_activity_action_time: datetime) -> None:
+        await self.update_wallet(
+            wallet_id,
+            initial_completed=True,
+            next_activity_action_time=next_activity_action_time
+        )
+
+    async def update_wallet(self, wallet_id: int, **values) -> None:
+        """Ставит изменение кошелька в буфер; при заполнении буфера сразу сбрасывает его."""
+        self._pending.setdefault(wallet_id, {}).update(values)
+        await self._buffered()
+
+    async def get_allowance(self, key: AllowanceKey) -> Optional[Allowance]:
+        allowance = await self.run(_get_allowance, key)
+        if key not in self._pending_allowances:
+            return allowance
+
+        values = self._pending_allowances[key]
+        if values is None:
+            return None
+        if allowance is None:
+            chain_id, token, owner, spender = key
+            allowance = Allowance(chain_id=chain_id, token=token, owner=owner, spender=spender)
+        for column, value in values.items():
+            setattr(allowance, column, value)
+        return allowance
+
+    async def save_allowance(self, key: AllowanceKey, amount: int, verified_block: Optional[int] = None) -> None:
+        values = {'amount': str(max(amount, 0)), 'updated_at': datetime.now()}
+        if verified_block is not None:
+            values['verified_block'] = verified_block
+
+        if key in self._pending_allowances and self._pending_allowances[key] is None:
+            # Запись удалена и создаётся заново: старый verified_block из строки БД не относится к ней
+            values.setdefault('verified_block', None)
+            self._pending_allowances[key] = values
+        else:
+            self._pending_allowances.setdefault(key, {}).update(values)
+        await self._buffered()
+
+    async def forget_allowance(self, key: AllowanceKey) -> None:
+        self._pending_allowances[key] = None
+        await self._buffered()
+
+    async def import_wallets(
+        self,
+        wallets: list,
+        number_of_swaps: Tuple[int, int],
+        address_of: Callable[[str], str]
+    ) -> Tuple[list, list]:
+        """Добавляет новые кошельки и обновляет proxy/name у существующих; возвращает (добавленные, изменённые)."""
+        return await self.run(_import_wallets, wallets, number_of_swaps, address_of)
+
+    async def _buffered(self) -> None:
+        self.buffered += 1
+        if len(self._pending) + len(self._pending_allowances) >= self.writes['flush_size']:
+            await self.flush()
+        elif self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while self._pending or self._pending_allowances:
+            await asyncio.sleep(self.writes['flush_interval'])
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.exception(f'БД: не удалось записать изменения кошельков: {e}')
+
+    def _retry(self, row: tuple, values: Optional[dict], error: Exception) -> bool:
+        """Считает неудачную попытку записи строки; False - строка отброшена."""
+        attempts = self._attempts.get(row, 0) + 1
+        if attempts < self.writes['max_attempts']:
+            self._attempts[row] = attempts
+            logger.warning(f'БД: не удалось записать {row} {values} (попытка {attempts}): {error}')
+            return True
+
+        self._attempts.pop(row, None)
+        self.dropped += 1
+        logger.error(f'БД: изменение {row} {values} отброшено после {attempts} попыток: {error}')
+        return False
+
+    def _requeue(self, pending: Dict[int, dict], allowances: Dict[AllowanceKey, Optional[dict]]) -> None:
+        # Более новые значения, попавшие в буфер во время записи, важнее вернувшихся
+        for wallet_id, values in pending.items():
+            self._pending[wallet_id] = {**values, **self._pending.get(wallet_id, {})}
+        for key, values in allowances.items():
+            self._pending_allowances.setdefault(key, values)
+
+    def _call(self, fn: Callable, args: tuple):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = Session(bind=self.engine, expire_on_commit=False)
+        try:
+            return fn(session, *args)
+        except Exception:
+            session.rollback()
+            raise
+
+    def _close_session(self) -> None:
+        session = getattr(self._local, 'session', None)
+        if session is not None:
+            session.close()
+            self._local.session = None
+
+
+def _get_wallet(session: Session, wallet_id: int) -> Optional[Wallet]:
+    wallet = session.get(Wallet, wallet_id)
+    if wallet is not None:
+        session.expunge(wallet)
+    return wallet
+
+
+def _get_scheduled(session: Session, initial: bool) -> List[Tuple[int, datetime]]:
+    column = Wallet.next_initial_action_time if initial else Wallet.next_activity_action_time
+    stmt = select(Wallet.id, column).where(Wallet.initial_completed.is_(not initial), column.is_not(None))
+    return [(wallet_id, next_time) for wallet_id, next_time in session.execute(stmt)]
+
+
+def _get_allowance(session: Session, key: AllowanceKey) -> Optional[Allowance]:
+    allowance = session.scalar(select(Allowance).where(*_allowance_filter(key)))
+    if allowance is not None:
+        session.expunge(allowance)
+    return allowance
+
+
+def _allowance_filter(key: AllowanceKey) -> tuple:
+    chain_id, token, owner, spender = key
+    return (
+        Allowance.chain_id == chain_id,
+        Allowance.token == token,
+        Allowance.owner == owner,
+        Allowance.spender == spender
+    )
+
+
+def _flush_updates(
+    session: Session,
+    pending: Dict[int, dict],
+    allowances: Dict[AllowanceKey, Optional[dict]]
+) -> Tuple[Dict[int, Exception], Dict[AllowanceKey, Exception]]:
+    """Возвращает строки, которые не удалось записать, с ошибками."""
+    try:
+        _write_wallets(session, pending)
+        for key, values in allowances.items():
+            _write_allowance(session, key, values)
+        session.commit()
+        return {}, {}
+    except Exception:
+        session.rollback()
+
+    # Одна ошибочная строка откатила всю транзакцию: остальные пишутся отдельно от неё
+    failed_wallets = {}
+    for wallet_id, values in pending.items():
+        try:
+            _write_wallets(session, {wallet_id: values})
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            failed_wallets[wallet_id] = e
+
+    failed_allowances = {}
+    for key, values in allowances.items():
+        try:
+            _write_allowance(session, key, values)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            failed_allowances[key] = e
+
+    return failed_wallets, failed_allowances
+
+
+def _write_wallets(session: Session, pending: Dict[int, dict]) -> None:
+    # executemany UPDATE по первичному ключу, отдельно для каждого набора колонок
+    groups: Dict[frozenset, list] = {}
+    for wallet_id, values in pending.items():
+        groups.setdefault(frozenset(values), []).append({'id': wallet_id, **values})
+
+    for rows in groups.values():
+        session.execute(update(Wallet), rows)
+
+
+def _write_allowance(session: Session, key: AllowanceKey, values: Optional[dict]) -> None:
+    if values is None:
+        session.execute(delete(Allowance).where(*_allowance_filter(key)))
+        return
+
+    chain_id, token, owner, spender = key
+    stmt = sqlite_insert(Allowance).values(chain_id=chain_id, token=token, owner=owner, spender=spender, **values)
+    session.execute(stmt.on_conflict_do_update(index_elements=['chain_id', 'token', 'owner', 'spender'], set_=values))
+
+
+def _import_wallets(
+    session: Session,
+    wallets: list,
+    number_of_swaps: Tuple[int, int],
+    address_of: Callable[[str], str]
+) -> Tuple[list, list]:
+    # Существующие кошельки - пачками по IMPORT_CHUNK_SIZE ключей, запись - одной транзакцией
+    private_keys = list({wallet.private_key for wallet in wallets})
+    existing: Dict[str, Wallet] = {}
+    for start in range(0, len(private_keys), IMPORT_CHUNK_SIZE):
+        stmt = select(Wallet).where(Wallet.private_key.in_(private_keys[start:start + IMPORT_CHUNK_SIZE]))
+        existing.update((wallet.private_key, wallet) for wallet in session.scalars(stmt))
+
+    imported = []
+    edited = []
+    for wallet in wallets:
+        wallet_instance = existing.get(wallet.private_key)
+        if wallet_instance and (
+                wallet_instance.proxy != wallet.proxy or
+                wallet_instance.name != wallet.name
+        ):
+            wallet_instance.proxy = wallet.proxy
+            wallet_instance.name = wallet.name
+            if wallet_instance not in edited and wallet_instance not in imported:
+                edited.append(wallet_instance)
+
+        if not wallet_instance:
+            wallet_instance = Wallet(
+                private_key=wallet.private_key,
+                address=address_of(wallet.private_key),
+                proxy=wallet.proxy,
+                name=wallet.name,
+                number_of_swaps=random.randint(*number_of_swaps),
+            )
+            existing[wallet.private_key] = wallet_instance
+            imported.append(wallet_instance)
+
+    session.add_all(imported)
+    session.commit()
+    session.expunge_all()
+    return imported, edited
+
+
+async_db = AsyncDB(db.engine)
@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import List, NamedTuple
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    statements: List[str]
+
+
+# Только добавлять в конец: применённая миграция больше не выполняется
+MIGRATIONS: List[Migration] = [
+    Migration(
+        version=1,
+        description='составные индексы по времени следующего действия',
+        statements=[
+            'CREATE INDEX IF NOT EXISTS ix_wallets_initial_due '
+            'ON wallets (initial_completed, next_initial_action_time)',
+            'CREATE INDEX IF NOT EXISTS ix_wallets_activity_due '
+            'ON wallets (initial_completed, next_activity_action_time)',
+        ]
+    ),
+]
+
+
+def schema_version(engine: Engine) -> int:
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE IF NOT EXISTS schema_version ('
+            'version INTEGER PRIMARY KEY, description TEXT NOT NULL, applied_at TIMESTAMP NOT NULL)'
+        ))
+        return conn.execute(text('SELECT COALESCE(MAX(version), 0) FROM schema_version')).scalar()
+
+
+def migrate(engine: Engine, migrations: List[Migration] = MIGRATIONS) -> int:
+    """
+    Применяет к БД миграции новее записанной в schema_version версии.
+
+    Версия записывается сразу после выполнения миграции; DDL в миграциях пишется идемпотентно
+    (IF NOT EXISTS), чтобы прерванный запуск можно было просто повторить. Возвращает итоговую версию схемы.
+    """
+    current = schema_version(engine)
+    for migration in sorted(migrations, key=lambda item: item.version):
+        if migration.version <= current:
+            continue
+
+        with engine.begin() as conn:
+            for statement in migration.statements:
+                conn.execute(text(statement))
+            conn.execute(
+                text('INSERT INTO schema_version (version, description, applied_at) VALUES (:version, :description, :applied_at)'),
+                {'version': migration.version, 'description': migration.description, 'applied_at': datetime.now()}
+            )
+
+        current = migration.version
+        logger.info(f'БД: применена миграция {migration.version} ({migration.description})')
+
+    return current
@@ -1,3 +1,4 @@
+from sqlalchemy import Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.orm import DeclarativeBase
 from datetime import datetime
@@ -8,6 +9,11 @@ class Base(DeclarativeBase):
 
 class Wallet(Base):
     __tablename__ = 'wallets'
+    # Те же индексы для существующих БД добавляет миграция 1 (utils/db_api/migrations.py)
+    __table_args__ = (
+        Index('ix_wallets_initial_due', 'initial_completed', 'next_initial_action_time'),
+        Index('ix_wallets_activity_due', 'initial_completed', 'next_activity_action_time'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     private_key: Mapped[str] = mapped_column(unique=True, index=True)
@@ -21,4 +27,22 @@ class Wallet(Base):
     completed: Mapped[bool] = mapped_column(default=False, server_default='0')
 
     def __repr__(self):
-        return f'{self.name}: {self.address}'
\ No newline at end of file
+        return f'{self.name}: {self.address}'
+
+
+class Allowance(Base):
+    __tablename__ = 'allowances'
+    __table_args__ = (UniqueConstraint('chain_id', 'token', 'owner', 'spender'),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    chain_id: Mapped[int]
+    token: Mapped[str]
+    owner: Mapped[str]
+    spender: Mapped[str]
+    # uint256 не помещается в INTEGER SQLite, поэтому хранится строкой
+    amount: Mapped[str]
+    verified_block: Mapped[int | None] = mapped_column(default=None)
+    updated_at: Mapped[datetime] = mapped_column(default=datetime.now)
+
+    def __repr__(self):
+        return f'{self.owner} -> {self.spender}: {self.amount} of {self.token}'
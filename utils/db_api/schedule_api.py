@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from utils.db_api.async_db import async_db
+from utils.db_api.models import Wallet
+from utils.scheduler import BACKLOG_BUCKETS, ScheduleStatus, activity_queue, initial_queue
+
+
+async def get_schedule_status(initial: bool, now: datetime | None = None) -> ScheduleStatus:
+    """
+    Состояние расписания без загрузки объектов Wallet.
+
+    Один запрос: MIN по времени и SUM(CASE ...) на каждую корзину истории. По индексу
+    (initial_completed, next_*_action_time) это один проход по записям индекса текущей фазы -
+    O(n) по числу её кошельков, но без чтения строк таблицы.
+    """
+    await async_db.flush()
+    return await async_db.run(_schedule_status, initial, now or datetime.now())
+
+
+def _schedule_status(session: Session, initial: bool, now: datetime) -> ScheduleStatus:
+    column = Wallet.next_initial_action_time if initial else Wallet.next_activity_action_time
+    phase = Wallet.initial_completed.is_(not initial)
+
+    buckets = []
+    lower = None
+    for label, edge in BACKLOG_BUCKETS:
+        conditions = []
+        if lower is not None:
+            conditions.append(column > lower)
+        upper = now + timedelta(seconds=edge) if edge != float('inf') else None
+        if upper is not None:
+            conditions.append(column <= upper)
+        buckets.append(func.coalesce(func.sum(case((and_(*conditions), 1), else_=0)), 0))
+        lower = upper
+
+    row = session.execute(
+        select(func.min(column), *buckets).where(phase, column.is_not(None))
+    ).one()
+
+    backlog = {label: count for (label, _), count in zip(BACKLOG_BUCKETS, row[1:])}
+    due = sum(backlog[label] for label, edge in BACKLOG_BUCKETS if edge <= 0)
+    return ScheduleStatus(total=sum(backlog.values()), due=due, next_due=row[0], backlog=backlog)
+
+
+async def schedule_status(initial: bool) -> ScheduleStatus:
+    """Из очереди планировщика, если она уже загружена циклом, иначе из БД."""
+    queue = initial_queue if initial else activity_queue
+    if len(queue):
+        return queue.status()
+    return await get_schedule_status(initial)
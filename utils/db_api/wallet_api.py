@@ -1,5 +1,6 @@
 from utils.db_api.models import Base, Wallet
 from utils.db_api.db import DB
+from utils.db_api.migrations import migrate
 
 from data.config import WALLETS_DB
 
@@ -19,4 +20,5 @@ def get_wallet(private_key: str, sqlite_query: bool = False) -> Wallet | None:
 
 
 db = DB(f'sqlite:///{WALLETS_DB}', echo=False, pool_recycle=3600, connect_args={'check_same_thread': False})
-db.create_tables(Base)
\ No newline at end of file
+db.create_tables(Base)
+migrate(db.engine)
\ No newline at end of file
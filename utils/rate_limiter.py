@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+
+class TokenBucket:
+    """
+    Token bucket с резервированием: каждый acquire сразу списывает токен (баланс может уйти в минус)
+    и спит ровно столько, сколько нужно до его пополнения. Поэтому ожидающие обслуживаются по порядку
+    и без общего lock'а.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst or max(rate, 1)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+
+    async def acquire(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+
+        if self.tokens >= 0:
+            return 0.0
+
+        wait = -self.tokens / self.rate
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self.tokens += 1
+            raise
+        return wait
+
+
+class Limit:
+    """Ограничение одного ключа: запросов в секунду и одновременных запросов, плюс статистика ожидания."""
+
+    def __init__(self, rate: float, max_in_flight: int):
+        self.bucket = TokenBucket(rate)
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.requests = 0
+        self.waited = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(self) -> float:
+        started = time.monotonic()
+        await self.semaphore.acquire()
+        try:
+            await self.bucket.acquire()
+        except BaseException:
+            self.semaphore.release()
+            raise
+
+        wait = time.monotonic() - started
+        self.requests += 1
+        self.waited += wait
+        self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def release(self) -> None:
+        self.semaphore.release()
+
+
+def mask_credentials(url: str) -> str:
+    """host:port прокси или URL для логов; логин и пароль заменяются коротким хешем, чтобы ключи не совпадали."""
+    parts = urlsplit(url if '//' in url else f'//{url}')
+    if not parts.username and not parts.password:
+        return parts.netloc or url
+    digest = hashlib.sha1(parts.netloc.rpartition('@')[0].encode()).hexdigest()[:6]
+    host = parts.netloc.rpartition('@')[2]
+    return f'{host}#{digest}'
+
+
+class RateLimiter:
+    """
+    Общий для процесса ограничитель запросов.
+
+    Лимиты ведутся отдельно для каждого хоста (RPC-эндпоинта или HTTP API) и для каждого прокси,
+    запрос занимает слот в обоих. Параметры берутся по виду ключа: 'rpc', 'api' или 'proxy'.
+    """
+
+    DEFAULT_LIMITS = {
+        'rpc': {'rate': 20, 'in_flight': 16},
+        'api': {'rate': 5, 'in_flight': 4},
+        'proxy': {'rate': 10, 'in_flight': 8},
+    }
+
+    def __init__(self, limits: Optional[dict] = None):
+        self.limits = {kind: dict(values) for kind, values in self.DEFAULT_LIMITS.items()}
+        self._entries: Dict[Tuple[str, str], Limit] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        if limits:
+            self.configure(limits)
+
+    def configure(self, limits: dict) -> None:
+        for kind, values in limits.items():
+            self.limits.setdefault(kind, {}).update(values)
+        self._entries.clear()
+
+    @asynccontextmanager
+    async def limit(self, url: str, proxy: Optional[str] = None, kind: str = 'rpc'):
+        keys = [(kind, urlsplit(url).netloc or url)]
+        if proxy:
+            keys.append(('proxy', proxy))
+
+        acquired = []
+        try:
+            for key in keys:
+                limit = self._get(key)
+                await limit.acquire()
+                acquired.append(limit)
+            yield
+        finally:
+            for limit in acquired:
+                limit.release()
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            f'{kind}:{mask_credentials(name)}': {
+                'requests': limit.requests,
+                'waited': round(limit.waited, 3),
+                'avg_wait': round(limit.waited / limit.requests, 4) if limit.requests else 0.0,
+                'max_wait': round(limit.max_wait, 3),
+            }
+            for (kind, name), limit in self._entries.items()
+        }
+
+    def log_stats(self) -> None:
+        for key, stats in self.stats().items():
+            if stats['requests']:
+                logger.info(
+                    f"Лимит {key}: запросов {stats['requests']}, ожидание всего {stats['waited']} сек, "
+                    f"в среднем {stats['avg_wait']} сек, максимум {stats['max_wait']} сек"
+                )
+
+    def _get(self, key: Tuple[str, str]) -> Limit:
+        # Семафоры привязаны к event loop, поэтому при новом asyncio.run лимиты создаются заново
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._entries.clear()
+            self._loop = loop
+
+        limit = self._entries.get(key)
+        if limit is None:
+            values = self.limits.get(key[0]) or self.DEFAULT_LIMITS['rpc']
+            limit = Limit(rate=values['rate'], max_in_flight=values['in_flight'])
+            self._entries[key] = limit
+        return limit
+
+
+rate_limiter = RateLimiter()
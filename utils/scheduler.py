@@ -0,0 +1,128 @@
+import asyncio
+import bisect
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+# Границы корзин истории в секундах относительно текущего момента (due - now): просроченные слева, будущие справа
+BACKLOG_BUCKETS: List[Tuple[str, float]] = [
+    ('просрочено > 1ч', -3600),
+    ('просрочено 10м-1ч', -600),
+    ('просрочено < 10м', 0),
+    ('через < 10м', 600),
+    ('через 10м-1ч', 3600),
+    ('через > 1ч', float('inf')),
+]
+
+
+@dataclass
+class ScheduleStatus:
+    total: int
+    due: int
+    next_due: Optional[datetime]
+    backlog: Dict[str, int] = field(default_factory=dict)
+
+    def __str__(self):
+        backlog = ', '.join(f'{label}: {count}' for label, count in self.backlog.items() if count)
+        return (
+            f'кошельков {self.total}, к выполнению {self.due}, ближайшее действие {self.next_due}'
+            + (f' ({backlog})' if backlog else '')
+        )
+
+
+def backlog_histogram(due_times: Iterable[datetime], now: datetime) -> Dict[str, int]:
+    edges = [edge for _, edge in BACKLOG_BUCKETS]
+    backlog = {label: 0 for label, _ in BACKLOG_BUCKETS}
+    for due in due_times:
+        index = min(bisect.bisect_left(edges, (due - now).total_seconds()), len(edges) - 1)
+        backlog[BACKLOG_BUCKETS[index][0]] += 1
+    return backlog
+
+
+class DueQueue:
+    """
+    Очередь ключей (id кошельков) по времени следующего действия на куче.
+
+    push переносит ключ на новое время: старая запись в куче помечается недействительной и
+    выбрасывается при извлечении. wait_due спит ровно до ближайшего времени или до push,
+    который сдвинул начало очереди, и возвращает все ключи, время которых уже наступило.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, Hashable]] = []
+        self._due: Dict[Hashable, Tuple[datetime, int]] = {}
+        self._counter = itertools.count()
+        self._changed: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._due
+
+    def push(self, key: Hashable, due: datetime) -> None:
+        entry = (due, next(self._counter))
+        self._due[key] = entry
+        heapq.heappush(self._heap, (*entry, key))
+        if self._changed is not None and self._heap[0][2] == key:
+            self._changed.set()
+
+    def remove(self, key: Hashable) -> None:
+        self._due.pop(key, None)
+
+    def next_due(self) -> Optional[datetime]:
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def status(self, now: Optional[datetime] = None) -> ScheduleStatus:
+        now = now or datetime.now()
+        due_times = [due for due, _ in self._due.values()]
+        return ScheduleStatus(
+            total=len(due_times),
+            due=sum(1 for due in due_times if due <= now),
+            next_due=self.next_due(),
+            backlog=backlog_histogram(due_times, now)
+        )
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[Hashable]:
+        now = now or datetime.now()
+        keys = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return keys
+            _, _, key = heapq.heappop(self._heap)
+            del self._due[key]
+            keys.append(key)
+
+    async def wait_due(self) -> List[Hashable]:
+        if self._changed is None:
+            self._changed = asyncio.Event()
+
+        while True:
+            keys = self.pop_due()
+            if keys:
+                return keys
+
+            self._changed.clear()
+            next_due = self.next_due()
+            timeout = None if next_due is None else max(0.0, (next_due - datetime.now()).total_seconds())
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _drop_stale(self) -> None:
+        while self._heap:
+            due, seq, key = self._heap[0]
+            if self._due.get(key) == (due, seq):
+                return
+            heapq.heappop(self._heap)
+
+
+# Очереди циклов initial и activity: кошелёк, завершивший initial, сразу переходит в activity_queue
+initial_queue = DueQueue()
+activity_queue = DueQueue()
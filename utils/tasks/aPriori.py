@@ -14,7 +14,7 @@ class aPriori(BaseActivity, Base):
         super().__init__(client)
         self.protocol = MonadProtocols.APRIORI
         self.mon = MonadTokens.MON
-        self.contract = self.protocol.get_contract(self.client.web3)
+        self.contract = self.protocol.get_contract()
 
 
     async def stake_mon(self, amount: int | float = None) -> None:
@@ -37,7 +37,7 @@ class aPriori(BaseActivity, Base):
     
     async def unstake_mon(self, amount: int | float) -> None:
         amount_wei = amount.Wei if isinstance(amount, TokenAmount) else self.mon.amount_to_wei(amount)
-        shares = await self.contract.functions.convertToShares(amount_wei).call()
+        shares = await self.client.call(self.contract.functions.convertToShares(amount_wei))
         
         tx_req = await self.client.build_transaction(
             to=self.protocol.address,
@@ -48,10 +48,10 @@ class aPriori(BaseActivity, Base):
         )
         await self.client.send_transaction(tx_req)
         
-        next_request = await self.contract.functions.nextRequestId().call()
+        next_request = await self.client.call(self.contract.functions.nextRequestId())
         request_id = next_request - 1
         
-        wait_time = await self.contract.functions.withdrawalWaitTime().call()
+        wait_time = await self.client.call(self.contract.functions.withdrawalWaitTime())
         await asyncio.sleep(wait_time + 60)
         
         tx_redeem = await self.client.build_transaction(
@@ -65,12 +65,12 @@ class aPriori(BaseActivity, Base):
     
     
     async def get_aprmon_balance(self) -> int:
-        balance = await self.contract.functions.balanceOf(self.client.account.address).call()
+        balance = await self.client.call(self.contract.functions.balanceOf(self.client.account.address))
         return balance
 
 
     async def get_exchange_rates(self) -> dict:
         one_ether = 10**18
-        assets = await self.contract.functions.convertToAssets(one_ether).call()
-        shares = await self.contract.functions.convertToShares(one_ether).call()
+        assets = await self.client.call(self.contract.functions.convertToAssets(one_ether))
+        shares = await self.client.call(self.contract.functions.convertToShares(one_ether))
         return {"assets": assets, "shares": shares}
@@ -10,6 +10,32 @@ from evm.models.token import TokenAmount
 from evm.utils.token_utils import approve_token_if_needed
 from utils.tasks.base import Base
 from loguru import logger
+from evm.utils.calldata import CalldataTemplate, Slot
+
+
+NO_MIN_OUT = '000000000000000000000000000000000ffff5433e2b3d8211706e6102aa9471'
+
+
+def swap_calldata(token_address: str, is_buy: bool, min_out, reserve_flags: int) -> CalldataTemplate:
+    """userCmd(1, cmd) для свапа MON <-> token в пуле 0x8ca0, изменяется только qty."""
+    return CalldataTemplate.from_abi('userCmd(uint16,bytes)', [1, [
+        0,                  # [3] zeros
+        token_address,      # [4] token address
+        0x8ca0,             # [5] pool index
+        int(is_buy),        # [6] is_buy
+        int(is_buy),        # [7] in_base_qty
+        Slot('qty'),        # [8] qty
+        0,                  # [9] tip
+        min_out,            # [10] min_out
+        reserve_flags,      # [11] reserve_flags
+        0                   # [12] trailing zero
+    ]])
+
+
+BUY_WBTC_CALLDATA = swap_calldata(MonadTokens.WBTC.address, True, NO_MIN_OUT, 0x3)
+SELL_WBTC_CALLDATA = swap_calldata(MonadTokens.WBTC.address, False, 0x10001, 0x0020c9a34d999e88)
+BUY_USDC_CALLDATA = swap_calldata(MonadTokens.USDC.address, True, NO_MIN_OUT, 0xc644)
+SELL_USDC_CALLDATA = swap_calldata(MonadTokens.USDC.address, False, 0x10001, 0x00230f19f1dbdcd3)
 
 
 class AmbientMonad(BaseActivity):
@@ -19,7 +45,7 @@ class AmbientMonad(BaseActivity):
         self.mon = MonadTokens.MON
         self.wbtc = MonadTokens.WBTC
         self.usdc = MonadTokens.USDC
-        self.contract = self.protocol.get_contract(self.client.web3)
+        self.contract = self.protocol.get_contract()
 
 
     async def swap_mon_to_wbtc(
@@ -34,28 +60,7 @@ class AmbientMonad(BaseActivity):
              
         amount_in_wei = amount.Wei
 
-        min_amount_out = "000000000000000000000000000000000ffff5433e2b3d8211706e6102aa9471"
-
-        cmd = (
-            "0" * 64 +                                    # [3] zeros 
-            self.wbtc.address[2:].lower().zfill(64) +    # [4] WBTC token address
-            "8ca0".zfill(64) +                           # [5] pool index
-            "1".zfill(64) +                              # [6] is_buy
-            "1".zfill(64) +                              # [7] in_base_qty
-            hex(amount_in_wei)[2:].zfill(64) +           # [8] qty
-            "0".zfill(64) +                              # [9] tip
-            min_amount_out +                             # [10] min_out
-            "3".zfill(64) +                              # [11] reserve_flags
-            "0".zfill(64)                                # [12] trailing zero
-        )
-
-        data = self.contract.encodeABI(
-            fn_name="userCmd",
-            args=[
-                1,
-                bytes.fromhex(cmd)
-            ]
-        )
+        data = BUY_WBTC_CALLDATA.encode(qty=amount_in_wei)
 
         tx = await self.client.build_transaction(
             to=self.protocol.address,
@@ -78,26 +83,7 @@ class AmbientMonad(BaseActivity):
                 amount_wei=balance.Wei
             )
             
-            cmd = (
-                "0" * 64 +                                    # [3] zeros 
-                self.wbtc.address[2:].lower().zfill(64) +    # [4] WBTC token address
-                "8ca0".zfill(64) +                           # [5] pool index
-                "0".zfill(64) +                              # [6] is_buy = 0
-                "0".zfill(64) +                              # [7] in_base_qty = 0
-                hex(balance.Wei)[2:].zfill(64) +             # [8] qty = весь баланс
-                "0".zfill(64) +                              # [9] tip
-                "10001".zfill(64) +                          # [10] min_out
-                "0020c9a34d999e88".zfill(64) +               # [11] reserve_flags
-                "0".zfill(64)                                # [12] trailing zero
-            )
-
-            data = self.contract.encodeABI(
-                fn_name="userCmd",
-                args=[
-                    1,
-                    bytes.fromhex(cmd)
-                ]
-            )
+            data = SELL_WBTC_CALLDATA.encode(qty=balance.Wei)
 
             tx = await self.client.build_transaction(
                 to=self.protocol.address,
@@ -131,28 +117,7 @@ class AmbientMonad(BaseActivity):
             
             logger.info(f"Свап MON -> USDC, сумма: {amount}, Wei: {amount_in_wei}")
 
-            min_amount_out = "000000000000000000000000000000000ffff5433e2b3d8211706e6102aa9471"
-            
-            cmd = (
-                "0" * 64 +                                    # [3] zeros 
-                self.usdc.address[2:].lower().zfill(64) +    # [4] USDC token address
-                "8ca0".zfill(64) +                           # [5] pool index
-                "1".zfill(64) +                              # [6] is_buy
-                "1".zfill(64) +                              # [7] in_base_qty
-                hex(amount_in_wei)[2:].zfill(64) +           # [8] qty
-                "0".zfill(64) +                              # [9] tip
-                min_amount_out +                             # [10] min_out
-                "c644".zfill(64) +                           # [11] reserve_flags
-                "0".zfill(64)                                # [12] trailing zero
-            )
-
-            data = self.contract.encodeABI(
-                fn_name="userCmd",
-                args=[
-                    1, 
-                    bytes.fromhex(cmd)  
-                ]
-            )
+            data = BUY_USDC_CALLDATA.encode(qty=amount_in_wei)
 
             tx = await self.client.build_transaction(
                 to=self.protocol.address,
@@ -184,26 +149,7 @@ class AmbientMonad(BaseActivity):
                 amount_wei=balance.Wei
             )
 
-            cmd = (
-                "0" * 64 +                                    # [3] zeros 
-                self.usdc.address[2:].lower().zfill(64) +    # [4] USDC token address
-                "8ca0".zfill(64) +                           # [5] pool index
-                "0".zfill(64) +                              # [6] is_buy = 0
-                "0".zfill(64) +                              # [7] in_base_qty = 0
-                hex(balance.Wei)[2:].zfill(64) +               # [8] qty = 0xc845
-                "0".zfill(64) +                              # [9] tip
-                "10001".zfill(64) +                          # [10] min_out
-                "00230f19f1dbdcd3".zfill(64) +               # [11] reserve_flags
-                "0".zfill(64)                                # [12] trailing zero
-            )
-
-            data = self.contract.encodeABI(
-                fn_name="userCmd",
-                args=[
-                    1,
-                    bytes.fromhex(cmd)  
-                ]
-            )
+            data = SELL_USDC_CALLDATA.encode(qty=balance.Wei)
 
             tx = await self.client.build_transaction(
                 to=self.protocol.address,
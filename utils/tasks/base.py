@@ -4,6 +4,8 @@ import aiohttp
 
 from evm import EVMClient
 from evm.models.token import TokenAmount
+from evm.receipt_tracker import is_tx_hash
+from evm.utils.token_utils import settle_allowances
 from utils.utils import randfloat
 
 from data.models import Settings
@@ -46,6 +48,31 @@ class Base:
                 step=0.0000001
             )
         )
-    
-    
 
+
+    async def confirm(self, status):
+        """
+        Дожидается подтверждения транзакций, хеши которых вернуло действие.
+        Если хотя бы одна откатилась или не подтвердилась за время ожидания (выпала из мемпула,
+        зависла), возвращает строку 'Failed: ...', иначе исходный status.
+        Отложенные списания allowance применяются к журналу только при успехе.
+        """
+        results = status if isinstance(status, (list, tuple)) else [status]
+        hashes = [result for result in results if is_tx_hash(result)]
+
+        receipts = await asyncio.gather(*[self.client.wait_for_receipt(tx_hash) for tx_hash in hashes])
+        failure = None
+        for tx_hash, receipt in zip(hashes, receipts):
+            if receipt is None:
+                failure = f'Failed: transaction {tx_hash} not confirmed'
+                break
+            if not receipt.success:
+                failure = f'Failed: transaction {tx_hash} reverted'
+                break
+
+        await settle_allowances(
+            self.client,
+            success=failure is None and bool(hashes),
+            block_number=max((receipt.block_number for receipt in receipts if receipt), default=None)
+        )
+        return failure or status
@@ -1,13 +1,35 @@
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from evm.base_activity import BaseActivity
 from evm.client import EVMClient
 from evm.models.registry.tokens import MonadTokens
 from evm.models.registry.protocols import MonadProtocols
 from evm.models.token import TokenAmount
+from evm.quote_service import get_quote_service
 from evm.utils.token_utils import approve_token_if_needed
+from evm.utils.calldata import CalldataTemplate, Slot
 from utils.tasks.base import Base
 
+
+SWAP_SIGNATURES = {
+    'swapExactETHForTokens': 'swapExactETHForTokens(uint256,address[],address,uint256)',
+    'swapExactTokensForETH': 'swapExactTokensForETH(uint256,uint256,address[],address,uint256)',
+    'swapExactTokensForTokens': 'swapExactTokensForTokens(uint256,uint256,address[],address,uint256)',
+}
+
+_swap_templates: Dict[Tuple[str, Tuple[str, ...]], CalldataTemplate] = {}
+
+
+def swap_calldata(fn_name: str, path: Tuple[str, ...]) -> CalldataTemplate:
+    """Шаблон calldata свапа роутера для фиксированного пути, собирается один раз на (функция, путь)."""
+    key = (fn_name, path)
+    if key not in _swap_templates:
+        args = [Slot('amount_out_min'), list(path), Slot('to'), Slot('deadline')]
+        if fn_name != 'swapExactETHForTokens':
+            args.insert(0, Slot('amount_in'))
+        _swap_templates[key] = CalldataTemplate.from_abi(SWAP_SIGNATURES[fn_name], args)
+    return _swap_templates[key]
+
 class BeanExchange(BaseActivity, Base):
     def __init__(self, client: EVMClient):
         super().__init__(client)
@@ -20,68 +42,17 @@ class BeanExchange(BaseActivity, Base):
 
         self.protocol = MonadProtocols.BEAN_EXCHANGE
         self.router_address = self.protocol.address
+        self.router = self.protocol.get_contract()
+        self.quotes = get_quote_service(client.network, self.router_address)
+
 
-        self.abi_swap_exact_eth_for_tokens = [
-            {
-                "name": "swapExactETHForTokens",
-                "type": "function",
-                "inputs": [
-                    {"name": "amountOutMin", "type": "uint256"},
-                    {"name": "path", "type": "address[]"},
-                    {"name": "to", "type": "address"},
-                    {"name": "deadline", "type": "uint256"}
-                ],
-                "outputs": [],
-                "stateMutability": "payable"
-            }
-        ]
-        self.abi_swap_exact_tokens_for_eth = [
-            {
-                "name": "swapExactTokensForETH",
-                "type": "function",
-                "inputs": [
-                    {"name": "amountIn", "type": "uint256"},
-                    {"name": "amountOutMin", "type": "uint256"},
-                    {"name": "path", "type": "address[]"},
-                    {"name": "to", "type": "address"},
-                    {"name": "deadline", "type": "uint256"}
-                ],
-                "outputs": [],
-                "stateMutability": "nonpayable"
-            }
-        ]
-        self.abi_swap_exact_tokens_for_tokens = [
-            {
-                "name": "swapExactTokensForTokens",
-                "type": "function",
-                "inputs": [
-                    {"name": "amountIn", "type": "uint256"},
-                    {"name": "amountOutMin", "type": "uint256"},
-                    {"name": "path", "type": "address[]"},
-                    {"name": "to", "type": "address"},
-                    {"name": "deadline", "type": "uint256"}
-                ],
-                "outputs": [],
-                "stateMutability": "nonpayable"
-            }
-        ]
-        self.abi_get_amounts_out = [{
-            "name": "getAmountsOut",
-            "type": "function",
-            "inputs": [
-                {"name": "amountIn", "type": "uint256"},
-                {"name": "path", "type": "address[]"}
-            ],
-            "outputs": [
-                {"name": "amounts", "type": "uint256[]"}
-            ],
-            "stateMutability": "view"
-        }]
+    def _swap_data(self, fn_name: str, path: list, **values) -> bytes:
+        return swap_calldata(fn_name, tuple(path)).encode(to=self.client.account.address, **values)
 
 
     async def _get_deadline(self, plus_seconds: int = 1200) -> int:
-        latest_block = await self.client.web3.eth.get_block("latest")
-        return latest_block["timestamp"] + plus_seconds
+        head = await self.client.get_head()
+        return head.timestamp + plus_seconds
 
 
     async def swap_mon_to_bean(
@@ -105,22 +76,16 @@ class BeanExchange(BaseActivity, Base):
         if amount.Ether < Base.MIN_SWAP_AMOUNTS['bean']:
             return f"Failed: Amount too small (min: {Base.MIN_SWAP_AMOUNTS['bean']} MON)"
             
-        min_amount_out = int(amount_in_wei * (1 - slippage))    
+        min_amount_out = await self.quotes.min_amount_out(
+            self.client.web3, [self.wmon.address, self.bean.address], amount_in_wei, slippage
+        )
                 
         deadline = await self._get_deadline()
-        contract = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_swap_exact_eth_for_tokens
-        )
-        
-        data = contract.encodeABI(
-            fn_name="swapExactETHForTokens",
-            args=[
-                min_amount_out,
-                [self.wmon.address, self.bean.address],
-                self.client.account.address,
-                deadline
-            ]
+        data = self._swap_data(
+            "swapExactETHForTokens",
+            [self.wmon.address, self.bean.address],
+            amount_out_min=min_amount_out,
+            deadline=deadline
         )
         
         tx_params = await self.client.build_transaction(
@@ -157,33 +122,17 @@ class BeanExchange(BaseActivity, Base):
             amount_wei=amount_in_wei
         )
         
-        router = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_get_amounts_out
+        min_amount_out = await self.quotes.min_amount_out(
+            self.client.web3, [self.bean.address, self.wmon.address], amount_in_wei, slippage
         )
-        
-        amounts = await router.functions.getAmountsOut(
-            amount_in_wei, [self.bean.address, self.wmon.address]
-        ).call()
-        
-        expected_out = amounts[-1]
-        min_amount_out = int(expected_out * (1 - slippage))
         deadline = await self._get_deadline()
         
-        contract = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_swap_exact_tokens_for_eth
-        )
-        
-        data = contract.encodeABI(
-            fn_name="swapExactTokensForETH",
-            args=[
-                amount_in_wei,
-                min_amount_out,
-                [self.bean.address, self.wmon.address],
-                self.client.account.address,
-                deadline
-            ]
+        data = self._swap_data(
+            "swapExactTokensForETH",
+            [self.bean.address, self.wmon.address],
+            amount_in=amount_in_wei,
+            amount_out_min=min_amount_out,
+            deadline=deadline
         )
         
         tx_params = await self.client.build_transaction(
@@ -219,33 +168,17 @@ class BeanExchange(BaseActivity, Base):
             amount_wei=amount_in_wei
         )
         
-        router = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_get_amounts_out
+        min_amount_out = await self.quotes.min_amount_out(
+            self.client.web3, [self.jai.address, self.wmon.address], amount_in_wei, slippage
         )
-        
-        amounts = await router.functions.getAmountsOut(
-            amount_in_wei, [self.jai.address, self.wmon.address]
-        ).call()
-        
-        expected_out = amounts[-1]
-        min_amount_out = int(expected_out * (1 - slippage))
         deadline = await self._get_deadline()
         
-        contract = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_swap_exact_tokens_for_eth
-        )
-        
-        data = contract.encodeABI(
-            fn_name="swapExactTokensForETH",
-            args=[
-                amount_in_wei,
-                min_amount_out,
-                [self.jai.address, self.wmon.address],
-                self.client.account.address,
-                deadline
-            ]
+        data = self._swap_data(
+            "swapExactTokensForETH",
+            [self.jai.address, self.wmon.address],
+            amount_in=amount_in_wei,
+            amount_out_min=min_amount_out,
+            deadline=deadline
         )
         
         tx_params = await self.client.build_transaction(
@@ -281,33 +214,17 @@ class BeanExchange(BaseActivity, Base):
             amount_wei=amount_in_wei
         )
         
-        router = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_get_amounts_out
+        min_amount_out = await self.quotes.min_amount_out(
+            self.client.web3, [self.usdc.address, self.wmon.address], amount_in_wei, slippage
         )
-        
-        amounts = await router.functions.getAmountsOut(
-            amount_in_wei, [self.usdc.address, self.wmon.address]
-        ).call()
-        
-        expected_out = amounts[-1]
-        min_amount_out = int(expected_out * (1 - slippage))
         deadline = await self._get_deadline()
         
-        contract = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_swap_exact_tokens_for_eth
-        )
-        
-        data = contract.encodeABI(
-            fn_name="swapExactTokensForETH",
-            args=[
-                amount_in_wei,
-                min_amount_out,
-                [self.usdc.address, self.wmon.address],
-                self.client.account.address,
-                deadline
-            ]
+        data = self._swap_data(
+            "swapExactTokensForETH",
+            [self.usdc.address, self.wmon.address],
+            amount_in=amount_in_wei,
+            amount_out_min=min_amount_out,
+            deadline=deadline
         )
         
         tx_params = await self.client.build_transaction(
@@ -343,33 +260,17 @@ class BeanExchange(BaseActivity, Base):
             amount_wei=amount_in_wei
         )
         
-        router = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_get_amounts_out
+        min_amount_out = await self.quotes.min_amount_out(
+            self.client.web3, [self.bean.address, self.jai.address], amount_in_wei, slippage
         )
-        
-        amounts = await router.functions.getAmountsOut(
-            amount_in_wei, [self.bean.address, self.jai.address]
-        ).call()
-        
-        expected_out = amounts[-1]
-        min_amount_out = int(expected_out * (1 - slippage))
         deadline = await self._get_deadline()
         
-        contract = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_swap_exact_tokens_for_tokens
-        )
-        
-        data = contract.encodeABI(
-            fn_name="swapExactTokensForTokens",
-            args=[
-                amount_in_wei,
-                min_amount_out,
-                [self.bean.address, self.jai.address],
-                self.client.account.address,
-                deadline
-            ]
+        data = self._swap_data(
+            "swapExactTokensForTokens",
+            [self.bean.address, self.jai.address],
+            amount_in=amount_in_wei,
+            amount_out_min=min_amount_out,
+            deadline=deadline
         )
         
         tx_params = await self.client.build_transaction(
@@ -405,32 +306,16 @@ class BeanExchange(BaseActivity, Base):
             amount_wei=amount_in_wei
         )
         
-        router = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_get_amounts_out
+        min_amount_out = await self.quotes.min_amount_out(
+            self.client.web3, [self.jai.address, self.bean.address], amount_in_wei, slippage
         )
-        
-        amounts = await router.functions.getAmountsOut(
-            amount_in_wei, [self.jai.address, self.bean.address]
-        ).call()
-        
-        expected_out = amounts[-1]
-        min_amount_out = int(expected_out * (1 - slippage))
         deadline = await self._get_deadline()
-        contract = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_swap_exact_tokens_for_tokens
-        )
-        
-        data = contract.encodeABI(
-            fn_name="swapExactTokensForTokens",
-            args=[
-                amount_in_wei,
-                min_amount_out,
-                [self.jai.address, self.bean.address],
-                self.client.account.address,
-                deadline
-            ]
+        data = self._swap_data(
+            "swapExactTokensForTokens",
+            [self.jai.address, self.bean.address],
+            amount_in=amount_in_wei,
+            amount_out_min=min_amount_out,
+            deadline=deadline
         )
         
         tx_params = await self.client.build_transaction(
@@ -465,29 +350,16 @@ class BeanExchange(BaseActivity, Base):
             spender=self.router_address,
             amount_wei=amount_in_wei
         )
-        router = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_get_amounts_out
+        min_amount_out = await self.quotes.min_amount_out(
+            self.client.web3, [self.usdc.address, self.bean.address], amount_in_wei, slippage
         )
-        amounts = await router.functions.getAmountsOut(
-            amount_in_wei, [self.usdc.address, self.bean.address]
-        ).call()
-        expected_out = amounts[-1]
-        min_amount_out = int(expected_out * (1 - slippage))
         deadline = await self._get_deadline()
-        contract = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_swap_exact_tokens_for_tokens
-        )
-        data = contract.encodeABI(
-            fn_name="swapExactTokensForTokens",
-            args=[
-                amount_in_wei,
-                min_amount_out,
-                [self.usdc.address, self.bean.address],
-                self.client.account.address,
-                deadline
-            ]
+        data = self._swap_data(
+            "swapExactTokensForTokens",
+            [self.usdc.address, self.bean.address],
+            amount_in=amount_in_wei,
+            amount_out_min=min_amount_out,
+            deadline=deadline
         )
         tx_params = await self.client.build_transaction(
             to=self.router_address,
@@ -521,29 +393,16 @@ class BeanExchange(BaseActivity, Base):
             spender=self.router_address,
             amount_wei=amount_in_wei
         )
-        router = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_get_amounts_out
+        min_amount_out = await self.quotes.min_amount_out(
+            self.client.web3, [self.jai.address, self.usdc.address], amount_in_wei, slippage
         )
-        amounts = await router.functions.getAmountsOut(
-            amount_in_wei, [self.jai.address, self.usdc.address]
-        ).call()
-        expected_out = amounts[-1]
-        min_amount_out = int(expected_out * (1 - slippage))
         deadline = await self._get_deadline()
-        contract = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_swap_exact_tokens_for_tokens
-        )
-        data = contract.encodeABI(
-            fn_name="swapExactTokensForTokens",
-            args=[
-                amount_in_wei,
-                min_amount_out,
-                [self.jai.address, self.usdc.address],
-                self.client.account.address,
-                deadline
-            ]
+        data = self._swap_data(
+            "swapExactTokensForTokens",
+            [self.jai.address, self.usdc.address],
+            amount_in=amount_in_wei,
+            amount_out_min=min_amount_out,
+            deadline=deadline
         )
         tx_params = await self.client.build_transaction(
             to=self.router_address,
@@ -577,29 +436,16 @@ class BeanExchange(BaseActivity, Base):
             spender=self.router_address,
             amount_wei=amount_in_wei
         )
-        router = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_get_amounts_out
+        min_amount_out = await self.quotes.min_amount_out(
+            self.client.web3, [self.usdc.address, self.jai.address], amount_in_wei, slippage
         )
-        amounts = await router.functions.getAmountsOut(
-            amount_in_wei, [self.usdc.address, self.jai.address]
-        ).call()
-        expected_out = amounts[-1]
-        min_amount_out = int(expected_out * (1 - slippage))
         deadline = await self._get_deadline()
-        contract = self.client.web3.eth.contract(
-            address=self.router_address,
-            abi=self.abi_swap_exact_tokens_for_tokens
-        )
-        data = contract.encodeABI(
-            fn_name="swapExactTokensForTokens",
-            args=[
-                amount_in_wei,
-                min_amount_out,
-                [self.usdc.address, self.jai.address],
-                self.client.account.address,
-                deadline
-            ]
+        data = self._swap_data(
+            "swapExactTokensForTokens",
+            [self.usdc.address, self.jai.address],
+            amount_in=amount_in_wei,
+            amount_out_min=min_amount_out,
+            deadline=deadline
         )
         tx_params = await self.client.build_transaction(
             to=self.router_address,
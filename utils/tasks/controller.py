@@ -31,55 +31,33 @@ class Controller(Base):
         
 
     async def count_swaps(self, tx_list: list[dict] | None = None):
-        settings = Settings()
-        result_count = 0
+        """
+        Считает успешные свапы кошелька (Ambient userCmd, свапы Bean, Uniswap execute).
 
-        api_blockvision = BlockvisionAPI(key=settings.blockvision_api_key)
+        Метод определяется по селектору из input транзакции через индекс MonadProtocols,
+        имя метода из эксплорера используется, только если input в ответе нет.
+        """
+        settings = Settings()
 
         if not tx_list:
+            api_blockvision = BlockvisionAPI(key=settings.blockvision_api_key)
             tx_list = await api_blockvision.get_all_transactions(
                 address=self.client.account.address
             )
 
-        # ambient (mon-wbtc, wbtc-mon)
-        result_count += len(await api_blockvision.find_transactions_by_method_id(
-            address=self.client.account.address,
-            to=MonadProtocols.AMBIENT.address,
-            method_id='userCmd',
-            tx_list=tx_list
-        ))
+        swaps = set()
+        for tx in tx_list:
+            if tx.get('status') != 1 or not tx.get('to'):
+                continue
 
-        # bean (swapExactETHForTokens)
-        result_count += len(await api_blockvision.find_transactions_by_method_id(
-            address=self.client.account.address,
-            to=MonadProtocols.BEAN_EXCHANGE.address,
-            method_id='swapExactETHForTokens',
-            tx_list=tx_list
-        ))
-        
-        # bean (swapExactTokensForETH)
-        result_count += len(await api_blockvision.find_transactions_by_method_id(
-            address=self.client.account.address,
-            to=MonadProtocols.BEAN_EXCHANGE.address,
-            method_id='swapExactTokensForETH',
-            tx_list=tx_list
-        ))
-        
-        # bean (swapExactTokensForTokens)        
-        result_count += len(await api_blockvision.find_transactions_by_method_id(
-            address=self.client.account.address,
-            to=MonadProtocols.BEAN_EXCHANGE.address,
-            method_id='swapExactTokensForTokens',
-            tx_list=tx_list
-        ))
+            tx_input = tx.get('input') or ''
+            if len(tx_input) >= 10:
+                method = MonadProtocols.get_method(tx['to'], tx_input)
+            else:
+                method = MonadProtocols.get_method_by_name(tx['to'], tx.get('methodID') or '')
 
-        # uniswap (mon - usdt, usdt - mon)
-        result_count += len(await api_blockvision.find_transactions_by_method_id(
-            address=self.client.account.address,
-            to=MonadProtocols.UNISWAP_ROUTER.address,
-            method_id='execute',
-            tx_list=tx_list
-        ))
+            if method and method.is_swap:
+                swaps.add(tx.get('hash'))
 
-        return result_count
+        return len(swaps)
 
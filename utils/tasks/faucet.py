@@ -8,7 +8,7 @@ import platform
 from typing import Optional, Dict, Any
 from loguru import logger
 
-from evm import EVMClient, Networks
+from evm.accounts import get_account
 from data.models import Settings
 from fake_useragent import UserAgent
 
@@ -214,11 +214,7 @@ class FaucetClaim:
             return
 
         try:
-            client = EVMClient(
-                private_key=wallet.get('private_key', ''),
-                network=Networks.MONAD
-            )
-            address = client.account.address
+            address = get_account(wallet.get('private_key', '')).address
         except Exception as e:
             logger.error(f"Кошелёк {wallet_name}: Ошибка при получении адреса: {str(e)}")
             return
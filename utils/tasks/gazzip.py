@@ -57,14 +57,10 @@ class GazZip(BaseActivity, Base):
         balance = await self.client.web3.eth.get_balance(self.client.account.address)
         balance_token_amount = TokenAmount.from_wei(balance)
         
-        eth_amount_float = float(eth_amount.Ether)
-        balance_float = float(balance_token_amount.Ether)
-        
-        if balance_token_amount.Ether < eth_amount.Ether:
-            return f"Недостаточно ETH на балансе. Требуется: {eth_amount_float:.8f} ETH (${usd_amount}), доступно: {balance_float:.8f} ETH"
+        if balance_token_amount < eth_amount:
+            return f"Недостаточно ETH на балансе. Требуется: {eth_amount.Ether:.8f} ETH (${usd_amount}), доступно: {balance_token_amount.Ether:.8f} ETH"
             
-        eth_amount_float = float(eth_amount.Ether)
-        logger.info(f"Покупка MONAD на {usd_amount} USD ({eth_amount_float:.8f} ETH) по курсу {usd_amount/eth_amount_float:.2f} USD/ETH")
+        logger.info(f"Покупка MONAD на {usd_amount} USD ({eth_amount.Ether:.8f} ETH) по курсу {usd_amount / float(eth_amount.Ether):.2f} USD/ETH")
         
         tx_params = await self.client.build_transaction(
             to=self.contract_address,
@@ -82,7 +78,7 @@ class GazZip(BaseActivity, Base):
         balance = await self.client.web3.eth.get_balance(self.client.account.address)
         balance_token_amount = TokenAmount.from_wei(balance)
         
-        if balance_token_amount.Ether < amount.Ether:
+        if balance_token_amount < amount:
             return f"Недостаточно ETH на балансе. Требуется: {amount.Ether}, доступно: {balance_token_amount.Ether}"
         
         tx_params = await self.client.build_transaction(
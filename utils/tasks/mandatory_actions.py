@@ -87,13 +87,19 @@ class MandatoryActions:
                 for method_name in methods:
                     if hasattr(protocol_instance, method_name):
                         method = getattr(protocol_instance, method_name)
+                        delay = random.uniform(*self.delay_range)
                         try:
-                            result = await method()
-                            delay = random.uniform(*self.delay_range)
-                            logger.info(
-                                f"[MandatoryActions] {protocol_name}.{method_name} для {wallet_name} успешно выполнено. "
-                                f"Следующее действие начнется через {delay:.2f} секунд. Результат: {result}"
-                            )
+                            result = await protocol_instance.confirm(await method())
+                            if isinstance(result, str) and result.startswith('Failed'):
+                                logger.error(
+                                    f"[MandatoryActions] {protocol_name}.{method_name} для кошелька {wallet_name} не выполнено: {result}"
+                                )
+                                success = False
+                            else:
+                                logger.info(
+                                    f"[MandatoryActions] {protocol_name}.{method_name} для {wallet_name} успешно выполнено. "
+                                    f"Следующее действие начнется через {delay:.2f} секунд. Результат: {result}"
+                                )
                         except Exception as method_error:
                             logger.error(
                                 f"[MandatoryActions] Ошибка при выполнении метода {protocol_name}.{method_name} для кошелька {wallet_name}: {method_error}"
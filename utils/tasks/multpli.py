@@ -1,14 +1,21 @@
 import random
 import asyncio
+from evm.abi_registry import ERC20_ABI, abi_registry
 from evm.base_activity import BaseActivity
 from evm.client import EVMClient
 from evm.models.registry.tokens import MonadTokens
 from evm.models.token import TokenAmount
 from evm.utils.token_utils import approve_token_if_needed
+from evm.utils.calldata import CalldataTemplate, Slot
 from utils.tasks.base import Base
 from loguru import logger
 
 
+STAKE_CALLDATA = CalldataTemplate.from_abi(
+    'deposit(address,uint256)', ['0x924F1Bf31b19a7f9695F3FC6c69C2BA668Ea4a0a', Slot('amount')]
+)
+
+
 class MultPli(BaseActivity, Base):
     def __init__(self, client: EVMClient):
         super().__init__(client)
@@ -35,16 +42,8 @@ class MultPli(BaseActivity, Base):
         try:
             amount_wei = amount.Wei if isinstance(amount, TokenAmount) else self.usdc.amount_to_wei(amount)
             
-            balance = await self.client.web3.eth.contract(
-                address=self.multpli_usdc,
-                abi=[{
-                    "constant": True,
-                    "inputs": [{"name": "_owner", "type": "address"}],
-                    "name": "balanceOf",
-                    "outputs": [{"name": "balance", "type": "uint256"}],
-                    "type": "function"
-                }]
-            ).functions.balanceOf(self.client.account.address).call()
+            multpli_usdc = abi_registry.get_contract(ERC20_ABI, self.multpli_usdc)
+            balance = await self.client.call(multpli_usdc.functions.balanceOf(self.client.account.address))
             
             await approve_token_if_needed(
                 client=self.client,
@@ -52,33 +51,10 @@ class MultPli(BaseActivity, Base):
                 spender=self.staking_contract,
                 amount_wei=amount_wei
             )
-            
-            allowance = await self.client.web3.eth.contract(
-                address=self.multpli_usdc,
-                abi=[{
-                    "constant": True,
-                    "inputs": [
-                        {"name": "_owner", "type": "address"},
-                        {"name": "_spender", "type": "address"}
-                    ],
-                    "name": "allowance",
-                    "outputs": [{"name": "", "type": "uint256"}],
-                    "type": "function"
-                }]
-            ).functions.allowance(
-                self.client.account.address,
-                self.staking_contract
-            ).call()
-
-            data = (
-                "0x47e7ef24"
-                "000000000000000000000000924f1bf31b19a7f9695f3fc6c69c2ba668ea4a0a"
-                f"{amount_wei:064x}"
-            )
 
             tx = await self.client.build_transaction(
                 to=self.staking_contract,
-                data=bytes.fromhex(data[2:] if data.startswith('0x') else data),
+                data=STAKE_CALLDATA.encode(amount=amount_wei),
                 value=0
             )
             
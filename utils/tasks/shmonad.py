@@ -2,9 +2,16 @@ from evm.base_activity import BaseActivity
 from evm.client import EVMClient
 from evm.models.registry.tokens import MonadTokens
 from evm.models.token import TokenAmount
+from evm.utils.calldata import CalldataTemplate, Slot
 from utils.tasks.base import Base
 
 
+STAKE_CALLDATA = CalldataTemplate.from_abi('deposit(uint256,address)', [Slot('assets'), Slot('receiver')])
+UNSTAKE_CALLDATA = CalldataTemplate.from_abi(
+    'redeem(uint256,address,address)', [Slot('shares'), Slot('owner'), Slot('owner')]
+)
+
+
 class Shmonad(BaseActivity, Base):
     def __init__(self, client: EVMClient):
         super().__init__(client)
@@ -25,11 +32,7 @@ class Shmonad(BaseActivity, Base):
             
         amount_in_wei = amount.Wei if isinstance(amount, TokenAmount) else self.mon.amount_to_wei(amount)
                 
-        data = (
-            f'0x6e553f65'
-            f'{hex(amount_in_wei)[2:].zfill(64)}'
-            f'{str(self.client.account.address).lower()[2:].zfill(64)}'
-        )
+        data = STAKE_CALLDATA.encode(assets=amount_in_wei, receiver=self.client.account.address)
 
         tx_params = await self.client.build_transaction(
             to=self.contract,
@@ -45,12 +48,7 @@ class Shmonad(BaseActivity, Base):
         amount_in_wei = amount.Wei if isinstance(amount, TokenAmount) else self.mon.amount_to_wei(amount)
 
         
-        data = (
-            f'0xba087652'
-            f'{hex(amount_in_wei)[2:].zfill(64)}'
-            f'{str(self.client.account.address).lower()[2:].zfill(64)}'
-            f'{str(self.client.account.address).lower()[2:].zfill(64)}'
-        )
+        data = UNSTAKE_CALLDATA.encode(shares=amount_in_wei, owner=self.client.account.address)
         
         print(data)
 
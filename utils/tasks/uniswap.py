@@ -7,9 +7,61 @@ from evm.models.token import TokenAmount
 from evm.client import EVMClient
 from evm.utils.token_utils import approve_token_if_needed, get_token_balance
 from evm.models.registry.tokens import MonadTokens
+from evm.utils.calldata import CalldataTemplate, Slot
 from utils.tasks.base import Base
 
 
+# execute(bytes commands, bytes[] inputs, uint256 deadline) Universal Router с хвостовым байтом 0x0c
+MON_TO_USDT_CALLDATA = CalldataTemplate('3593564c', [
+    0x60,
+    0xa0,
+    Slot('deadline'),
+    2,
+    '0b08000000000000000000000000000000000000000000000000000000000000',
+    2,
+    0x40,
+    0xa0,
+    0x40,
+    2,
+    Slot('amount_in'),
+    0x100,
+    Slot('recipient'),
+    Slot('amount_in'),
+    2,
+    0xa0,
+    0,
+    2,
+    MonadTokens.WMON.address,
+    MonadTokens.USDT.address,
+    0x40,
+    Slot('recipient'),
+], suffix=b'\x0c')
+
+USDT_TO_MON_CALLDATA = CalldataTemplate('3593564c', [
+    0x60,
+    0xa0,
+    Slot('deadline'),
+    2,
+    '080c000000000000000000000000000000000000000000000000000000000000',
+    2,
+    0x40,
+    0x160,
+    0x100,
+    2,
+    Slot('amount_in'),
+    0,
+    0xa0,
+    1,
+    2,
+    MonadTokens.USDT.address,
+    MonadTokens.WMON.address,
+    0x40,
+    Slot('recipient'),
+    Slot('min_amount_out'),
+], suffix=b'\x0c')
+
+
+
 
 class UniswapMonad(BaseActivity, Base):
     def __init__(self, client: EVMClient):
@@ -24,10 +76,7 @@ class UniswapMonad(BaseActivity, Base):
         self.usdt = MonadTokens.USDT
         
         # Инициализируем контракт WMON
-        self._wmon_contract = self.client.web3.eth.contract(
-            address=self.wmon.address,
-            abi=self.wmon.abi
-        )
+        self._wmon_contract = self.wmon.get_contract()
 
     async def wrap(self, amount: float = None) -> str:
         """
@@ -62,80 +111,27 @@ class UniswapMonad(BaseActivity, Base):
 
     async def _get_deadline(self, plus_seconds: int = 1200) -> int:
         """Возвращает текущий time + plus_seconds (по умолчанию +20 минут)."""
-        latest_block = await self.client.web3.eth.get_block("latest")
-        return latest_block["timestamp"] + plus_seconds
+        head = await self.client.get_head()
+        return head.timestamp + plus_seconds
 
     def _prepare_swap_data_mon_to_usdt(
         self, amount_in: int, deadline: int, to_address: str
     ) -> bytes:
-        addr_hex = to_address.lower().replace("0x", "")
-        wmon_addr = self.wmon.address.lower().replace("0x", "")
-        usdt_addr = self.usdt.address.lower().replace("0x", "")
-        
-        params = []
-        prefix = "3593564c"
-
-        params.append("0000000000000000000000000000000000000000000000000000000000000060")
-        params.append("00000000000000000000000000000000000000000000000000000000000000a0")
-        params.append(f"{deadline:064x}")  # deadline
-        params.append("0000000000000000000000000000000000000000000000000000000000000002")
-        params.append("0b08000000000000000000000000000000000000000000000000000000000000")
-        params.append("0000000000000000000000000000000000000000000000000000000000000002")
-        params.append("0000000000000000000000000000000000000000000000000000000000000040")
-        params.append("00000000000000000000000000000000000000000000000000000000000000a0")
-        params.append("0000000000000000000000000000000000000000000000000000000000000040")
-        params.append("0000000000000000000000000000000000000000000000000000000000000002")
-        params.append(f"{amount_in:064x}")  # amount_in
-        params.append("0000000000000000000000000000000000000000000000000000000000000100")
-        params.append(addr_hex.zfill(64))  # адрес
-        params.append(f"{amount_in:064x}")  # amount_in повторно
-        params.append("0000000000000000000000000000000000000000000000000000000000000002")
-        params.append("00000000000000000000000000000000000000000000000000000000000000a0")
-        params.append("0000000000000000000000000000000000000000000000000000000000000000")
-        params.append("0000000000000000000000000000000000000000000000000000000000000002")
-        params.append(wmon_addr.zfill(64))  # адрес токена WMON
-        params.append(usdt_addr.zfill(64))  # адрес токена USDT
-        params.append("0000000000000000000000000000000000000000000000000000000000000040")
-        params.append(addr_hex.zfill(64))
-        params.append("0c")
-
-        data_hex = prefix + "".join(params)
-        return bytes.fromhex(data_hex)
+        return MON_TO_USDT_CALLDATA.encode(amount_in=amount_in, deadline=deadline, recipient=to_address)
 
     def _prepare_swap_data_usdt_to_mon(
         self,
         amount_in: int,
         min_amount_out: int,
         deadline: int,
+        to_address: str
     ) -> bytes:
-        prefix = "3593564c"
-
-        words = [
-            "0000000000000000000000000000000000000000000000000000000000000060",
-            "00000000000000000000000000000000000000000000000000000000000000a0",
-            f"{deadline:064x}",
-            "0000000000000000000000000000000000000000000000000000000000000002",
-            "080c000000000000000000000000000000000000000000000000000000000000",
-            "0000000000000000000000000000000000000000000000000000000000000002",
-            "0000000000000000000000000000000000000000000000000000000000000040",
-            "0000000000000000000000000000000000000000000000000000000000000160",
-            "0000000000000000000000000000000000000000000000000000000000000100",
-            "0000000000000000000000000000000000000000000000000000000000000002",
-            f"{amount_in:064x}",
-            "0000000000000000000000000000000000000000000000000000000000000000",
-            "00000000000000000000000000000000000000000000000000000000000000a0",
-            "0000000000000000000000000000000000000000000000000000000000000001",
-            "0000000000000000000000000000000000000000000000000000000000000002",
-            self.usdt.address.lower().replace("0x", "").zfill(64),
-            self.wmon.address.lower().replace("0x", "").zfill(64),
-            "0000000000000000000000000000000000000000000000000000000000000040",
-            self.client.account.address.lower().replace("0x", "").zfill(64),
-            f"{min_amount_out:064x}",
-        ]
-
-        data_hex = prefix + "".join(words) + "0c"
-
-        return bytes.fromhex(data_hex)
+        return USDT_TO_MON_CALLDATA.encode(
+            amount_in=amount_in,
+            min_amount_out=min_amount_out,
+            deadline=deadline,
+            recipient=to_address
+        )
 
 
     async def swap_mon_to_usdt(
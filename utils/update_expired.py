@@ -1,59 +1,79 @@
 import random
 from datetime import datetime, timedelta
+from typing import List
 
 from loguru import logger
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_, or_, update
+from sqlalchemy.orm import Session
 
 from data.models import Settings
-from utils.db_api.wallet_api import db
+from utils.db_api.async_db import async_db
 from utils.db_api.models import Wallet
 
 
-def update_expired(initial: bool = False) -> None:
+CHUNK_SIZE = 1000
+
+
+async def update_expired(initial: bool = False) -> None:
+    """
+    Переносит просроченные действия на ближайшее случайное время.
+
+    Из БД читаются только id, новые времена считаются одним проходом и записываются
+    executemany-обновлениями по первичному ключу пачками по CHUNK_SIZE строк. Запросы идут
+    через поток AsyncDB после сброса его буфера записи, чтобы учесть ещё не записанные времена.
+    """
     now = datetime.now()
+    settings = Settings()
     if initial:
-        stmt = select(Wallet).where(
-            and_(
-                Wallet.initial_completed.is_(False),
-                or_(
-                    Wallet.next_initial_action_time <= now,
-                    Wallet.next_initial_action_time.is_(None),
-                )
-            )
-        )
+        max_delay = int(settings.initial_actions_delay.to_ / 2)
     else:
-        stmt = select(Wallet).where(
-            and_(
-                Wallet.initial_completed.is_(True),
-                or_(
-                    Wallet.next_activity_action_time <= now,
-                    Wallet.next_activity_action_time.is_(None),
-                )
-            )
-        )
+        max_delay = int(settings.activity_actions_delay.to_ / 3)
 
-    expired_wallets: list[Wallet] = db.all(stmt=stmt)
+    await async_db.flush()
+    offsets = await async_db.run(_reschedule_expired, initial, now, max_delay)
 
-    if not expired_wallets:
+    if not offsets:
         return
 
-    settings = Settings()
-    for wallet in expired_wallets:
-        if initial:
-            wallet.next_initial_action_time = now + timedelta(
-                seconds=random.randint(0, int(settings.initial_actions_delay.to_ / 2))
-            )
-            logger.info(
-                f'{wallet.address}: Action time was re-generated: '
-                f'{wallet.next_initial_action_time}.'
-            )
-        else:
-            wallet.next_activity_action_time = now + timedelta(
-                seconds=random.randint(0, int(settings.activity_actions_delay.to_ / 3))
-            )
-            logger.info(
-                f'{wallet.address}: Action time was re-generated: '
-                f'{wallet.next_activity_action_time}.'
+    offsets.sort()
+    logger.info(
+        f'Action time was re-generated for {len(offsets)} wallets: '
+        f'in {offsets[0]}-{offsets[-1]} s, median {offsets[len(offsets) // 2]} s, '
+        f'first at {now + timedelta(seconds=offsets[0])}, last at {now + timedelta(seconds=offsets[-1])}.'
+    )
+
+
+def _reschedule_expired(session: Session, initial: bool, now: datetime, max_delay: int) -> List[int]:
+    if initial:
+        column = Wallet.next_initial_action_time
+        phase = Wallet.initial_completed.is_(False)
+    else:
+        column = Wallet.next_activity_action_time
+        phase = Wallet.initial_completed.is_(True)
+
+    stmt = select(Wallet.id).where(
+        and_(
+            phase,
+            or_(
+                column <= now,
+                column.is_(None),
             )
+        )
+    )
+
+    wallet_ids: list[int] = list(session.scalars(stmt))
+
+    if not wallet_ids:
+        return []
+
+    offsets = [random.randint(0, max_delay) for _ in wallet_ids]
+    rows = [
+        {'id': wallet_id, column.key: now + timedelta(seconds=offset)}
+        for wallet_id, offset in zip(wallet_ids, offsets)
+    ]
+
+    for start in range(0, len(rows), CHUNK_SIZE):
+        session.execute(update(Wallet), rows[start:start + CHUNK_SIZE])
 
-    db.commit()
+    session.commit()
+    return offsets
@@ -1,5 +1,8 @@
 from curl_cffi.requests import AsyncSession
 
+from utils.rate_limiter import rate_limiter
+
+
 class HTTPException(Exception):
     response: dict[str] | None
     status_code: int | None
@@ -33,11 +36,12 @@ async def async_get(url: str, headers: dict | None = None, **kwargs) -> dict | N
     Make a GET request and check if it was successful.
     """
     async with AsyncSession(verify=False) as session:
-        response = await session.get(
-            url=url,
-            headers=headers,
-            **kwargs,
-        )
+        async with rate_limiter.limit(url, proxy=kwargs.get('proxy'), kind='api'):
+            response = await session.get(
+                url=url,
+                headers=headers,
+                **kwargs,
+            )
         status_code = response.status_code
         response = response.json()
         if status_code <= 201:
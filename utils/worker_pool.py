@@ -0,0 +1,168 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from loguru import logger
+
+
+class WalletWorkerPool:
+    """
+    Общий для процесса пул выполнения действий кошельков.
+
+    Действие занимает слот кошелька, слот прокси, слот RPC-эндпоинта и общий слот, всегда в этом
+    порядке. Слот кошелька - это блокировка: у одного кошелька никогда не выполняется больше
+    одного действия, даже если его одновременно поставили циклы initial и activity. Ожидающее
+    действие не держит общих слотов, пока его кошелёк занят.
+    """
+
+    DEFAULT_LIMITS = {
+        'max_workers': 20,
+        'per_proxy': 2,
+        'per_endpoint': 16,
+    }
+
+    def __init__(self, limits: Optional[dict] = None):
+        self.limits = dict(self.DEFAULT_LIMITS)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._global: Optional[asyncio.Semaphore] = None
+        self._proxies: Dict[str, asyncio.Semaphore] = {}
+        self._endpoints: Dict[str, asyncio.Semaphore] = {}
+        self._wallets: Dict[Hashable, asyncio.Lock] = {}
+        self._wallet_users: Dict[Hashable, int] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queued = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        if limits:
+            self.configure(limits)
+
+    def configure(self, limits: dict) -> None:
+        self.limits.update(limits)
+        self._loop = None
+
+    def submit(
+        self,
+        wallet_id: Hashable,
+        action: Callable[[], Awaitable],
+        proxy: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        due: Optional[datetime] = None
+    ) -> asyncio.Task:
+        """Ставит действие в пул; due - запланированное время, по нему считается задержка запуска."""
+        self._check_loop()
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        self._wallet_users[wallet_id] = self._wallet_users.get(wallet_id, 0) + 1
+
+        task = asyncio.create_task(self._run(wallet_id, action, proxy, endpoint, due))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def join(self) -> None:
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def stats(self) -> dict:
+        started = self.completed + self.failed + self.running
+        return {
+            'queued': self.queued,
+            'running': self.running,
+            'completed': self.completed,
+            'failed': self.failed,
+            'max_queued': self.max_queued,
+            'avg_lag': round(self.lag_total / started, 3) if started else 0.0,
+            'max_lag': round(self.lag_max, 3),
+            'avg_wait': round(self.wait_total / started, 3) if started else 0.0,
+            'max_wait': round(self.wait_max, 3),
+        }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        if stats['completed'] or stats['failed'] or stats['running'] or stats['queued']:
+            logger.info(
+                f"Пул кошельков: в очереди {stats['queued']} (максимум {stats['max_queued']}), "
+                f"выполняется {stats['running']}, завершено {stats['completed']}, с ошибкой {stats['failed']}; "
+                f"задержка от due в среднем {stats['avg_lag']} сек, максимум {stats['max_lag']} сек; "
+                f"ожидание слота в среднем {stats['avg_wait']} сек, максимум {stats['max_wait']} сек"
+            )
+
+    async def _run(
+        self,
+        wallet_id: Hashable,
+        action: Callable[[], Awaitable],
+        proxy: Optional[str],
+        endpoint: Optional[str],
+        due: Optional[datetime]
+    ):
+        submitted = time.monotonic()
+        wallet_lock = self._wallets.setdefault(wallet_id, asyncio.Lock())
+        slots = [self._slot(self._proxies, proxy, 'per_proxy'), self._slot(self._endpoints, endpoint, 'per_endpoint'), self._global]
+        acquired = []
+        started = False
+        try:
+            async with wallet_lock:
+                for slot in slots:
+                    if slot is not None:
+                        await slot.acquire()
+                        acquired.append(slot)
+
+                self.queued -= 1
+                self.running += 1
+                started = True
+                self._record_start(submitted, due)
+                try:
+                    result = await action()
+                except Exception:
+                    self.failed += 1
+                    raise
+                else:
+                    self.completed += 1
+                    return result
+                finally:
+                    self.running -= 1
+        finally:
+            if not started:
+                self.queued -= 1
+            for slot in acquired:
+                slot.release()
+            self._wallet_users[wallet_id] -= 1
+            if not self._wallet_users[wallet_id]:
+                del self._wallet_users[wallet_id]
+                self._wallets.pop(wallet_id, None)
+
+    def _record_start(self, submitted: float, due: Optional[datetime]) -> None:
+        wait = time.monotonic() - submitted
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        if due is not None:
+            lag = max(0.0, (datetime.now() - due).total_seconds())
+            self.lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+
+    def _slot(self, slots: Dict[str, asyncio.Semaphore], key: Optional[str], limit_name: str) -> Optional[asyncio.Semaphore]:
+        if not key or not self.limits.get(limit_name):
+            return None
+        if key not in slots:
+            slots[key] = asyncio.Semaphore(self.limits[limit_name])
+        return slots[key]
+
+    def _check_loop(self) -> None:
+        # Семафоры привязаны к event loop, поэтому при новом asyncio.run или configure слоты создаются заново
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.limits['max_workers']) if self.limits.get('max_workers') else None
+            self._proxies.clear()
+            self._endpoints.clear()
+
+
+worker_pool = WalletWorkerPool()